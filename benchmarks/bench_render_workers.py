@@ -0,0 +1,82 @@
+"""Benchmark render wall time against the number of sharded render workers.
+
+Runs the same Blender script through BlenderExecutor once per worker count
+and prints the wall time of each run.
+
+Usage:
+    python benchmarks/bench_render_workers.py --config config.yaml --workers 1 2 4
+    python benchmarks/bench_render_workers.py --script my_scene.py --repeat 3
+    python benchmarks/bench_render_workers.py --fake-blender   # no Blender needed
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from vibe_blender.config import Config
+from vibe_blender.execution import BlenderExecutor
+from vibe_blender.models import GeneratedScript
+
+SAMPLE_SCRIPT = """\
+import bpy
+
+bpy.ops.object.select_all(action='SELECT')
+bpy.ops.object.delete()
+
+bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0.5))
+bpy.ops.mesh.primitive_uv_sphere_add(radius=0.4, location=(0, 0, 1.4))
+sphere = bpy.context.active_object
+sphere.modifiers.new(name="Subsurf", type='SUBSURF').levels = 3
+
+mat = bpy.data.materials.new(name="Mat")
+mat.use_nodes = True
+mat.node_tree.nodes.get("Principled BSDF").inputs["Base Color"].default_value = (0.8, 0.2, 0.2, 1)
+sphere.data.materials.append(mat)
+
+bpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", type=Path, default=None, help="Path to config file")
+    parser.add_argument("--script", type=Path, default=None, help="Blender script to render")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Values of K")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per worker count")
+    parser.add_argument(
+        "--fake-blender", action="store_true", help="Use vibe-blender-fake-blender as Blender"
+    )
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    if args.fake_blender:
+        config.blender.executable = shutil.which("vibe-blender-fake-blender")
+    code = args.script.read_text() if args.script else SAMPLE_SCRIPT
+
+    print(f"{'workers':>8}  {'median s':>9}  {'min s':>7}  {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        config.pipeline.render_workers = workers
+        executor = BlenderExecutor(config)
+
+        timings = []
+        for run in range(args.repeat):
+            with tempfile.TemporaryDirectory(prefix="vibe_blender_bench_") as tmp:
+                script = GeneratedScript(code=code, iteration=1)
+                start = time.perf_counter()
+                output = executor.execute(script, Path(tmp))
+                timings.append(time.perf_counter() - start)
+                if output.blender_error:
+                    print(f"  warning: K={workers} run {run + 1} had errors")
+
+        executor.close()
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{workers:>8}  {median:>9.2f}  {min(timings):>7.2f}  {baseline / median:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import Optional
 
 from ..llm.base import BaseLLM
+from ..llm.metrics import LLMMetrics, llm_metrics
+from ..llm.streaming import JsonExtractor, collect
+from ..llm.structured import load_json, response_schema
 from ..models.schemas import (
     CritiqueResult,
     CritiqueVerdict,
@@ -22,6 +25,10 @@ logger = logging.getLogger(__name__)
 
 PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "critic.txt"
 
+# Schema for structured output; the iteration number is set locally
+CRITIQUE_SCHEMA = response_schema(CritiqueResult, exclude=frozenset({"iteration"}))
+
+
 class CriticAgent:
     """Agent that evaluates rendered 3D models against their prompts.
 
@@ -29,15 +36,22 @@ class CriticAgent:
     and determine if the model matches the user's intent.
     """
 
-    def __init__(self, llm: BaseLLM, pass_threshold: float = 7.0):
+    def __init__(
+        self,
+        llm: BaseLLM,
+        pass_threshold: float = 7.0,
+        metrics: Optional[LLMMetrics] = None,
+    ):
         """Initialize the Critic agent.
 
         Args:
             llm: LLM backend with vision capabilities
             pass_threshold: Minimum score to pass (default 7.0)
+            metrics: Collector for call timing and parse fallbacks (default: shared)
         """
         self.llm = llm
         self.pass_threshold = pass_threshold
+        self.metrics = metrics or llm_metrics
         self._load_prompt_template()
 
     def _load_prompt_template(self) -> None:
@@ -140,10 +154,14 @@ Be more lenient if the style generally matches the references, even if details d
 
         prompt = "\n".join(prompt_parts)
 
-        # Analyze with vision
-        response = self.llm.analyze_images(
-            image_paths=images,
-            prompt=prompt,
+        # Analyze with vision, stopping once the JSON verdict is complete
+        response = collect(
+            self.llm.stream_structured(
+                prompt=prompt, schema=CRITIQUE_SCHEMA, image_paths=images
+            ),
+            JsonExtractor("{"),
+            label="critic",
+            collector=self.metrics,
         )
         logger.debug(f"Output from critic model: \n{response}")
 
@@ -162,44 +180,14 @@ Be more lenient if the style generally matches the references, even if details d
         logger.debug(f"Parsing critique response ({len(response)} chars)")
 
         try:
-            # Try multiple methods to extract JSON
-            json_str = None
-
-            # Method 1: Look for ```json blocks
-            json_match = re.search(r'```json\s*([\s\S]*?)\s*```', response)
-            if json_match:
-                json_str = json_match.group(1).strip()
-                logger.debug("Found JSON in ```json block")
-
-            # Method 2: Look for ``` blocks
-            if not json_str:
-                code_match = re.search(r'```\s*([\s\S]*?)\s*```', response)
-                if code_match:
-                    json_str = code_match.group(1).strip()
-                    logger.debug("Found JSON in ``` block")
-
-            # Method 3: Find complete JSON object with balanced braces
-            if not json_str:
-                json_str = self._extract_json_object(response)
-                if json_str:
-                    logger.debug("Found JSON via brace matching")
-
-            if not json_str:
-                raise ValueError("No JSON found in response")
-
-            # Clean up common issues
-            json_str = json_str.strip()
-
-            # Try to parse
-            try:
-                data = json.loads(json_str)
-            except json.JSONDecodeError as e:
-                # Try fixing common issues
-                logger.debug(f"Initial parse failed: {e}, attempting fixes")
-                # Remove trailing commas
-                json_str = re.sub(r',\s*}', '}', json_str)
-                json_str = re.sub(r',\s*]', ']', json_str)
-                data = json.loads(json_str)
+            # Structured output is bare JSON; heuristics are only the fallback
+            data = load_json(response)
+            if data is None:
+                self.metrics.increment("critic.json_fallback")
+                data = self._extract_data(response)
+
+            if not isinstance(data, dict):
+                raise ValueError("Critique JSON is not an object")
 
             # Determine verdict (inside try block to catch conversion errors)
             verdict_str = str(data.get("verdict", "fail")).lower()
@@ -241,6 +229,7 @@ Be more lenient if the style generally matches the references, even if details d
             )
 
         except (json.JSONDecodeError, ValueError, TypeError, KeyError) as e:
+            self.metrics.increment("critic.parse_failure")
             logger.error(f"Failed to parse critique response: {e}")
             logger.debug(f"Raw response: {response[:1000]}")
             # Return a default result that uses the raw response as feedback
@@ -253,6 +242,60 @@ Be more lenient if the style generally matches the references, even if details d
                 iteration=iteration,
             )
 
+    def _extract_data(self, response: str) -> dict:
+        """Extract and parse a JSON object embedded in free text.
+
+        Args:
+            response: Raw LLM response
+
+        Returns:
+            Parsed JSON value
+
+        Raises:
+            ValueError: If no JSON is found
+            json.JSONDecodeError: If the JSON can't be parsed
+        """
+        # Try multiple methods to extract JSON
+        json_str = None
+
+        # Method 1: Look for ```json blocks
+        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', response)
+        if json_match:
+            json_str = json_match.group(1).strip()
+            logger.debug("Found JSON in ```json block")
+
+        # Method 2: Look for ``` blocks
+        if not json_str:
+            code_match = re.search(r'```\s*([\s\S]*?)\s*```', response)
+            if code_match:
+                json_str = code_match.group(1).strip()
+                logger.debug("Found JSON in ``` block")
+
+        # Method 3: Find complete JSON object with balanced braces
+        if not json_str:
+            json_str = self._extract_json_object(response)
+            if json_str:
+                logger.debug("Found JSON via brace matching")
+
+        if not json_str:
+            raise ValueError("No JSON found in response")
+
+        # Clean up common issues
+        json_str = json_str.strip()
+
+        # Try to parse
+        try:
+            data = json.loads(json_str)
+        except json.JSONDecodeError as e:
+            # Try fixing common issues
+            logger.debug(f"Initial parse failed: {e}, attempting fixes")
+            # Remove trailing commas
+            json_str = re.sub(r',\s*}', '}', json_str)
+            json_str = re.sub(r',\s*]', ']', json_str)
+            data = json.loads(json_str)
+
+        return data
+
     def _extract_json_object(self, text: str) -> Optional[str]:
         """Extract a complete JSON object from text using brace matching.
 
@@ -7,7 +7,10 @@ from pathlib import Path
 from typing import Optional
 
 from ..llm.base import BaseLLM
-from ..models.schemas import SceneDescription, GeneratedScript
+from ..llm.metrics import LLMMetrics, llm_metrics
+from ..llm.streaming import CodeBlockExtractor, JsonExtractor, StreamExtractor, collect
+from ..llm.structured import load_json, response_schema
+from ..models.schemas import EditList, SceneDescription, GeneratedScript
 from .editor import apply_edits
 
 logger = logging.getLogger(__name__)
@@ -15,6 +18,9 @@ logger = logging.getLogger(__name__)
 PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "generator.txt"
 REFINE_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "generator_refine.txt"
 
+# Structured-output schema for edit-based refinement ({"edits": [...]})
+EDIT_SCHEMA = response_schema(EditList)
+
 
 class GeneratorAgent:
     """Agent that generates Blender Python scripts from scene descriptions.
@@ -23,13 +29,15 @@ class GeneratorAgent:
     executable Python code using the Blender (bpy) API.
     """
 
-    def __init__(self, llm: BaseLLM):
+    def __init__(self, llm: BaseLLM, metrics: Optional[LLMMetrics] = None):
         """Initialize the Generator agent.
 
         Args:
             llm: LLM backend for code generation
+            metrics: Collector for call timing and parse fallbacks (default: shared)
         """
         self.llm = llm
+        self.metrics = metrics or llm_metrics
         self._load_prompt_template()
         self._load_refine_prompt_template()
 
@@ -63,22 +71,40 @@ Feedback: {feedback}"""
         prompt: str,
         reference_images: Optional[list[Path]] = None,
         max_tokens: int = 4000,
+        extractor: Optional[StreamExtractor] = None,
+        schema: Optional[dict] = None,
     ) -> str:
-        """Route a prompt to the LLM, using vision if images are provided."""
-        if reference_images:
+        """Route a prompt to the LLM, using vision if images are provided.
+
+        The response is streamed and reading stops as soon as the extractor
+        has seen a complete answer (code block or JSON edit list). With a
+        schema the backend is asked for structured output.
+        """
+        if schema is not None:
+            logger.info(f"LLM call (structured, {len(reference_images or [])} reference images)")
+            chunks = self.llm.stream_structured(
+                prompt=prompt,
+                schema=schema,
+                temperature=1.0,
+                max_tokens=max_tokens,
+                image_paths=reference_images,
+            )
+        elif reference_images:
             logger.info(f"LLM call with {len(reference_images)} reference images")
-            return self.llm.analyze_images(
+            chunks = self.llm.stream_analyze_images(
                 image_paths=reference_images,
                 prompt=prompt,
                 max_tokens=max_tokens,
             )
+        else:
+            logger.info("LLM call (text-only)")
+            chunks = self.llm.stream_generate(
+                prompt=prompt,
+                temperature=1.0,
+                max_tokens=max_tokens,
+            )
 
-        logger.info("LLM call (text-only)")
-        return self.llm.generate(
-            prompt=prompt,
-            temperature=1.0,
-            max_tokens=max_tokens,
-        )
+        return collect(chunks, extractor, label="generator", collector=self.metrics)
 
     def generate(
         self,
@@ -106,7 +132,9 @@ Feedback: {feedback}"""
             feedback=feedback or "None - this is the first iteration",
         )
 
-        response = self._call_llm(prompt, reference_images, max_tokens=4000)
+        response = self._call_llm(
+            prompt, reference_images, max_tokens=4000, extractor=CodeBlockExtractor()
+        )
         code = self._extract_code(response)
 
         return GeneratedScript(
@@ -146,13 +174,52 @@ Feedback: {feedback}"""
     def _parse_edits(self, response: str) -> list[dict] | None:
         """Extract a JSON array of edits from the LLM response.
 
-        Uses the same fence-detection + bracket-depth-matching approach as
-        critic.py's _parse_response / _extract_json_object.
+        Structured output ({"edits": [...]}) is parsed directly. Free text
+        falls back to the same fence-detection + bracket-depth-matching
+        approach as critic.py's _parse_response / _extract_json_object.
 
         Returns:
             List of {"old_code": str, "new_code": str} dicts, or None on any
             parse failure.
         """
+        data = load_json(response)
+        if data is None:
+            self.metrics.increment("generator.json_fallback")
+            data = self._extract_edits(response)
+            if data is None:
+                self.metrics.increment("generator.parse_failure")
+                return None
+        if isinstance(data, dict):
+            data = data.get("edits")
+
+        if not isinstance(data, list):
+            logger.debug("_parse_edits: parsed value is not a list")
+            self.metrics.increment("generator.parse_failure")
+            return None
+
+        # Validate each edit entry
+        for i, item in enumerate(data):
+            if not isinstance(item, dict):
+                logger.debug(f"_parse_edits: edit {i + 1} is not a dict")
+                self.metrics.increment("generator.parse_failure")
+                return None
+            if "old_code" not in item or not isinstance(item["old_code"], str) or not item["old_code"]:
+                logger.debug(f"_parse_edits: edit {i + 1} has invalid old_code")
+                self.metrics.increment("generator.parse_failure")
+                return None
+            if "new_code" not in item or not isinstance(item["new_code"], str):
+                logger.debug(f"_parse_edits: edit {i + 1} has invalid new_code")
+                self.metrics.increment("generator.parse_failure")
+                return None
+
+        return data
+
+    def _extract_edits(self, response: str) -> list | dict | None:
+        """Heuristically extract the edit list from free text.
+
+        Returns:
+            Parsed JSON value, or None if no valid JSON array was found
+        """
         json_str = None
 
         # Method 1: ```json … ```
@@ -183,22 +250,6 @@ Feedback: {feedback}"""
             logger.debug(f"_parse_edits: JSON decode error: {e}")
             return None
 
-        if not isinstance(data, list):
-            logger.debug("_parse_edits: parsed value is not a list")
-            return None
-
-        # Validate each edit entry
-        for i, item in enumerate(data):
-            if not isinstance(item, dict):
-                logger.debug(f"_parse_edits: edit {i + 1} is not a dict")
-                return None
-            if "old_code" not in item or not isinstance(item["old_code"], str) or not item["old_code"]:
-                logger.debug(f"_parse_edits: edit {i + 1} has invalid old_code")
-                return None
-            if "new_code" not in item or not isinstance(item["new_code"], str):
-                logger.debug(f"_parse_edits: edit {i + 1} has invalid new_code")
-                return None
-
         return data
 
     @staticmethod
@@ -265,7 +316,13 @@ Feedback: {feedback}"""
                     current_code=original_script.code,
                     feedback=feedback,
                 )
-                response = self._call_llm(prompt, reference_images, max_tokens=1500)
+                response = self._call_llm(
+                    prompt,
+                    reference_images,
+                    max_tokens=1500,
+                    extractor=JsonExtractor("{" if self.llm.supports_structured_output else "["),
+                    schema=EDIT_SCHEMA,
+                )
 
                 edits = self._parse_edits(response)
                 if edits is None:
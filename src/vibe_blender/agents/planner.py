@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Optional
 
 from ..llm.base import BaseLLM
+from ..llm.metrics import LLMMetrics, llm_metrics
+from ..llm.structured import load_json, response_schema
 from ..models.schemas import (
     SceneDescription,
     ObjectDescription,
@@ -21,6 +23,10 @@ logger = logging.getLogger(__name__)
 PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "planner.txt"
 CLARIFICATION_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "planner_clarification.txt"
 
+# Schemas for structured output; the timestamp is set locally, not by the LLM
+SCENE_SCHEMA = response_schema(SceneDescription)
+CLARIFICATION_SCHEMA = response_schema(ClarificationRequest, exclude=frozenset({"timestamp"}))
+
 
 class PlannerAgent:
     """Agent that parses user prompts into structured scene descriptions.
@@ -32,13 +38,22 @@ class PlannerAgent:
     - Lighting requirements
     """
 
-    def __init__(self, llm: BaseLLM):
+    def __init__(
+        self,
+        llm: BaseLLM,
+        clarification_llm: Optional[BaseLLM] = None,
+        metrics: Optional[LLMMetrics] = None,
+    ):
         """Initialize the Planner agent.
 
         Args:
             llm: LLM backend for text generation
+            clarification_llm: Optional backend for the clarity check (defaults to llm)
+            metrics: Collector for parse fallbacks (default: shared)
         """
         self.llm = llm
+        self.clarification_llm = clarification_llm or llm
+        self.metrics = metrics or llm_metrics
         self._load_prompt_template()
         self._load_clarification_prompt_template()
 
@@ -85,20 +100,16 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
         logger.info(f"Checking clarity for prompt: {user_prompt[:100]}...")
 
         if reference_images:
-            logger.info(f"Analyzing clarity with {len(reference_images)} reference images")
             # Use vision API to analyze both text and images together
-            response = self.llm.analyze_images(
-                image_paths=reference_images,
-                prompt=f"User prompt: {user_prompt}",
-                system=self.clarification_prompt,
-            )
-        else:
-            # Text-only analysis
-            response = self.llm.generate(
-                prompt=f"User prompt: {user_prompt}",
-                system=self.clarification_prompt,
-                temperature=1.0,
-            )
+            logger.info(f"Analyzing clarity with {len(reference_images)} reference images")
+
+        response = self.clarification_llm.generate_structured(
+            prompt=f"User prompt: {user_prompt}",
+            schema=CLARIFICATION_SCHEMA,
+            system=self.clarification_prompt,
+            temperature=1.0,
+            image_paths=reference_images,
+        )
 
         return self._parse_clarification_response(response)
 
@@ -112,22 +123,10 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
             Parsed ClarificationRequest
         """
         try:
-            # Handle responses that might have markdown code blocks
-            if "```json" in response:
-                start = response.index("```json") + 7
-                end = response.index("```", start)
-                json_str = response[start:end].strip()
-            elif "```" in response:
-                start = response.index("```") + 3
-                end = response.index("```", start)
-                json_str = response[start:end].strip()
-            else:
-                # Try to find JSON object in response
-                start = response.index("{")
-                end = response.rindex("}") + 1
-                json_str = response[start:end]
-
-            data = json.loads(json_str)
+            data = load_json(response)
+            if data is None:
+                self.metrics.increment("planner.json_fallback")
+                data = json.loads(self._extract_json(response))
 
             # Convert questions to ClarificationQuestion objects
             questions = []
@@ -146,6 +145,7 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
             )
 
         except (json.JSONDecodeError, ValueError, KeyError) as e:
+            self.metrics.increment("planner.parse_failure")
             logger.error(f"Failed to parse clarification response: {e}")
             logger.debug(f"Raw response: {response}")
             # Gracefully fallback - assume no clarification needed
@@ -190,18 +190,16 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
         # Use vision API if images provided, otherwise text-only
         if reference_images:
             logger.info(f"Planning with {len(reference_images)} reference images")
-            response = self.llm.analyze_images(
-                image_paths=reference_images,
-                prompt=enriched_prompt,
-                system=self.system_prompt,
-            )
         else:
             logger.info("Planning without reference images")
-            response = self.llm.generate(
-                prompt=enriched_prompt,
-                system=self.system_prompt,
-                temperature=1.0,
-            )
+
+        response = self.llm.generate_structured(
+            prompt=enriched_prompt,
+            schema=SCENE_SCHEMA,
+            system=self.system_prompt,
+            temperature=1.0,
+            image_paths=reference_images,
+        )
 
         return self._parse_response(response)
 
@@ -217,26 +215,15 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
         Raises:
             ValueError: If parsing fails
         """
-        # Try to extract JSON from the response
+        # Structured output is bare JSON; otherwise extract it from the text
         try:
-            # Handle responses that might have markdown code blocks
-            if "```json" in response:
-                start = response.index("```json") + 7
-                end = response.index("```", start)
-                json_str = response[start:end].strip()
-            elif "```" in response:
-                start = response.index("```") + 3
-                end = response.index("```", start)
-                json_str = response[start:end].strip()
-            else:
-                # Try to find JSON object in response
-                start = response.index("{")
-                end = response.rindex("}") + 1
-                json_str = response[start:end]
-
-            data = json.loads(json_str)
+            data = load_json(response)
+            if data is None:
+                self.metrics.increment("planner.json_fallback")
+                data = json.loads(self._extract_json(response))
 
         except (json.JSONDecodeError, ValueError) as e:
+            self.metrics.increment("planner.parse_failure")
             logger.error(f"Failed to parse LLM response: {e}")
             logger.debug(f"Raw response: {response}")
             raise ValueError(f"Failed to parse scene description from LLM response: {e}")
@@ -244,6 +231,28 @@ Output a JSON object with: needs_clarification (bool), reason (string or null),
         # Convert to SceneDescription
         return self._dict_to_scene_description(data)
 
+    @staticmethod
+    def _extract_json(response: str) -> str:
+        """Extract a JSON object from free text (fenced block or outermost braces).
+
+        Raises:
+            ValueError: If no JSON object can be located
+        """
+        # Handle responses that might have markdown code blocks
+        if "```json" in response:
+            start = response.index("```json") + 7
+            end = response.index("```", start)
+            return response[start:end].strip()
+        elif "```" in response:
+            start = response.index("```") + 3
+            end = response.index("```", start)
+            return response[start:end].strip()
+
+        # Try to find JSON object in response
+        start = response.index("{")
+        end = response.rindex("}") + 1
+        return response[start:end]
+
     def _dict_to_scene_description(self, data: dict) -> SceneDescription:
         """Convert a dictionary to a SceneDescription model.
 
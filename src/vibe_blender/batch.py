@@ -0,0 +1,341 @@
+"""Batch runs: many non-interactive pipelines fed from a shared job queue.
+
+Jobs are read from a JSONL file of prompts. A PipelineScheduler starts
+them in order and runs a pipeline for each into ``<output_dir>/<job id>``,
+all sharing one LLM router and one Blender executor, so the LLM concurrency
+limit and the Blender slot limit apply to the batch as a whole. Every
+finished job appends a line to ``results.jsonl``; rerunning the same batch
+into the same output directory skips those jobs and continues interrupted
+ones from their pipeline checkpoint, so a batch that was stopped resumes
+where it left off.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from .config import Config
+from .execution import BlenderExecutor
+from .llm import create_router
+from .models import BatchJob, BatchResult, PipelineState, PipelineStatus
+from .orchestrator import CHECKPOINT_FILE, Orchestrator
+from .scheduling import PipelineScheduler, ResourcePool
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.jsonl"
+
+_JOB_ID = re.compile(r"[\w.-]+")
+
+
+def load_jobs(path: Path | str) -> list[BatchJob]:
+    """Read batch jobs from a JSONL file.
+
+    Each non-empty line is either a JSON object with ``prompt`` and optional
+    ``id``, ``references`` and ``max_retries``, or a bare JSON string used as
+    the prompt. Jobs without an id are named after a hash of their prompt, so
+    ids stay stable when lines are added or reordered. Relative reference
+    paths are resolved against the file's directory. Lines starting with
+    ``#`` are ignored.
+
+    Args:
+        path: Path to the prompts file
+
+    Returns:
+        Jobs in file order
+
+    Raises:
+        ValueError: If a line is invalid or two jobs share an id
+    """
+    path = Path(path)
+    jobs: list[BatchJob] = []
+    seen: dict[str, int] = {}
+
+    for line_no, line in enumerate(path.read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            data = json.loads(line)
+            if isinstance(data, str):
+                data = {"prompt": data}
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object or string")
+
+            explicit_id = "id" in data
+            if not explicit_id:
+                digest = hashlib.sha1(data.get("prompt", "").encode()).hexdigest()
+                data["id"] = f"job_{digest[:10]}"
+            job = BatchJob.model_validate(data)
+        except (ValueError, ValidationError) as e:
+            raise ValueError(f"{path}:{line_no}: invalid job: {e}") from e
+
+        if not _JOB_ID.fullmatch(job.id):
+            raise ValueError(f"{path}:{line_no}: job id must be a plain file name: {job.id!r}")
+
+        if job.id in seen:
+            if explicit_id:
+                raise ValueError(f"{path}:{line_no}: duplicate job id {job.id!r}")
+            # The same prompt listed again is a separate job
+            seen[job.id] += 1
+            job.id = f"{job.id}-{seen[job.id]}"
+        seen.setdefault(job.id, 1)
+
+        job.references = [
+            ref if ref.is_absolute() else path.parent / ref for ref in job.references
+        ]
+        jobs.append(job)
+
+    return jobs
+
+
+def load_results(path: Path | str) -> dict[str, BatchResult]:
+    """Read the results of finished jobs from a results.jsonl file.
+
+    Args:
+        path: Path to results.jsonl
+
+    Returns:
+        Mapping of job id to its latest result (empty if the file doesn't exist)
+    """
+    path = Path(path)
+    results: dict[str, BatchResult] = {}
+    if not path.exists():
+        return results
+
+    for line in path.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = BatchResult.model_validate_json(line)
+        except ValidationError:
+            # A line cut short when the previous batch was killed
+            logger.warning(f"Skipping unreadable line in {path}")
+            continue
+        results[result.id] = result
+    return results
+
+
+class _ThreadFilter(logging.Filter):
+    """Pass only records logged by one thread."""
+
+    def __init__(self, thread_id: int):
+        super().__init__()
+        self.thread_id = thread_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.thread == self.thread_id
+
+
+class BatchRunner:
+    """Runs batch jobs concurrently through a PipelineScheduler.
+
+    The jobs share one LLM router and one Blender executor, whose calls and
+    executions draw from the scheduler's two resource pools. With
+    ``llm_concurrency`` and ``blender_slots`` each pool is capped on its
+    own, so jobs waiting on the LLM don't hold Blender back and vice versa.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        output_dir: Path | str,
+        concurrency: int = 4,
+        blender_slots: Optional[int] = None,
+        llm_concurrency: Optional[int] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            config: Application configuration (not modified)
+            output_dir: Batch directory holding results.jsonl and one directory per job
+            concurrency: Jobs run at once, at most
+            blender_slots: Blender processes run at once (default: blender.max_concurrent)
+            llm_concurrency: LLM calls in flight (default: llm.rate_limit.max_concurrent)
+        """
+        config = config.model_copy(deep=True)
+        if blender_slots:
+            config.blender.max_concurrent = blender_slots
+        if llm_concurrency:
+            config.llm.rate_limit.max_concurrent = llm_concurrency
+        self.config = config
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.results_path = self.output_dir / RESULTS_FILE
+
+        self.scheduler = PipelineScheduler(
+            blender=ResourcePool("blender", config.blender.max_concurrent),
+            llm=ResourcePool("llm", config.llm.rate_limit.max_concurrent),
+            max_jobs=concurrency,
+        )
+        self.llm = create_router(config.llm, slots=self.scheduler.llm)
+        self.executor = BlenderExecutor(config, slots=self.scheduler.blender)
+
+        self.results: list[BatchResult] = []
+        self.skipped = 0
+        self.elapsed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def run(self, jobs: list[BatchJob]) -> list[BatchResult]:
+        """Run every job that has no result yet.
+
+        A first KeyboardInterrupt stops starting jobs and waits for the
+        running ones; a second one aborts them. Jobs without a result line
+        continue from their checkpoint when the batch is restarted.
+
+        Args:
+            jobs: Jobs of the batch
+
+        Returns:
+            Results of the jobs finished by this call
+        """
+        done = load_results(self.results_path)
+        pending = [job for job in jobs if job.id not in done]
+        self.skipped = len(jobs) - len(pending)
+        if self.skipped:
+            logger.info(f"Resuming batch: {self.skipped} of {len(jobs)} jobs already finished")
+        logger.info(
+            f"Batch: {len(pending)} jobs, up to {self.scheduler.max_jobs} at once, "
+            f"Blender slots {self.config.blender.max_concurrent or 'unlimited'}, "
+            f"LLM concurrency {self.config.llm.rate_limit.max_concurrent or 'unlimited'}"
+        )
+
+        started = time.monotonic()
+        self.executor.warm_up()
+        try:
+            try:
+                self.scheduler.run(pending, self._run_and_record)
+            except KeyboardInterrupt:
+                logger.warning("Interrupted: finishing running jobs (Ctrl-C again to abort)")
+                self.stop()
+                self.scheduler.join()
+        finally:
+            self.elapsed_seconds = time.monotonic() - started
+            self.executor.close()
+
+        return self.results
+
+    def stop(self) -> None:
+        """Stop starting jobs; running jobs finish."""
+        self.scheduler.stop()
+
+    def summary(self) -> dict:
+        """Return job counts, LLM spend, throughput and pool utilization of the last run()."""
+        hours = self.elapsed_seconds / 3600
+        statuses = [result.status for result in self.results]
+        return {
+            "finished": len(self.results),
+            "succeeded": statuses.count(PipelineStatus.SUCCESS),
+            "max_retries": statuses.count(PipelineStatus.MAX_RETRIES),
+            "failed": statuses.count(PipelineStatus.FAILED),
+            "skipped": self.skipped,
+            "remaining": self.scheduler.remaining,
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "prompts_per_hour": round(len(self.results) / hours, 1) if hours else 0.0,
+            "llm_tokens": sum(result.llm_tokens for result in self.results),
+            "cost_usd": round(sum(result.cost_usd for result in self.results), 4),
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def _run_and_record(self, job: BatchJob) -> None:
+        """Run one job and append its result to results.jsonl."""
+        result = self._run_job(job)
+        with self._lock:
+            self.results.append(result)
+            with open(self.results_path, "a") as f:
+                f.write(result.model_dump_json() + "\n")
+            finished = len(self.results)
+        logger.info(
+            f"Batch job {job.id} finished: {result.status.value} "
+            f"({finished} done, {self.scheduler.remaining} not started)"
+        )
+
+    def _run_job(self, job: BatchJob) -> BatchResult:
+        """Run one job's pipeline into its own directory.
+
+        Args:
+            job: Job to run
+
+        Returns:
+            The job's result (failed if the pipeline raised)
+        """
+        job_dir = self.output_dir / job.id
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        config = self.config
+        if job.max_retries:
+            config = config.model_copy(deep=True)
+            config.pipeline.max_retries = job.max_retries
+
+        handler = self._add_job_log(job_dir / "pipeline.log")
+        started = time.monotonic()
+        logger.info(f"Batch job {job.id}: {job.prompt[:100]}")
+        try:
+            orchestrator = Orchestrator(
+                config, llm=self.llm, interactive=False, executor=self.executor
+            )
+            if (job_dir / CHECKPOINT_FILE).exists():
+                # Interrupted by an earlier batch: continue from its last phase
+                state = orchestrator.resume(job_dir, max_retries=job.max_retries)
+            else:
+                state = orchestrator.run(
+                    job.prompt, job_dir, reference_images=job.references or None
+                )
+        except Exception as e:
+            logger.exception(f"Batch job {job.id} failed: {e}")
+            return BatchResult(
+                id=job.id,
+                prompt=job.prompt,
+                status=PipelineStatus.FAILED,
+                output_dir=job_dir,
+                error=str(e),
+                duration_seconds=time.monotonic() - started,
+            )
+        finally:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+
+        return self._result(job, state, time.monotonic() - started)
+
+    @staticmethod
+    def _result(job: BatchJob, state: PipelineState, duration: float) -> BatchResult:
+        """Summarize a finished pipeline as a BatchResult."""
+        critique = state.get_latest_critique()
+        totals = state.get_llm_usage_totals().values()
+        error = None
+        if state.status == PipelineStatus.FAILED:
+            error = next((r.error for r in reversed(state.iterations) if r.error), None)
+        return BatchResult(
+            id=job.id,
+            prompt=job.prompt,
+            status=state.status,
+            output_dir=state.output_dir,
+            iterations=state.current_iteration,
+            score=critique.score if critique else None,
+            grid_image=state.final_output.grid_image if state.final_output else None,
+            blend_file=state.final_output.blend_file if state.final_output else None,
+            error=error,
+            duration_seconds=duration,
+            llm_tokens=sum(t["prompt_tokens"] + t["completion_tokens"] for t in totals),
+            cost_usd=sum(t["cost_usd"] for t in totals),
+        )
+
+    @staticmethod
+    def _add_job_log(log_file: Path) -> logging.Handler:
+        """Log this thread's records to the job's pipeline.log, like a single run does."""
+        root = logging.getLogger()
+        handler = logging.FileHandler(log_file)
+        handler.setLevel(root.level)
+        if root.handlers and root.handlers[0].formatter:
+            handler.setFormatter(root.handlers[0].formatter)
+        handler.addFilter(_ThreadFilter(threading.get_ident()))
+        root.addHandler(handler)
+        return handler
@@ -136,6 +136,201 @@ def generate(
         raise typer.Exit(1)
 
 
+@app.command()
+def resume(
+    output: Path = typer.Argument(
+        ...,
+        help="Output directory of the run to continue",
+        exists=True,
+        file_okay=False,
+    ),
+    config: Optional[Path] = typer.Option(
+        None, "--config", "-c", help="Path to configuration file"
+    ),
+    max_retries: Optional[int] = typer.Option(
+        None, "--max-retries", help="New maximum retry attempts (default: the run's own)"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Enable verbose logging"
+    ),
+):
+    """Continue an interrupted run from its last finished phase.
+
+    The plan, finished iterations and existing renders are reused from the
+    checkpoint in the output directory. Runs that stopped at the retry
+    limit continue if --max-retries raises it.
+
+    Examples:
+        vibe-blender resume outputs/20240126_153045
+        vibe-blender resume outputs/20240126_153045 --max-retries 8
+    """
+    from .orchestrator import CHECKPOINT_FILE
+
+    try:
+        cfg = Config.load(config)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        console.print("Run 'vibe-blender init' to create a configuration file.")
+        raise typer.Exit(1)
+
+    if not (output / CHECKPOINT_FILE).exists():
+        console.print(f"[red]Error: No pipeline checkpoint in {output}[/red]")
+        raise typer.Exit(1)
+
+    if verbose:
+        cfg.logging.level = "DEBUG"
+    log_file = output / "pipeline.log"
+    setup_logging(cfg, log_file=log_file)
+
+    console.print(Panel(f"[bold]Vibe-Blender v{__version__}[/bold]"))
+    console.print(f"Resuming: {output}")
+    console.print(f"Log file: {log_file}")
+    console.print()
+
+    try:
+        state = Orchestrator(cfg, interactive=False).resume(output, max_retries=max_retries)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        if verbose:
+            console.print_exception()
+        raise typer.Exit(1)
+
+    console.print(f"Status: {state.status.value} after {state.current_iteration} iteration(s)")
+    raise typer.Exit(0 if state.status.value == "success" else 1)
+
+
+@app.command()
+def batch(
+    prompts: Path = typer.Argument(
+        ...,
+        help="JSONL file with one job per line ({\"prompt\": ..., \"id\": ...})",
+        exists=True,
+        dir_okay=False,
+        readable=True,
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Batch directory (results.jsonl plus one directory per job)"
+    ),
+    config: Optional[Path] = typer.Option(
+        None, "--config", "-c", help="Path to configuration file"
+    ),
+    concurrency: int = typer.Option(
+        4,
+        "--concurrency",
+        "-n",
+        min=1,
+        help="Jobs run at once, at most; beyond one per Blender slot, jobs are "
+        "added while the Blender and LLM slots have headroom",
+    ),
+    blender_slots: Optional[int] = typer.Option(
+        None, "--blender-slots", min=1, help="Blender processes at once (overrides config)"
+    ),
+    llm_concurrency: Optional[int] = typer.Option(
+        None, "--llm-concurrency", min=1, help="LLM calls in flight (overrides config)"
+    ),
+    max_retries: Optional[int] = typer.Option(
+        None, "--max-retries", help="Maximum retry attempts (overrides config)"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Enable verbose logging"
+    ),
+):
+    """Generate models for many prompts, without clarification prompts.
+
+    Results are appended to results.jsonl in the batch directory as jobs
+    finish. Running the same command again skips finished jobs, so an
+    interrupted batch resumes where it stopped.
+
+    Examples:
+        vibe-blender batch prompts.jsonl --concurrency 8
+        vibe-blender batch prompts.jsonl -n 8 --blender-slots 2 --llm-concurrency 6
+        vibe-blender batch prompts.jsonl -o outputs/nightly  # resume a stopped batch
+    """
+    from .batch import BatchRunner, load_jobs
+
+    try:
+        cfg = Config.load(config)
+    except FileNotFoundError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        console.print("Run 'vibe-blender init' to create a configuration file.")
+        raise typer.Exit(1)
+
+    try:
+        jobs = load_jobs(prompts)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    if max_retries:
+        cfg.pipeline.max_retries = max_retries
+
+    if output is None:
+        output = Path(cfg.pipeline.output_dir) / f"batch_{prompts.stem}"
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    if verbose:
+        cfg.logging.level = "DEBUG"
+    log_file = output / "batch.log"
+    setup_logging(cfg, log_file=log_file)
+
+    console.print(Panel(f"[bold]Vibe-Blender v{__version__} batch[/bold]"))
+    console.print(f"Jobs: {len(jobs)} from {prompts}")
+    console.print(f"Backend: {cfg.llm.backend}")
+    console.print(f"Concurrency: {concurrency}")
+    console.print(f"Output: {output}")
+    console.print(f"Log file: {log_file}")
+    console.print()
+
+    runner = BatchRunner(
+        cfg,
+        output,
+        concurrency=concurrency,
+        blender_slots=blender_slots,
+        llm_concurrency=llm_concurrency,
+    )
+    try:
+        runner.run(jobs)
+    except KeyboardInterrupt:
+        console.print("[yellow]Batch aborted; run the same command again to resume.[/yellow]")
+        raise typer.Exit(130)
+
+    summary = runner.summary()
+    logger.info(f"Batch summary: {summary}")
+
+    table = Table(show_header=False)
+    table.add_row("Finished", str(summary["finished"]))
+    table.add_row("Succeeded", str(summary["succeeded"]))
+    table.add_row("Max retries", str(summary["max_retries"]))
+    table.add_row("Failed", str(summary["failed"]))
+    table.add_row("Skipped (already done)", str(summary["skipped"]))
+    table.add_row("Not started", str(summary["remaining"]))
+    table.add_row("Elapsed", f"{summary['elapsed_seconds']:.0f}s")
+    table.add_row("Throughput", f"{summary['prompts_per_hour']:.1f} prompts/hour")
+    table.add_row("LLM usage", f"{summary['llm_tokens']} tokens (${summary['cost_usd']:.2f})")
+    scheduler = summary["scheduler"]
+    for label, name in (("Blender slots", "blender"), ("LLM slots", "llm")):
+        pool = scheduler[name]
+        busy = (
+            f"{pool['utilization']:.0%} busy"
+            if pool["utilization"] is not None
+            else f"{pool['mean_in_use']:.1f} in use on average"
+        )
+        table.add_row(
+            label,
+            f"{busy}, {pool['waited']} waits ({pool['mean_wait_seconds']:.1f}s mean)",
+        )
+    table.add_row(
+        "Jobs in flight",
+        f"{scheduler['mean_active_jobs']:.1f} average, {scheduler['max_active_jobs']} max",
+    )
+    console.print(table)
+    console.print(f"Results: {runner.results_path}")
+
+    if summary["failed"] or summary["remaining"]:
+        raise typer.Exit(1)
+
+
 def _handle_clarification_prompt(
     request: ClarificationRequest
 ) -> Optional[ClarificationResponse]:
@@ -15,6 +15,31 @@ class BlenderConfig(BaseModel):
 
     executable: str = Field(..., description="Path to Blender executable")
     timeout: int = Field(default=120, description="Execution timeout in seconds")
+    pool_size: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Warm Blender worker processes to keep (0 = spawn per run); workers don't "
+            "stream blender.log or stop early on printed tracebacks"
+        ),
+    )
+    worker_max_jobs: int = Field(
+        default=20, ge=1, description="Recycle a warm worker after this many jobs"
+    )
+    worker_max_memory_mb: int = Field(
+        default=4096, ge=256, description="Recycle a warm worker once its memory exceeds this"
+    )
+    worker_startup_timeout: int = Field(
+        default=60, ge=1, description="Seconds a new warm worker may take to start"
+    )
+    max_concurrent: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Blender processes run at once by one executor, each render shard counting "
+            "as one (null = unlimited)"
+        ),
+    )
 
     @field_validator("executable")
     @classmethod
@@ -31,6 +56,9 @@ class OpenAIConfig(BaseModel):
 
     model: str = Field(default="gpt-4o", description="Model to use for generation")
     api_key: Optional[str] = Field(default=None, description="API key (prefer env var)")
+    base_url: Optional[str] = Field(
+        default=None, description="OpenAI-compatible endpoint (default: the OpenAI API)"
+    )
 
 
 class OllamaConfig(BaseModel):
@@ -41,20 +69,158 @@ class OllamaConfig(BaseModel):
     vision_model: str = Field(default="llava", description="Model for vision tasks")
 
 
+class ReplayConfig(BaseModel):
+    """Offline backend answering from a recorded cassette."""
+
+    cassette: str = Field(default="cassette.jsonl", description="Cassette recorded with llm.record")
+    latency_scale: float = Field(
+        default=0.0, ge=0, description="Fraction of recorded latency to simulate (0 = instant)"
+    )
+    strict: bool = Field(
+        default=False, description="Fail on unrecorded requests instead of replaying in order"
+    )
+
+
+LLM_BACKENDS = {"openai", "ollama", "replay"}
+LLM_ROLES = {"clarification", "planner", "generator", "critic"}
+
+
+class LLMRoleConfig(BaseModel):
+    """Backend override for one pipeline role.
+
+    Unset fields inherit from the top-level llm section, so a role can
+    switch only the model (``openai: {model: gpt-4o-mini}``) or move to a
+    different backend entirely.
+    """
+
+    backend: Optional[str] = Field(
+        default=None, description="openai, ollama or replay (default: llm.backend)"
+    )
+    openai: Optional[OpenAIConfig] = Field(default=None, description="OpenAI settings overrides")
+    ollama: Optional[OllamaConfig] = Field(default=None, description="Ollama settings overrides")
+
+    @field_validator("backend")
+    @classmethod
+    def validate_backend(cls, v: Optional[str]) -> Optional[str]:
+        """Validate backend choice."""
+        if v is not None and v not in LLM_BACKENDS:
+            raise ValueError(f"Backend must be one of: {LLM_BACKENDS}")
+        return v
+
+
+class LLMRetryConfig(BaseModel):
+    """Retries, backoff and circuit breaking for LLM calls."""
+
+    max_retries: int = Field(default=4, ge=0, description="Retries after a transient failure")
+    base_delay: float = Field(default=1.0, gt=0, description="Backoff base in seconds")
+    max_delay: float = Field(default=30.0, gt=0, description="Backoff cap in seconds")
+    call_deadline: Optional[float] = Field(
+        default=300.0, gt=0, description="Seconds one call may take including retries"
+    )
+    breaker_failures: int = Field(
+        default=5, ge=1, description="Consecutive failures that open the circuit breaker"
+    )
+    breaker_reset_seconds: float = Field(
+        default=60.0, gt=0, description="Seconds the breaker stays open before a trial call"
+    )
+
+
+class LLMRateLimitConfig(BaseModel):
+    """Requests and tokens per minute, shared by all pipelines using a model."""
+
+    requests_per_minute: Optional[int] = Field(
+        default=None, gt=0, description="Request budget per model (null = unlimited)"
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=None, gt=0, description="Estimated token budget per model (null = unlimited)"
+    )
+    lock_file: Optional[str] = Field(
+        default=None, description="Share the budget across processes through this file"
+    )
+    max_concurrent: Optional[int] = Field(
+        default=None, gt=0, description="LLM calls in flight across all roles (null = unlimited)"
+    )
+
+
 class LLMConfig(BaseModel):
     """LLM backend configuration."""
 
-    backend: str = Field(default="openai", description="Backend to use: openai or ollama")
+    backend: str = Field(
+        default="openai", description="Backend to use: openai, ollama or replay"
+    )
     openai: OpenAIConfig = Field(default_factory=OpenAIConfig)
     ollama: OllamaConfig = Field(default_factory=OllamaConfig)
+    replay: ReplayConfig = Field(default_factory=ReplayConfig)
+    record: Optional[str] = Field(
+        default=None, description="Append every LLM request and response to this cassette"
+    )
+    roles: dict[str, LLMRoleConfig] = Field(
+        default_factory=dict,
+        description="Per-role overrides: clarification, planner, generator, critic",
+    )
+    retry: LLMRetryConfig = Field(default_factory=LLMRetryConfig)
+    rate_limit: LLMRateLimitConfig = Field(default_factory=LLMRateLimitConfig)
+    prices: dict[str, tuple[float, float]] = Field(
+        default_factory=dict,
+        description="USD per million (input, output) tokens by model, overriding built-in prices",
+    )
 
     @field_validator("backend")
     @classmethod
     def validate_backend(cls, v: str) -> str:
         """Validate backend choice."""
-        valid = {"openai", "ollama"}
+        if v not in LLM_BACKENDS:
+            raise ValueError(f"Backend must be one of: {LLM_BACKENDS}")
+        return v
+
+    @field_validator("roles")
+    @classmethod
+    def validate_roles(cls, v: dict[str, LLMRoleConfig]) -> dict[str, LLMRoleConfig]:
+        """Validate role names."""
+        unknown = set(v) - LLM_ROLES
+        if unknown:
+            raise ValueError(f"Unknown roles {sorted(unknown)}, must be in: {LLM_ROLES}")
+        return v
+
+    def backend_settings(self, role: Optional[str] = None) -> tuple[str, dict]:
+        """Resolve the backend name and constructor arguments for a role.
+
+        Args:
+            role: Pipeline role, or None for the default backend
+
+        Returns:
+            (backend name, keyword arguments for create_llm)
+        """
+        override = self.roles.get(role) if role else None
+        backend = (override.backend if override else None) or self.backend
+
+        settings = getattr(self, backend).model_dump()
+        role_settings = getattr(override, backend, None) if override else None
+        if role_settings is not None:
+            settings.update(role_settings.model_dump(exclude_unset=True))
+        return backend, settings
+
+
+class RenderQuality(BaseModel):
+    """Render quality tier (engine, samples and resolution)."""
+
+    engine: str = Field(
+        default="CYCLES", description="CYCLES, BLENDER_EEVEE_NEXT or BLENDER_WORKBENCH"
+    )
+    samples: int = Field(default=64, ge=1, description="Render samples (Cycles/EEVEE)")
+    denoise: bool = Field(default=True, description="Enable denoising (Cycles)")
+    resolution: Optional[tuple[int, int]] = Field(
+        default=None, description="Render resolution (default: pipeline.render_resolution)"
+    )
+
+    @field_validator("engine")
+    @classmethod
+    def validate_engine(cls, v: str) -> str:
+        """Validate render engine choice."""
+        valid = {"CYCLES", "BLENDER_EEVEE_NEXT", "BLENDER_EEVEE", "BLENDER_WORKBENCH"}
+        v = v.upper()
         if v not in valid:
-            raise ValueError(f"Backend must be one of: {valid}")
+            raise ValueError(f"Render engine must be one of: {valid}")
         return v
 
 
@@ -69,6 +235,82 @@ class PipelineConfig(BaseModel):
     save_intermediate: bool = Field(
         default=True, description="Save intermediate scripts and logs"
     )
+    turntable_frames: int = Field(default=12, ge=1, description="Number of turntable frames")
+    turntable_angle_step: Optional[float] = Field(
+        default=None, description="Degrees between turntable frames (default: 360 / frames)"
+    )
+    preview_quality: Optional[RenderQuality] = Field(
+        default=None,
+        description=(
+            "Quality for loop iterations; if set, the chosen iteration is re-rendered "
+            "at final_quality"
+        ),
+    )
+    final_quality: RenderQuality = Field(
+        default_factory=RenderQuality, description="Quality for final renders"
+    )
+    max_poly_count: Optional[int] = Field(
+        default=2_000_000, ge=1, description="Skip rendering scenes with more faces than this"
+    )
+    render_workers: int = Field(
+        default=1, ge=1, description="Parallel Blender processes for rendering (1 = no sharding)"
+    )
+    render_threads: Optional[int] = Field(
+        default=None, ge=1, description="Render threads per process (default: cores / workers)"
+    )
+    preflight: bool = Field(
+        default=True, description="Statically check scripts before launching Blender"
+    )
+    preprocess_references: bool = Field(
+        default=True,
+        description="Downscale and re-encode reference images to the backend's useful size",
+    )
+    reference_format: str = Field(default="JPEG", description="Re-encoded format: JPEG or WEBP")
+    reference_quality: int = Field(default=85, ge=1, le=100, description="Re-encoding quality")
+
+    @field_validator("reference_format")
+    @classmethod
+    def validate_reference_format(cls, v: str) -> str:
+        """Validate reference image format."""
+        valid = {"JPEG", "WEBP"}
+        v = v.upper()
+        if v not in valid:
+            raise ValueError(f"Reference format must be one of: {valid}")
+        return v
+
+
+class ExecutionCacheConfig(BaseModel):
+    """Content-addressed cache of Blender execution results."""
+
+    enabled: bool = Field(default=False, description="Reuse renders of identical scripts")
+    dir: str = Field(
+        default="~/.cache/vibe-blender/executions", description="Cache directory"
+    )
+    max_size_mb: int = Field(default=2048, ge=1, description="Evict LRU entries past this size")
+
+
+class LLMCacheConfig(BaseModel):
+    """Disk cache of LLM responses, enabled per agent."""
+
+    enabled: bool = Field(default=False, description="Reuse responses to identical LLM requests")
+    dir: str = Field(default="~/.cache/vibe-blender/llm", description="Cache directory")
+    max_size_mb: int = Field(default=256, ge=1, description="Evict LRU entries past this size")
+    ttl_hours: Optional[float] = Field(
+        default=168, gt=0, description="Entry lifetime in hours (null = never expire)"
+    )
+    agents: list[str] = Field(
+        default_factory=lambda: ["clarification", "planner"],
+        description="Roles whose LLM calls are cached: clarification, planner, generator, critic",
+    )
+
+    @field_validator("agents")
+    @classmethod
+    def validate_agents(cls, v: list[str]) -> list[str]:
+        """Validate role names."""
+        unknown = set(v) - LLM_ROLES
+        if unknown:
+            raise ValueError(f"Unknown agents {sorted(unknown)}, must be in: {LLM_ROLES}")
+        return v
 
 
 class LoggingConfig(BaseModel):
@@ -98,6 +340,8 @@ class Config(BaseSettings):
     blender: BlenderConfig
     llm: LLMConfig = Field(default_factory=LLMConfig)
     pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    execution_cache: ExecutionCacheConfig = Field(default_factory=ExecutionCacheConfig)
+    llm_cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
     @classmethod
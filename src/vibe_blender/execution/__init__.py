@@ -1,7 +1,19 @@
 """Execution components for Vibe-Blender."""
 
+from .cache import ExecutionCache
 from .executor import BlenderExecutor
+from .pool import BlenderWorkerPool
+from .preflight import PreflightChecker
 from .renderer import RenderManager
+from .sharding import ShardedRenderer
 from .watchdog import Watchdog
 
-__all__ = ["BlenderExecutor", "RenderManager", "Watchdog"]
+__all__ = [
+    "BlenderExecutor",
+    "BlenderWorkerPool",
+    "ExecutionCache",
+    "PreflightChecker",
+    "RenderManager",
+    "ShardedRenderer",
+    "Watchdog",
+]
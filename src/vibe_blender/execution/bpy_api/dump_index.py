@@ -0,0 +1,41 @@
+"""Dump the bpy API index used by the pre-flight check.
+
+Run inside the Blender version to index, with factory settings so only
+bundled add-ons contribute operators:
+
+    blender --background --factory-startup --python dump_index.py -- 4.2.json
+"""
+
+import json
+import sys
+
+import bpy
+
+# Operator families whose members are listed exhaustively in the index
+FAMILIES = ["mesh.primitive_", "curve.primitive_", "surface.primitive_"]
+
+
+def main() -> None:
+    output = sys.argv[sys.argv.index("--") + 1]
+    version = ".".join(str(part) for part in bpy.app.version[:2])
+
+    families = {}
+    for family in FAMILIES:
+        module, prefix = family.split(".")
+        families[family] = sorted(
+            name for name in dir(getattr(bpy.ops, module)) if name.startswith(prefix)
+        )
+
+    index = {
+        "blender_version": version,
+        "data": sorted(name for name in dir(bpy.data) if not name.startswith("_")),
+        "ops_modules": sorted(name for name in dir(bpy.ops) if not name.startswith("_")),
+        "ops_families": families,
+    }
+    with open(output, "w") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    print(f"Wrote bpy API index for Blender {version} to {output}")
+
+
+main()
@@ -0,0 +1,182 @@
+"""Content-addressed cache of Blender execution results."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Files and directories copied into / out of a cache entry
+CACHED_FILES = ["model.blend", "blender.log"]
+META_FILE = "meta.json"
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst, falling back to a copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _link_tree(src: Path, dst: Path) -> None:
+    """Recursively hard-link (or copy) a directory tree."""
+    shutil.copytree(src, dst, copy_function=_link_or_copy, dirs_exist_ok=True)
+
+
+def _replace_copy(src: Path, dst: Path) -> None:
+    """Copy src to dst as a new file, never writing through an existing dst."""
+    Path(dst).unlink(missing_ok=True)
+    shutil.copy2(src, dst)
+
+
+def _tree_size(path: Path) -> int:
+    """Total size in bytes of all files under path."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class ExecutionCache:
+    """Disk cache of rendered outputs keyed by a hash of the prepared script.
+
+    Each entry holds the iteration's ``renders/`` directory, ``model.blend``
+    and ``blender.log``, hard-linked from the iteration that stored it. A hit
+    copies them into the new iteration directory so Blender doesn't need to
+    run; copies keep later in-place rewrites (a resumed run reopening
+    ``blender.log``, a user saving ``model.blend``) out of the entry. Entries are evicted
+    least-recently-used first once the cache grows past ``max_size_mb``.
+    """
+
+    def __init__(self, cache_dir: Path | str, max_size_mb: int = 2048):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_size_mb: Size limit before least-recently-used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_size_mb * 1024 * 1024
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash the given parts into a cache key."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def restore(self, key: str, iter_dir: Path, render_dir_name: str = "renders") -> bool:
+        """Populate iter_dir from a cache entry.
+
+        Args:
+            key: Cache key
+            iter_dir: Iteration directory to populate
+            render_dir_name: Name of the renders directory inside iter_dir
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        entry = self.cache_dir / key
+        with self._lock:
+            if not (entry / META_FILE).exists():
+                self.misses += 1
+                logger.info(f"Execution cache miss ({key[:12]})")
+                return False
+
+            # Touch the entry so LRU eviction sees it as recently used
+            os.utime(entry / META_FILE)
+
+            if (entry / "renders").exists():
+                shutil.copytree(
+                    entry / "renders",
+                    iter_dir / render_dir_name,
+                    copy_function=_replace_copy,
+                    dirs_exist_ok=True,
+                )
+            for name in CACHED_FILES:
+                if (entry / name).exists():
+                    _replace_copy(entry / name, iter_dir / name)
+
+            self.hits += 1
+
+        logger.info(f"Execution cache hit ({key[:12]}), skipped Blender")
+        return True
+
+    def store(self, key: str, iter_dir: Path, render_dir_name: str = "renders") -> None:
+        """Save an iteration's outputs under key.
+
+        Args:
+            key: Cache key
+            iter_dir: Iteration directory holding the outputs
+            render_dir_name: Name of the renders directory inside iter_dir
+        """
+        entry = self.cache_dir / key
+        tmp = self.cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            tmp.mkdir(parents=True)
+            if (iter_dir / render_dir_name).exists():
+                _link_tree(iter_dir / render_dir_name, tmp / "renders")
+            for name in CACHED_FILES:
+                if (iter_dir / name).exists():
+                    _link_or_copy(iter_dir / name, tmp / name)
+            (tmp / META_FILE).write_text(
+                json.dumps({"created": time.time(), "size": _tree_size(tmp)})
+            )
+
+            with self._lock:
+                if entry.exists():
+                    shutil.rmtree(tmp)
+                    return
+                tmp.rename(entry)
+                self._evict_locked()
+        except OSError as e:
+            logger.warning(f"Could not store execution cache entry: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current cache size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries()),
+            "size_mb": sum(size for _, size, _ in self._entries()) / (1024 * 1024),
+        }
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        """List (path, size, last_used) for all complete entries."""
+        entries = []
+        for meta_path in self.cache_dir.glob(f"*/{META_FILE}"):
+            try:
+                size = json.loads(meta_path.read_text()).get("size", 0)
+                entries.append((meta_path.parent, size, meta_path.stat().st_mtime))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _evict_locked(self) -> None:
+        """Delete least-recently-used entries until under the size limit."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+            logger.debug(f"Evicted execution cache entry {path.name[:12]}")
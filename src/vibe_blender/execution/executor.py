@@ -4,13 +4,20 @@ import logging
 import os
 import subprocess
 import tempfile
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from ..config import Config
-from ..models.schemas import GeneratedScript, RenderOutput
+from ..config import Config, RenderQuality
+from ..models.schemas import GeneratedScript, RenderOutput, RenderStats, SceneStats
+from ..scheduling import ResourcePool
+from .cache import ExecutionCache
+from .pool import BlenderWorkerPool
+from .preflight import PreflightChecker, load_api_index
 from .renderer import RenderManager
+from .sharding import RenderShard, ShardedRenderer
+from .streaming import USER_CODE_MARKER, run_streaming
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +29,81 @@ class BlenderExecutor:
     output capture for debugging.
     """
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, slots: Optional[ResourcePool] = None):
         """Initialize the executor.
 
         Args:
             config: Application configuration
+            slots: Blender slots, e.g. shared with a scheduler
+                (default: blender.max_concurrent slots, or no limit)
         """
         self.blender_path = config.blender.executable
         self.timeout = config.blender.timeout
         self.render_resolution = config.pipeline.render_resolution
         self.save_intermediate = config.pipeline.save_intermediate
+        self.turntable_frames = config.pipeline.turntable_frames
+        self.turntable_angle_step = config.pipeline.turntable_angle_step
+        self.max_poly_count = config.pipeline.max_poly_count
+        self.render_workers = config.pipeline.render_workers
+        self.render_threads = config.pipeline.render_threads
+        self.final_quality = config.pipeline.final_quality
+        # Loop iterations use the preview tier when one is configured
+        self.iteration_quality = config.pipeline.preview_quality or config.pipeline.final_quality
+
+        self.pool: Optional[BlenderWorkerPool] = None
+        if config.blender.pool_size > 0:
+            self.pool = BlenderWorkerPool(
+                self.blender_path,
+                size=config.blender.pool_size,
+                timeout=self.timeout,
+                max_jobs=config.blender.worker_max_jobs,
+                max_memory_mb=config.blender.worker_max_memory_mb,
+                startup_timeout=config.blender.worker_startup_timeout,
+            )
+            logger.warning(
+                "Warm Blender workers return output when each job ends: blender.log is "
+                "not streamed, and a script that prints a traceback but keeps running is "
+                "not stopped early"
+            )
+
+        # Caps Blender runs across all pipelines sharing this executor
+        self.slots = slots
+        if slots is None and config.blender.max_concurrent:
+            self.slots = ResourcePool("blender", config.blender.max_concurrent)
+
+        self.cache: Optional[ExecutionCache] = None
+        if config.execution_cache.enabled:
+            self.cache = ExecutionCache(
+                config.execution_cache.dir,
+                max_size_mb=config.execution_cache.max_size_mb,
+            )
+        self._blender_version: Optional[str] = None
+
+        self.preflight = config.pipeline.preflight
+        self._preflight_checker: Optional[PreflightChecker] = None
+
+    def warm_up(self) -> None:
+        """Start warm Blender workers in the background (no-op without a pool)."""
+        if self.pool:
+            self.pool.start()
+
+    def close(self) -> None:
+        """Shut down warm Blender workers, if any."""
+        if self.pool:
+            self.pool.shutdown()
 
     def execute(
         self,
         script: GeneratedScript,
         output_dir: Path,
+        quality: Optional[RenderQuality] = None,
     ) -> RenderOutput:
         """Execute a Blender script and render output.
 
         Args:
             script: The generated script to execute
             output_dir: Directory for output files
+            quality: Render quality tier (default: preview tier if configured, else final)
 
         Returns:
             RenderOutput with paths to generated files
@@ -53,6 +114,7 @@ class BlenderExecutor:
         """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+        quality = quality or self.iteration_quality
 
         # Update the global script (source of truth across iterations)
         global_script_path = output_dir / "script.py"
@@ -68,18 +130,198 @@ class BlenderExecutor:
         render_dir = iter_dir / "renders"
         render_dir.mkdir(exist_ok=True)
 
+        # With sharding, this run only builds the scene; shards render it afterwards
+        scene_blend_path = iter_dir / "render_scene.blend" if self.render_workers > 1 else None
+
+        render_vars = self._render_mode_vars(scene_blend_path)
         full_script = self._prepare_script(
             script.code,
             blend_path=blend_path,
             render_dir=render_dir,
+            render_vars=render_vars,
+            quality=quality,
         )
 
         script_path.write_text(full_script)
         logger.info(f"Wrote iteration script to {script_path}")
 
+        # Catch syntax errors, undefined names and bad bpy paths without Blender
+        if self.preflight:
+            header = self._script_header(blend_path, render_dir, render_vars, quality)
+            preflight_error = self._preflight_check(full_script, script_path, header)
+            if preflight_error:
+                logger.warning(f"Pre-flight check failed: {preflight_error[:200]}...")
+                (iter_dir / "preflight.log").write_text(preflight_error)
+                return RenderOutput(
+                    script_path=script_path,
+                    render_dir=render_dir,
+                    blender_error=preflight_error,
+                )
+
+        # Identical prepared scripts produce identical renders: reuse them
+        cache_key = self._cache_key(script.code, quality) if self.cache else None
+        if cache_key and self.cache.restore(cache_key, iter_dir):
+            grid_image = render_dir / "grid_4view.png"
+            turntable_gif = render_dir / "turntable.gif"
+            return RenderOutput(
+                script_path=script_path,
+                blend_file=blend_path if blend_path.exists() else None,
+                grid_image=grid_image if grid_image.exists() else None,
+                turntable_gif=turntable_gif if turntable_gif.exists() else None,
+                render_dir=render_dir,
+                scene_stats=self._load_scene_stats(render_dir),
+                render_stats=self._load_render_stats(render_dir),
+            )
+
+        output = self._run_and_collect(
+            script_path,
+            iter_dir / "blender.log",
+            blend_path=blend_path,
+            render_dir=render_dir,
+            quality=quality,
+            scene_blend_path=scene_blend_path,
+        )
+
+        # Only clean runs are cached; errors may be transient (GPU, timeouts)
+        if cache_key and output.blender_error is None and output.grid_image is not None:
+            self.cache.store(cache_key, iter_dir)
+
+        return output
+
+    def _preflight_check(self, full_script: str, script_path: Path, header: str) -> Optional[str]:
+        """Run the static pre-flight check on a prepared script.
+
+        Args:
+            full_script: Prepared script as written to script_path
+            script_path: Path of the prepared script
+            header: Script header the generated code was prepended with
+
+        Returns:
+            Error text in Blender traceback format, or None if the script passes
+        """
+        from ..templates.render_views import RENDER_TEMPLATE
+
+        if self._preflight_checker is None:
+            self._preflight_checker = PreflightChecker(load_api_index(self.blender_version()))
+
+        first_line = header.count("\n") + 1
+        last_line = full_script[: full_script.rfind(RENDER_TEMPLATE)].count("\n")
+        return self._preflight_checker.check(
+            full_script, str(script_path), (first_line, last_line)
+        )
+
+    def _cache_key(self, code: str, quality: RenderQuality) -> str:
+        """Hash the prepared script, template version, resolution and Blender version.
+
+        The script is prepared with placeholder paths and without the
+        timestamp line, so the key only depends on what Blender will render.
+        """
+        from ..templates.render_views import RENDER_TEMPLATE_VERSION
+
+        prepared = self._prepare_script(
+            code, Path("<blend>"), Path("<renders>"), quality=quality
+        )
+        prepared = "\n".join(
+            line for line in prepared.split("\n") if not line.startswith("# Timestamp:")
+        )
+        resolution = quality.resolution or self.render_resolution
+        return ExecutionCache.make_key(
+            prepared,
+            RENDER_TEMPLATE_VERSION,
+            str(tuple(resolution)),
+            self.blender_version(),
+        )
+
+    def rerender(
+        self,
+        render_output: RenderOutput,
+        quality: Optional[RenderQuality] = None,
+    ) -> RenderOutput:
+        """Re-render an iteration's saved model.blend at another quality tier.
+
+        Renders go to ``renders_final/`` next to the iteration's ``renders/``.
+
+        Args:
+            render_output: Output of the iteration to re-render
+            quality: Render quality tier (default: final tier)
+
+        Returns:
+            RenderOutput pointing at the new renders
+
+        Raises:
+            FileNotFoundError: If the iteration has no saved .blend file
+            RuntimeError: If Blender execution fails
+            TimeoutError: If execution exceeds timeout
+        """
+        from ..templates.render_views import RENDER_TEMPLATE
+
+        blend_path = render_output.blend_file
+        if blend_path is None or not blend_path.exists():
+            raise FileNotFoundError(f"No saved .blend file to re-render: {blend_path}")
+
+        quality = quality or self.final_quality
+        iter_dir = blend_path.parent
+        render_dir = iter_dir / "renders_final"
+        render_dir.mkdir(exist_ok=True)
+        scene_blend_path = None
+        if self.render_workers > 1:
+            scene_blend_path = iter_dir / "render_scene_final.blend"
+
+        script_path = iter_dir / "rerender.py"
+        header = self._script_header(
+            blend_path, render_dir, self._render_mode_vars(scene_blend_path), quality
+        )
+        script_path.write_text(header + RENDER_TEMPLATE)
+        logger.info(f"Re-rendering {blend_path} with {quality.engine}")
+
+        output = self._run_and_collect(
+            script_path,
+            iter_dir / "rerender.log",
+            blend_path=blend_path,
+            render_dir=render_dir,
+            quality=quality,
+            scene_blend_path=scene_blend_path,
+            open_blend=blend_path,
+        )
+        return output.model_copy(update={"script_path": render_output.script_path})
+
+    def _render_mode_vars(self, scene_blend_path: Optional[Path]) -> dict:
+        """Template variables for a sharded prepare run (empty for a full render)."""
+        if scene_blend_path is None:
+            return {}
+        return {"RENDER_MODE": "prepare", "SCENE_BLEND_PATH": scene_blend_path}
+
+    def _run_and_collect(
+        self,
+        script_path: Path,
+        log_path: Path,
+        blend_path: Path,
+        render_dir: Path,
+        quality: RenderQuality,
+        scene_blend_path: Optional[Path] = None,
+        open_blend: Optional[Path] = None,
+    ) -> RenderOutput:
+        """Run a prepared script, render shards if needed, and post-process renders.
+
+        Args:
+            script_path: Prepared script to run
+            log_path: Path to save logs
+            blend_path: The model's .blend path
+            render_dir: Directory for renders
+            quality: Render quality tier
+            scene_blend_path: Render scene saved for sharding (None = single process)
+            open_blend: Optional .blend file to open before running the script
+
+        Returns:
+            RenderOutput with paths to generated files
+        """
+        iter_dir = script_path.parent
+
         # Execute Blender
-        log_path = iter_dir / "blender.log"
-        success, stdout, stderr = self._run_blender(script_path, log_path)
+        with self.slots or nullcontext():
+            success, stdout, stderr = self._run_blender(
+                script_path, log_path, blend_file=open_blend
+            )
 
         # Check for Python errors in stderr (even if Blender returned 0)
         blender_error = None
@@ -88,11 +330,24 @@ class BlenderExecutor:
             blender_error = self._extract_python_error(stderr)
             logger.warning(f"Blender script had errors: {blender_error[:200]}...")
 
+        # The render template skips rendering for empty/degenerate scenes
+        scene_stats = self._load_scene_stats(render_dir)
+        if blender_error is None and scene_stats and scene_stats.skip_reason:
+            blender_error = f"Scene validation failed: {scene_stats.skip_reason}"
+            logger.warning(f"Skipped rendering: {scene_stats.skip_reason}")
+
+        if scene_blend_path and blender_error is None and scene_blend_path.exists():
+            shard_errors = self._render_sharded(
+                scene_blend_path, blend_path, render_dir, iter_dir, quality
+            )
+            if shard_errors:
+                blender_error = "Sharded render failed:\n" + "\n".join(shard_errors)
+
         # Post-process: create grid and GIF using host Python (with PIL)
         grid_image = render_dir / "grid_4view.png"
         turntable_gif = render_dir / "turntable.gif"
 
-        render_manager = RenderManager(self.render_resolution)
+        render_manager = RenderManager(quality.resolution or self.render_resolution)
 
         # Create grid from individual views
         view_images = [
@@ -133,7 +388,62 @@ class BlenderExecutor:
             turntable_gif=turntable_gif if turntable_gif.exists() else None,
             render_dir=render_dir,
             blender_error=blender_error,
+            scene_stats=scene_stats,
+            render_stats=self._load_render_stats(render_dir),
+        )
+
+    def _load_scene_stats(self, render_dir: Path) -> Optional[SceneStats]:
+        """Load the scene_stats.json sidecar written by the render template.
+
+        Args:
+            render_dir: Directory containing renders
+
+        Returns:
+            Parsed SceneStats, or None if missing or unreadable
+        """
+        stats_path = render_dir / "scene_stats.json"
+        if not stats_path.exists():
+            return None
+
+        try:
+            stats = SceneStats.model_validate_json(stats_path.read_text())
+        except ValueError as e:
+            logger.warning(f"Could not parse {stats_path}: {e}")
+            return None
+
+        logger.info(
+            f"Scene stats: {stats.mesh_objects} geometry objects, {stats.vertices} verts, "
+            f"{stats.faces} faces, {stats.materials} materials"
         )
+        return stats
+
+    def _load_render_stats(self, render_dir: Path) -> Optional[RenderStats]:
+        """Load render_stats.json and merge in the stats of any render shards.
+
+        Args:
+            render_dir: Directory containing renders
+
+        Returns:
+            Parsed RenderStats, or None if missing or unreadable
+        """
+        stats_path = render_dir / "render_stats.json"
+        if not stats_path.exists():
+            return None
+
+        try:
+            stats = RenderStats.model_validate_json(stats_path.read_text())
+            for shard_path in sorted(render_dir.glob("render_stats_shard_*.json")):
+                shard = RenderStats.model_validate_json(shard_path.read_text())
+                # Prefix shard stages, e.g. "shard_01/view_top"
+                prefix = shard_path.stem.removeprefix("render_stats_")
+                stats.stages.update({f"{prefix}/{k}": v for k, v in shard.stages.items()})
+                peaks = [p for p in (stats.peak_memory_mb, shard.peak_memory_mb) if p is not None]
+                stats.peak_memory_mb = max(peaks) if peaks else None
+        except ValueError as e:
+            logger.warning(f"Could not parse render stats in {render_dir}: {e}")
+            return None
+
+        return stats
 
     def _extract_python_error(self, stderr: str) -> str:
         """Extract Python error from Blender stderr.
@@ -165,26 +475,82 @@ class BlenderExecutor:
         # Return last 10 lines as fallback
         return '\n'.join(lines[-10:])
 
-    def _prepare_script(
+    def _render_sharded(
         self,
-        code: str,
+        scene_blend_path: Path,
         blend_path: Path,
         render_dir: Path,
+        iter_dir: Path,
+        quality: RenderQuality,
+    ) -> list[str]:
+        """Render views and turntable frames of a prepared scene in parallel.
+
+        Each shard is a Blender process of its own and takes its own slot.
+
+        Args:
+            scene_blend_path: Render scene saved by the prepare run
+            blend_path: The model's .blend path (for the script header)
+            render_dir: Shared output directory for all shards
+            iter_dir: Iteration directory for shard scripts and logs
+            quality: Render quality tier
+
+        Returns:
+            Error messages of shards that failed (empty on success)
+        """
+        from ..templates.render_views import RENDER_TEMPLATE
+
+        def build_script(shard: RenderShard, threads: int) -> str:
+            header = self._script_header(
+                blend_path,
+                render_dir,
+                {
+                    "RENDER_MODE": "shard",
+                    "SHARD_INDEX": shard.index,
+                    "SHARD_VIEWS": shard.views,
+                    "SHARD_FRAME_RANGE": shard.frame_range,
+                    "RENDER_THREADS": threads,
+                },
+                quality,
+            )
+            return header + RENDER_TEMPLATE
+
+        def run_shard(
+            script_path: Path, log_path: Path, blend_file: Optional[Path] = None
+        ) -> tuple[bool, str, str]:
+            with self.slots or nullcontext():
+                return self._run_blender(script_path, log_path, blend_file=blend_file)
+
+        renderer = ShardedRenderer(run_shard, self.render_workers, self.render_threads)
+        return renderer.render(scene_blend_path, iter_dir, self.turntable_frames, build_script)
+
+    def _script_header(
+        self,
+        blend_path: Path,
+        render_dir: Path,
+        render_vars: Optional[dict] = None,
+        quality: Optional[RenderQuality] = None,
     ) -> str:
-        """Prepare the full script with output paths and rendering code.
+        """Build the script header that injects output paths and render settings.
 
         Args:
-            code: Original generated code
             blend_path: Path to save .blend file
             render_dir: Directory for renders
+            render_vars: Extra variables for the render template (e.g. RENDER_MODE)
+            quality: Render quality tier (default: the iteration tier)
 
         Returns:
-            Complete script with injected variables and rendering code
+            Header source defining the injected variables
         """
-        from ..templates.render_views import RENDER_TEMPLATE
+        from ..templates.render_views import RENDER_STATS_HEADER
 
-        # Inject output variables at the start
-        header = f'''# Auto-generated by Vibe-Blender
+        quality = quality or self.iteration_quality
+        resolution = quality.resolution or self.render_resolution
+        extra = "".join(
+            f"{name} = {str(value)!r}\n" if isinstance(value, Path) else f"{name} = {value!r}\n"
+            for name, value in (render_vars or {}).items()
+        )
+
+        return f'''# Auto-generated by Vibe-Blender
 # Timestamp: {datetime.now().isoformat()}
 
 import bpy
@@ -194,10 +560,46 @@ import os
 # Output paths (injected by executor)
 OUTPUT_BLEND_PATH = r"{blend_path}"
 OUTPUT_DIR = r"{render_dir}"
-RENDER_RESOLUTION = {tuple(self.render_resolution)}
+RENDER_RESOLUTION = {tuple(resolution)}
+RENDER_ENGINE = {quality.engine!r}
+RENDER_SAMPLES = {quality.samples}
+RENDER_DENOISE = {quality.denoise}
+TURNTABLE_FRAMES = {self.turntable_frames}
+TURNTABLE_ANGLE_STEP = {self.turntable_angle_step!r}
+MAX_POLY_COUNT = {self.max_poly_count!r}
+{extra}{RENDER_STATS_HEADER}
+# Lets the executor tell Blender startup errors from script errors
+import sys
+sys.stderr.write("{USER_CODE_MARKER}\\n")
+sys.stderr.flush()
 
 '''
 
+    def _prepare_script(
+        self,
+        code: str,
+        blend_path: Path,
+        render_dir: Path,
+        render_vars: Optional[dict] = None,
+        quality: Optional[RenderQuality] = None,
+    ) -> str:
+        """Prepare the full script with output paths and rendering code.
+
+        Args:
+            code: Original generated code
+            blend_path: Path to save .blend file
+            render_dir: Directory for renders
+            render_vars: Extra variables for the render template (e.g. RENDER_MODE)
+            quality: Render quality tier (default: the iteration tier)
+
+        Returns:
+            Complete script with injected variables and rendering code
+        """
+        from ..templates.render_views import RENDER_TEMPLATE
+
+        # Inject output variables at the start
+        header = self._script_header(blend_path, render_dir, render_vars, quality)
+
         # Remove duplicate imports from the generated code
         code_lines = code.split('\n')
         filtered_lines = []
@@ -220,12 +622,19 @@ RENDER_RESOLUTION = {tuple(self.render_resolution)}
         self,
         script_path: Path,
         log_path: Path,
+        blend_file: Optional[Path] = None,
     ) -> tuple[bool, str, str]:
-        """Run Blender with the script.
+        """Run Blender with the script (on a warm worker if a pool is configured).
+
+        A fresh process streams its output to log_path and is stopped shortly
+        after a traceback in the generated code. A warm worker writes the log
+        when the job ends; an uncaught exception still ends the script at once,
+        but a traceback the script prints and then carries on from doesn't.
 
         Args:
             script_path: Path to the Python script
             log_path: Path to save logs
+            blend_file: Optional .blend file to open before running the script
 
         Returns:
             Tuple of (success, stdout, stderr)
@@ -234,47 +643,58 @@ RENDER_RESOLUTION = {tuple(self.render_resolution)}
             RuntimeError: If Blender fails
             TimeoutError: If execution times out
         """
-        cmd = [
-            self.blender_path,
-            "--background",
-            "--python",
-            str(script_path),
-        ]
+        if self.pool:
+            return self.pool.run(script_path, log_path, blend_file=blend_file)
+
+        cmd = [self.blender_path, "--background"]
+        if blend_file is not None:
+            cmd.append(str(blend_file))
+        cmd += ["--python", str(script_path)]
 
         logger.info(f"Running: {' '.join(cmd)}")
 
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        # Stream output to the log and stop as soon as the generated code raises
+        result = run_streaming(
+            cmd,
+            log_path,
+            timeout=self.timeout,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONUNBUFFERED": "1"},
+        )
+
+        # The traceback is reported as a script error, not a Blender failure
+        if result.script_error:
+            if result.killed_on_error:
+                logger.info("Blender stopped early after a traceback in the script")
+            return False, result.stdout, result.stderr
+
+        if result.returncode != 0:
+            logger.error(f"Blender exited with code {result.returncode}")
+            logger.error(f"Stderr: {result.stderr[:1000]}")
+            raise RuntimeError(
+                f"Blender execution failed (code {result.returncode}): {result.stderr[:500]}"
             )
 
-            stdout = result.stdout
-            stderr = result.stderr
-
-            # Save logs
-            with open(log_path, "w") as f:
-                f.write("=== STDOUT ===\n")
-                f.write(stdout)
-                f.write("\n=== STDERR ===\n")
-                f.write(stderr)
-
-            if result.returncode != 0:
-                logger.error(f"Blender exited with code {result.returncode}")
-                logger.error(f"Stderr: {stderr[:1000]}")
-                raise RuntimeError(
-                    f"Blender execution failed (code {result.returncode}): {stderr[:500]}"
-                )
+        logger.info("Blender execution completed successfully")
+        return True, result.stdout, result.stderr
 
-            logger.info("Blender execution completed successfully")
-            return True, stdout, stderr
+    def blender_version(self) -> str:
+        """Return the first line of ``blender --version`` (cached after the first call).
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"Blender execution timed out after {self.timeout}s")
-            raise TimeoutError(f"Blender execution timed out after {self.timeout} seconds")
+        Returns:
+            Version string, or "unknown" if Blender could not be queried
+        """
+        if self._blender_version is None:
+            try:
+                result = subprocess.run(
+                    [self.blender_path, "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+                self._blender_version = result.stdout.split('\n')[0].strip() or "unknown"
+            except (subprocess.SubprocessError, FileNotFoundError):
+                self._blender_version = "unknown"
+        return self._blender_version
 
     def validate_blender(self) -> bool:
         """Check if Blender is available and working.
@@ -0,0 +1,333 @@
+"""Pool of warm, long-lived Blender worker processes."""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import secrets
+import shutil
+import socket
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _send_message(conn: socket.socket, message: dict) -> None:
+    """Send one length-prefixed JSON message."""
+    body = json.dumps(message).encode("utf-8")
+    conn.sendall(struct.pack(">I", len(body)) + body)
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes from the socket."""
+    chunks = []
+    while size > 0:
+        chunk = conn.recv(size)
+        if not chunk:
+            raise ConnectionError("Blender worker closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(conn: socket.socket) -> dict:
+    """Receive one length-prefixed JSON message."""
+    (size,) = struct.unpack(">I", _recv_exact(conn, 4))
+    return json.loads(_recv_exact(conn, size).decode("utf-8"))
+
+
+class _Worker:
+    """A single Blender process serving jobs over a local socket."""
+
+    def __init__(self, worker_id: int, blender_path: str, bootstrap_path: Path, log_dir: Path):
+        self.worker_id = worker_id
+        self.jobs_done = 0
+        self.memory_mb = 0.0
+        self.conn: Optional[socket.socket] = None
+
+        self._token = secrets.token_hex(16)
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        port = self._listener.getsockname()[1]
+
+        self._log_file = open(log_dir / f"worker_{worker_id:02d}.log", "ab")
+        self.process = subprocess.Popen(
+            [blender_path, "--background", "--python", str(bootstrap_path)],
+            stdout=self._log_file,
+            stderr=subprocess.STDOUT,
+            env={
+                **os.environ,
+                "PYTHONDONTWRITEBYTECODE": "1",
+                "VIBE_BLENDER_WORKER_PORT": str(port),
+                "VIBE_BLENDER_WORKER_TOKEN": self._token,
+            },
+        )
+        logger.info(f"Started Blender worker {worker_id} (pid {self.process.pid})")
+
+    def connect(self, timeout: float) -> None:
+        """Wait for the Blender process to connect back (no-op once connected)."""
+        if self.conn is not None:
+            return
+
+        # Poll in short slices so a worker that dies during startup fails fast
+        deadline = time.monotonic() + timeout
+        self._listener.settimeout(0.5)
+        try:
+            while True:
+                try:
+                    conn, _ = self._listener.accept()
+                    break
+                except socket.timeout:
+                    if not self.is_alive():
+                        raise RuntimeError(
+                            f"Blender worker {self.worker_id} exited during startup "
+                            f"(code {self.process.returncode})"
+                        )
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(
+                            f"Blender worker {self.worker_id} did not start within {timeout}s"
+                        )
+        finally:
+            self._listener.close()
+
+        conn.settimeout(timeout)
+        hello = _recv_message(conn)
+        if hello.get("token") != self._token:
+            conn.close()
+            raise RuntimeError(f"Blender worker {self.worker_id} sent an invalid handshake")
+
+        self.memory_mb = hello.get("memory_mb", 0.0)
+        self.conn = conn
+
+    def run(self, job: dict, timeout: float) -> dict:
+        """Send a job to a connected worker and wait for its result."""
+        self.conn.settimeout(timeout)
+        _send_message(self.conn, job)
+        result = _recv_message(self.conn)
+        self.jobs_done += 1
+        self.memory_mb = result.get("memory_mb", 0.0)
+        return result
+
+    def is_alive(self) -> bool:
+        """Check whether the Blender process is still running."""
+        return self.process.poll() is None
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not comply."""
+        if self.conn is not None:
+            try:
+                _send_message(self.conn, {"command": "shutdown"})
+            except OSError:
+                pass
+            self.conn.close()
+            self.conn = None
+        else:
+            self._listener.close()
+
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._log_file.close()
+
+
+class BlenderWorkerPool:
+    """Keeps Blender processes warm between script executions.
+
+    Each worker is a ``blender --background`` process running the
+    ``WORKER_TEMPLATE`` loop. Jobs are handed over a local socket, and the
+    worker resets to factory settings before each one, so a job sees the
+    same scene as a freshly launched Blender. Workers are recycled after
+    ``max_jobs`` jobs or when their memory exceeds ``max_memory_mb``.
+
+    Output is returned when a job ends rather than streamed, so the
+    executor's early stop on a printed traceback doesn't apply; a script
+    still ends at its first uncaught exception.
+    """
+
+    def __init__(
+        self,
+        blender_path: str,
+        size: int,
+        timeout: int = 120,
+        max_jobs: int = 20,
+        max_memory_mb: int = 4096,
+        startup_timeout: int = 60,
+    ):
+        """Initialize the pool (workers are spawned lazily or via start()).
+
+        Args:
+            blender_path: Path to the Blender executable
+            size: Maximum number of concurrent workers
+            timeout: Per-job timeout in seconds
+            max_jobs: Recycle a worker after this many jobs
+            max_memory_mb: Recycle a worker once its memory exceeds this
+            startup_timeout: Seconds a new worker may take to connect back
+        """
+        from ..templates.worker import WORKER_TEMPLATE
+
+        self.blender_path = blender_path
+        self.size = size
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.startup_timeout = startup_timeout
+
+        self._work_dir = Path(tempfile.mkdtemp(prefix="vibe_blender_pool_"))
+        self._bootstrap_path = self._work_dir / "worker.py"
+        self._bootstrap_path.write_text(WORKER_TEMPLATE)
+
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._next_id = 0
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    def start(self) -> None:
+        """Spawn all workers up front so they boot while other work happens."""
+        with self._lock:
+            while self._live < self.size:
+                self._idle.put(self._spawn_locked())
+
+    def run(
+        self,
+        script_path: Path,
+        log_path: Path,
+        blend_file: Optional[Path] = None,
+    ) -> tuple[bool, str, str]:
+        """Execute a script on a warm worker.
+
+        Args:
+            script_path: Path to the prepared Python script
+            log_path: Path to save logs
+            blend_file: Optional .blend file to open instead of factory settings
+
+        Returns:
+            Tuple of (success, stdout, stderr); success is False if the script raised
+
+        Raises:
+            RuntimeError: If the worker fails to start or crashes
+            TimeoutError: If execution times out
+        """
+        worker = self._acquire()
+        job = {"script_path": str(script_path)}
+        if blend_file is not None:
+            job["blend_file"] = str(blend_file)
+
+        try:
+            worker.connect(self.startup_timeout)
+        except (OSError, RuntimeError, ValueError) as e:
+            # TimeoutError is an OSError: a worker that never connected is a startup failure
+            logger.error(f"Blender worker {worker.worker_id} failed to start: {e}")
+            self._discard(worker)
+            raise RuntimeError(f"Blender worker failed to start: {e}")
+
+        logger.info(f"Running {script_path} on Blender worker {worker.worker_id}")
+
+        try:
+            result = worker.run(job, self.timeout)
+        except socket.timeout:
+            logger.error(f"Blender worker {worker.worker_id} timed out after {self.timeout}s")
+            self._discard(worker)
+            raise TimeoutError(f"Blender execution timed out after {self.timeout} seconds")
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.error(f"Blender worker {worker.worker_id} failed: {e}")
+            self._discard(worker)
+            raise RuntimeError(f"Blender worker crashed: {e}")
+
+        try:
+            stdout = result.get("stdout", "")
+            stderr = result.get("stderr", "")
+            success = bool(result.get("success", False))
+
+            with open(log_path, "w") as f:
+                f.write("=== STDOUT ===\n")
+                f.write(stdout)
+                f.write("\n=== STDERR ===\n")
+                f.write(stderr)
+        finally:
+            self._release(worker)
+
+        if success:
+            logger.info("Blender execution completed successfully")
+        else:
+            logger.info("Script raised an exception on the Blender worker")
+        return success, stdout, stderr
+
+    def shutdown(self) -> None:
+        """Stop all idle workers, remove the work directory and refuse further jobs."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+            with self._lock:
+                self._live -= 1
+        # Busy workers stop when released; they no longer need the bootstrap script
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+        # The registration would keep this pool alive until the interpreter exits
+        atexit.unregister(self.shutdown)
+
+    def _spawn_locked(self) -> _Worker:
+        """Spawn a new worker (caller holds the lock)."""
+        worker = _Worker(self._next_id, self.blender_path, self._bootstrap_path, self._work_dir)
+        self._next_id += 1
+        self._live += 1
+        return worker
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, spawning one if the pool has room."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Blender worker pool is shut down")
+            if self._idle.empty() and self._live < self.size:
+                return self._spawn_locked()
+        return self._idle.get()
+
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker to the pool, recycling it if it is worn out."""
+        if self._closed:
+            worker.stop()
+            with self._lock:
+                self._live -= 1
+        elif worker.jobs_done >= self.max_jobs:
+            logger.info(
+                f"Recycling Blender worker {worker.worker_id} after {worker.jobs_done} jobs"
+            )
+            self._replace(worker)
+        elif worker.memory_mb > self.max_memory_mb:
+            logger.info(
+                f"Recycling Blender worker {worker.worker_id} "
+                f"({worker.memory_mb:.0f} MB > {self.max_memory_mb} MB)"
+            )
+            self._replace(worker)
+        elif not worker.is_alive():
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        """Stop a worker and put a fresh one in its place."""
+        worker.stop()
+        with self._lock:
+            self._live -= 1
+            if not self._closed:
+                self._idle.put(self._spawn_locked())
+
+    def _discard(self, worker: _Worker) -> None:
+        """Kill a broken worker and put a fresh one in its place."""
+        worker.process.kill()
+        self._replace(worker)
@@ -0,0 +1,283 @@
+"""Host-side static checks of generated scripts before Blender is launched."""
+
+import ast
+import builtins
+import json
+import logging
+import re
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+API_INDEX_DIR = Path(__file__).parent / "bpy_api"
+
+# Calls that end or replace the Blender session, or duplicate pipeline work
+FORBIDDEN_CALLS = {
+    "exit": "it stops Blender before the model is saved and rendered",
+    "quit": "it stops Blender before the model is saved and rendered",
+    "sys.exit": "it stops Blender before the model is saved and rendered",
+    "os._exit": "it stops Blender before the model is saved and rendered",
+    "bpy.ops.wm.quit_blender": "it stops Blender before the model is saved and rendered",
+    "bpy.ops.wm.read_factory_settings": "it discards the scene set up by the pipeline",
+    "bpy.ops.wm.read_homefile": "it discards the scene set up by the pipeline",
+    "bpy.ops.wm.open_mainfile": "it discards the scene set up by the pipeline",
+    "bpy.ops.render.render": "rendering is done by the pipeline after the script runs",
+    "os.system": "generated scripts must not run shell commands",
+    "os.popen": "generated scripts must not run shell commands",
+}
+FORBIDDEN_MODULES = {"subprocess": "generated scripts must not run shell commands"}
+
+# Names that exist at runtime without being bound in the script
+IMPLICIT_NAMES = set(dir(builtins)) | {"__file__", "__name__", "__builtins__", "__doc__"}
+
+MAX_FINDINGS = 5
+
+
+@dataclass
+class PreflightFinding:
+    """A problem found by the pre-flight check."""
+
+    lineno: int
+    error_type: str
+    message: str
+
+
+def load_api_index(blender_version: str) -> Optional[dict]:
+    """Load the bundled bpy API index closest to a Blender version.
+
+    Uses the newest index with the same major version that is not newer
+    than the requested version.
+
+    Args:
+        blender_version: Version string, e.g. "Blender 4.2.1 LTS" or "4.2"
+
+    Returns:
+        The API index, or None if no bundled index matches
+    """
+    match = re.search(r"(\d+)\.(\d+)", blender_version)
+    if not match:
+        return None
+    wanted = (int(match.group(1)), int(match.group(2)))
+
+    candidates = []
+    for path in API_INDEX_DIR.glob("*.json"):
+        try:
+            version = tuple(int(part) for part in path.stem.split("."))
+        except ValueError:
+            continue
+        if version[0] == wanted[0] and version <= wanted:
+            candidates.append((version, path))
+
+    if not candidates:
+        logger.info(f"No bpy API index for {blender_version}, skipping API checks")
+        return None
+
+    _, path = max(candidates)
+    logger.debug(f"Using bpy API index {path.name}")
+    return json.loads(path.read_text())
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """Return "a.b.c" for a Name/Attribute chain, or None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _bound_names(nodes: list[ast.AST]) -> tuple[set[str], bool]:
+    """Collect every name bound by the given nodes, in any scope.
+
+    Returns:
+        Tuple of (names, has_star_import)
+    """
+    names = set()
+    star_import = False
+
+    for node in nodes:
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    star_import = True
+                else:
+                    names.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+
+    return names, star_import
+
+
+class PreflightChecker:
+    """Static checks that catch obvious script errors without running Blender.
+
+    Checks, in order:
+    - the prepared script compiles
+    - the generated code does not use names that are never bound
+    - the generated code does not make forbidden calls
+    - ``bpy.ops`` / ``bpy.data`` attribute chains exist in the API index
+
+    Name and API checks are deliberately conservative: scopes are flattened
+    and only families listed in the index are checked, so valid scripts are
+    never rejected for dynamic code the checker can't follow.
+    """
+
+    def __init__(self, api_index: Optional[dict] = None):
+        """Initialize the checker.
+
+        Args:
+            api_index: bpy API index from load_api_index (None = skip API checks)
+        """
+        self.api_index = api_index
+
+    def check(self, script: str, filename: str, code_lines: tuple[int, int]) -> Optional[str]:
+        """Check a prepared script.
+
+        Args:
+            script: Full prepared script (header, generated code, render template)
+            filename: Script path, used in the reported traceback
+            code_lines: First and last line of the generated code in script
+
+        Returns:
+            Error text formatted like a Blender traceback, or None if the script passes
+        """
+        try:
+            compile(script, filename, "exec", dont_inherit=True)
+        except SyntaxError as e:
+            return "Traceback (most recent call last):\n" + "".join(
+                traceback.format_exception_only(type(e), e)
+            )
+
+        tree = ast.parse(script, filename)
+        first, last = code_lines
+
+        # Header and generated code; the render template runs afterwards
+        visible = [n for n in ast.walk(tree) if 0 < getattr(n, "lineno", 0) <= last]
+        in_code = [n for n in visible if first <= n.lineno <= last]
+
+        findings = (
+            self._undefined_names(visible, in_code)
+            + self._forbidden_calls(in_code)
+            + self._api_errors(in_code)
+        )
+        if not findings:
+            return None
+
+        lines = script.split("\n")
+        findings.sort(key=lambda f: f.lineno)
+        blocks = [
+            "Traceback (most recent call last):\n"
+            f'  File "{filename}", line {f.lineno}, in <module>\n'
+            f"    {lines[f.lineno - 1].strip()}\n"
+            f"{f.error_type}: {f.message}"
+            for f in findings[:MAX_FINDINGS]
+        ]
+        logger.info(f"Pre-flight check found {len(findings)} problems")
+        return "\n\n".join(blocks)
+
+    def _undefined_names(
+        self, visible: list[ast.AST], in_code: list[ast.AST]
+    ) -> list[PreflightFinding]:
+        """Find names loaded in the generated code that are never bound."""
+        bound, star_import = _bound_names(visible)
+        if star_import:
+            return []
+
+        findings = []
+        seen = set()
+        for node in in_code:
+            if not (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)):
+                continue
+            if node.id in bound or node.id in IMPLICIT_NAMES or node.id in seen:
+                continue
+            seen.add(node.id)
+            findings.append(
+                PreflightFinding(node.lineno, "NameError", f"name '{node.id}' is not defined")
+            )
+        return findings
+
+    def _forbidden_calls(self, in_code: list[ast.AST]) -> list[PreflightFinding]:
+        """Find calls that would stop Blender or interfere with the pipeline."""
+        findings = []
+        for node in in_code:
+            if not isinstance(node, ast.Call):
+                continue
+            name = _dotted_name(node.func)
+            if name is None:
+                continue
+            reason = FORBIDDEN_CALLS.get(name) or FORBIDDEN_MODULES.get(name.split(".")[0])
+            if reason:
+                findings.append(
+                    PreflightFinding(
+                        node.lineno, "RuntimeError", f"{name}() is not allowed: {reason}"
+                    )
+                )
+        return findings
+
+    def _api_errors(self, in_code: list[ast.AST]) -> list[PreflightFinding]:
+        """Check bpy.ops / bpy.data chains against the API index."""
+        if self.api_index is None:
+            return []
+
+        data = set(self.api_index.get("data", []))
+        ops_modules = set(self.api_index.get("ops_modules", []))
+        families = self.api_index.get("ops_families", {})
+
+        # Only look at the outermost attribute of each chain
+        inner = {id(n.value) for n in in_code if isinstance(n, ast.Attribute)}
+        findings = []
+        for node in in_code:
+            if not isinstance(node, ast.Attribute) or id(node) in inner:
+                continue
+            name = _dotted_name(node)
+            if name is None:
+                continue
+            parts = name.split(".")
+            if parts[:2] == ["bpy", "data"] and len(parts) > 2 and parts[2] not in data:
+                findings.append(
+                    PreflightFinding(
+                        node.lineno,
+                        "AttributeError",
+                        f"'BlendData' object has no attribute '{parts[2]}'",
+                    )
+                )
+            elif parts[:2] == ["bpy", "ops"] and len(parts) > 2:
+                operator = ".".join(parts[:4])
+                if parts[2] not in ops_modules:
+                    findings.append(
+                        PreflightFinding(
+                            node.lineno,
+                            "AttributeError",
+                            f"module 'bpy.ops' has no attribute '{parts[2]}'",
+                        )
+                    )
+                elif len(parts) > 3 and any(
+                    f"{parts[2]}.{parts[3]}".startswith(family) and parts[3] not in members
+                    for family, members in families.items()
+                ):
+                    findings.append(
+                        PreflightFinding(
+                            node.lineno,
+                            "AttributeError",
+                            f'Calling operator "{operator}" error, could not be found',
+                        )
+                    )
+        return findings
@@ -0,0 +1,127 @@
+"""Fan render work out to several Blender processes."""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+VIEW_NAMES = ["front", "top", "side", "iso"]
+
+
+@dataclass
+class RenderShard:
+    """Work assigned to one Blender render process."""
+
+    index: int
+    views: list[str]
+    frame_range: Optional[tuple[int, int]] = None
+
+
+def plan_shards(views: list[str], frames: int, workers: int) -> list[RenderShard]:
+    """Split views and turntable frames into near-equal contiguous shards.
+
+    Views and frames are laid out as one list of work units and cut into
+    ``workers`` consecutive chunks, so each shard's frames form a single
+    contiguous range that can be rendered as one animation job.
+
+    Args:
+        views: View names to render
+        frames: Number of turntable frames
+        workers: Number of shards to produce
+
+    Returns:
+        Non-empty shards (fewer than ``workers`` if there is little work)
+    """
+    units: list[tuple[str, int]] = [("view", i) for i in range(len(views))]
+    units += [("frame", i) for i in range(frames)]
+
+    workers = max(1, min(workers, len(units)))
+    base, extra = divmod(len(units), workers)
+
+    shards = []
+    pos = 0
+    for index in range(workers):
+        size = base + (1 if index < extra else 0)
+        chunk = units[pos:pos + size]
+        pos += size
+
+        shard_views = [views[i] for kind, i in chunk if kind == "view"]
+        shard_frames = [i for kind, i in chunk if kind == "frame"]
+        frame_range = (shard_frames[0], shard_frames[-1]) if shard_frames else None
+        shards.append(RenderShard(index=index, views=shard_views, frame_range=frame_range))
+
+    return shards
+
+
+class ShardedRenderer:
+    """Renders a prepared scene .blend with K parallel Blender processes.
+
+    Each shard renders its views and turntable frames straight into the
+    shared ``renders/`` directory, so the gathered output has the same
+    layout as a single-process render.
+    """
+
+    def __init__(
+        self,
+        run_blender: Callable[..., tuple[bool, str, str]],
+        workers: int,
+        threads_per_worker: Optional[int] = None,
+    ):
+        """Initialize the sharded renderer.
+
+        Args:
+            run_blender: Callable(script_path, log_path, blend_file=...) that
+                runs one Blender job, e.g. BlenderExecutor._run_blender
+            workers: Number of parallel Blender processes (K)
+            threads_per_worker: Render threads per process (default: cores / K)
+        """
+        self.run_blender = run_blender
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+
+    def render(
+        self,
+        scene_blend: Path,
+        work_dir: Path,
+        frames: int,
+        build_script: Callable[[RenderShard, int], str],
+    ) -> list[str]:
+        """Render all shards and wait for them to finish.
+
+        Args:
+            scene_blend: Prepared render scene to open in every process
+            work_dir: Directory for shard scripts and logs
+            frames: Number of turntable frames
+            build_script: Returns the shard script for (shard, thread count)
+
+        Returns:
+            List of error messages from shards that failed (empty on success)
+        """
+        shards = plan_shards(VIEW_NAMES, frames, self.workers)
+        logger.info(
+            f"Rendering {len(shards)} shards with {self.threads_per_worker} threads each"
+        )
+
+        def run_shard(shard: RenderShard) -> Optional[str]:
+            script_path = work_dir / f"render_shard_{shard.index:02d}.py"
+            script_path.write_text(build_script(shard, self.threads_per_worker))
+            log_path = work_dir / f"render_shard_{shard.index:02d}.log"
+            try:
+                _, _, stderr = self.run_blender(script_path, log_path, blend_file=scene_blend)
+            except (RuntimeError, TimeoutError) as e:
+                return f"Shard {shard.index}: {e}"
+            if "Traceback" in stderr:
+                return f"Shard {shard.index}: {stderr[stderr.index('Traceback'):][:500]}"
+            return None
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            results = list(pool.map(run_shard, shards))
+
+        errors = [r for r in results if r]
+        for error in errors:
+            logger.warning(f"Render shard failed: {error}")
+        return errors
@@ -0,0 +1,156 @@
+"""Run Blender while streaming its output to a log and watching for errors."""
+
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Optional
+
+logger = logging.getLogger(__name__)
+
+# Written to stderr by the script header right before the generated code runs.
+# Tracebacks before it come from Blender startup (e.g. add-ons) and are ignored.
+USER_CODE_MARKER = "=== VIBE-BLENDER USER CODE START ==="
+
+# How long Blender may keep running after a traceback before it is killed
+ERROR_GRACE_SECONDS = 0.5
+
+# Only the tail of stdout is kept in memory; the full output is in the log
+MAX_STDOUT_LINES = 2000
+
+
+@dataclass
+class StreamResult:
+    """Outcome of a streamed Blender run.
+
+    ``script_error`` is set when a traceback followed the user-code marker;
+    ``killed_on_error`` when the process had to be killed because of it.
+    """
+
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    script_error: bool = False
+    killed_on_error: bool = False
+
+
+class _SectionLog:
+    """Log file that interleaves stdout/stderr in arrival order.
+
+    A ``=== STDOUT ===`` / ``=== STDERR ===`` header is written whenever the
+    source stream changes, so the file keeps the executor's usual layout.
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+        self._current: Optional[str] = None
+
+    def write(self, stream: str, line: str) -> None:
+        with self._lock:
+            if stream != self._current:
+                prefix = "" if self._current is None else "\n"
+                self._file.write(f"{prefix}=== {stream} ===\n")
+                self._current = stream
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_streaming(
+    cmd: list[str],
+    log_path: Path,
+    timeout: float,
+    env: Optional[dict] = None,
+    marker: Optional[str] = USER_CODE_MARKER,
+) -> StreamResult:
+    """Run a command, streaming output to log_path and stopping on a traceback.
+
+    Once ``marker`` has appeared on stderr, the first line starting with
+    ``Traceback`` ends the run: the process gets ``ERROR_GRACE_SECONDS`` to
+    finish printing and exit, then it is killed.
+
+    Args:
+        cmd: Command line to run
+        log_path: Path to stream output to
+        timeout: Seconds before the process is killed
+        env: Environment for the process
+        marker: Stderr line that starts error watching (None = watch from the start)
+
+    Returns:
+        StreamResult with the process outcome and captured output
+
+    Raises:
+        TimeoutError: If the process runs longer than timeout
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+        env=env,
+    )
+    log = _SectionLog(log_path)
+    stdout_tail: deque[str] = deque(maxlen=MAX_STDOUT_LINES)
+    stderr_lines: list[str] = []
+    error_seen = threading.Event()
+
+    def pump_stdout(pipe: IO[str]) -> None:
+        for line in pipe:
+            log.write("STDOUT", line)
+            stdout_tail.append(line)
+
+    def pump_stderr(pipe: IO[str]) -> None:
+        in_user_code = marker is None
+        for line in pipe:
+            log.write("STDERR", line)
+            stderr_lines.append(line)
+            if not in_user_code and line.rstrip("\n") == marker:
+                in_user_code = True
+            elif in_user_code and line.startswith("Traceback"):
+                error_seen.set()
+
+    readers = [
+        threading.Thread(target=pump_stdout, args=(process.stdout,), daemon=True),
+        threading.Thread(target=pump_stderr, args=(process.stderr,), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    deadline = time.monotonic() + timeout
+    killed_on_error = False
+    try:
+        while process.poll() is None:
+            if error_seen.wait(0.1):
+                try:
+                    process.wait(timeout=ERROR_GRACE_SECONDS)
+                except subprocess.TimeoutExpired:
+                    logger.warning("Traceback in Blender output, terminating early")
+                    process.kill()
+                    process.wait()
+                    killed_on_error = True
+                break
+            if time.monotonic() > deadline:
+                logger.error(f"Blender execution timed out after {timeout}s")
+                process.kill()
+                process.wait()
+                raise TimeoutError(f"Blender execution timed out after {timeout} seconds")
+    finally:
+        for reader in readers:
+            reader.join(timeout=5)
+        log.close()
+
+    return StreamResult(
+        returncode=process.returncode,
+        stdout="".join(stdout_tail),
+        stderr="".join(stderr_lines),
+        script_error=error_seen.is_set(),
+        killed_on_error=killed_on_error,
+    )
@@ -2,13 +2,14 @@
 
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 
 from ..models.schemas import (
     PipelineState,
     PipelineStatus,
     IterationRecord,
     CritiqueVerdict,
+    RenderOutput,
 )
 
 logger = logging.getLogger(__name__)
@@ -132,11 +133,17 @@ class Watchdog:
 
         return False, None
 
-    def update_state_for_max_retries(self, state: PipelineState) -> None:
+    def update_state_for_max_retries(
+        self,
+        state: PipelineState,
+        finalize: Optional[Callable[[RenderOutput], RenderOutput]] = None,
+    ) -> None:
         """Update state when max retries is reached.
 
         Args:
             state: Pipeline state to update
+            finalize: Optional hook applied to the chosen output before it is
+                stored (e.g. a final-quality re-render)
         """
         state.status = PipelineStatus.MAX_RETRIES
         state.completed_at = datetime.now()
@@ -152,14 +159,21 @@ class Watchdog:
                     best_record = record
 
         if best_record and best_record.render_output:
-            state.final_output = best_record.render_output
+            output = best_record.render_output
+            state.final_output = finalize(output) if finalize else output
             logger.info(f"Using best iteration {best_record.iteration} (score: {best_score})")
 
-    def update_state_for_success(self, state: PipelineState) -> None:
+    def update_state_for_success(
+        self,
+        state: PipelineState,
+        finalize: Optional[Callable[[RenderOutput], RenderOutput]] = None,
+    ) -> None:
         """Update state for successful completion.
 
         Args:
             state: Pipeline state to update
+            finalize: Optional hook applied to the chosen output before it is
+                stored (e.g. a final-quality re-render)
         """
         state.status = PipelineStatus.SUCCESS
         state.completed_at = datetime.now()
@@ -168,7 +182,8 @@ class Watchdog:
         if state.iterations:
             latest = state.iterations[-1]
             if latest.render_output:
-                state.final_output = latest.render_output
+                output = latest.render_output
+                state.final_output = finalize(output) if finalize else output
 
     def update_state_for_failure(self, state: PipelineState, reason: str) -> None:
         """Update state for pipeline failure.
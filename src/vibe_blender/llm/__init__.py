@@ -1,15 +1,24 @@
 """LLM backends for Vibe-Blender."""
 
 from .base import BaseLLM
+from .cache import CachedLLM, LLMResponseCache
+from .metrics import LLMCallMetrics, LLMMetrics, llm_metrics
 from .openai_backend import OpenAIBackend
 from .ollama_backend import OllamaBackend
+from .ratelimit import ConcurrencyLimitedLLM, RateLimitedLLM, RateLimiter, get_rate_limiter
+from .replay import CassetteMissError, RecordingLLM, ReplayLLM
+from .resilience import CircuitBreaker, CircuitOpenError, ResilientLLM
+from .router import LLMRouter
+from .streaming import CodeBlockExtractor, JsonExtractor, StreamExtractor, collect
+from .usage import UsageLLM, UsageTracker, report_usage
+from .wrapper import LLMWrapper
 
 
 def create_llm(backend: str, **kwargs) -> BaseLLM:
     """Factory function to create LLM backend.
 
     Args:
-        backend: Either "openai" or "ollama"
+        backend: "openai", "ollama" or "replay"
         **kwargs: Backend-specific configuration
 
     Returns:
@@ -18,6 +27,7 @@ def create_llm(backend: str, **kwargs) -> BaseLLM:
     backends = {
         "openai": OpenAIBackend,
         "ollama": OllamaBackend,
+        "replay": ReplayLLM,
     }
 
     if backend not in backends:
@@ -26,4 +36,47 @@ def create_llm(backend: str, **kwargs) -> BaseLLM:
     return backends[backend](**kwargs)
 
 
-__all__ = ["BaseLLM", "OpenAIBackend", "OllamaBackend", "create_llm"]
+def create_router(config, slots=None) -> LLMRouter:
+    """Create the default backend and per-role backends from configuration.
+
+    Args:
+        config: LLMConfig with the default backend and optional role overrides
+        slots: Optional ResourcePool limiting LLM calls in flight across all backends
+
+    Returns:
+        LLMRouter whose for_role() returns each agent's backend
+    """
+    return LLMRouter.from_config(config, slots=slots)
+
+
+__all__ = [
+    "BaseLLM",
+    "CachedLLM",
+    "CassetteMissError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CodeBlockExtractor",
+    "ConcurrencyLimitedLLM",
+    "JsonExtractor",
+    "LLMCallMetrics",
+    "LLMMetrics",
+    "LLMResponseCache",
+    "LLMRouter",
+    "LLMWrapper",
+    "OpenAIBackend",
+    "OllamaBackend",
+    "RateLimitedLLM",
+    "RateLimiter",
+    "RecordingLLM",
+    "ReplayLLM",
+    "ResilientLLM",
+    "StreamExtractor",
+    "UsageLLM",
+    "UsageTracker",
+    "collect",
+    "create_llm",
+    "create_router",
+    "get_rate_limiter",
+    "llm_metrics",
+    "report_usage",
+]
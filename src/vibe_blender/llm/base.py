@@ -1,17 +1,47 @@
 """Abstract base class for LLM backends."""
 
+import asyncio
+import math
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 
 class BaseLLM(ABC):
     """Abstract base class defining the LLM interface.
 
     All LLM backends must implement this interface to be compatible
-    with the Vibe-Blender pipeline.
+    with the Vibe-Blender pipeline. The awaitable ``a*`` variants run the
+    blocking methods in a worker thread by default; backends with an async
+    client override them with native implementations.
     """
 
+    # Largest useful image as (long side, short side) in pixels. Providers
+    # downscale anything bigger, so reference images are resized to fit
+    # before upload. Defaults follow OpenAI's high-detail vision limits.
+    max_image_size: tuple[int, int] = (2048, 768)
+
+    # True if the backend can constrain output to a JSON schema
+    supports_structured_output: bool = False
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        """Estimate the prompt tokens one image costs.
+
+        The default implements OpenAI's high-detail formula: 85 base tokens
+        plus 170 per 512px tile after scaling to fit max_image_size.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            Estimated token count
+        """
+        long_side, short_side = self.max_image_size
+        scale = min(1.0, long_side / max(width, height), short_side / min(width, height))
+        tiles = math.ceil(width * scale / 512) * math.ceil(height * scale / 512)
+        return 85 + 170 * tiles
+
     @abstractmethod
     def generate(
         self,
@@ -71,3 +101,164 @@ class BaseLLM(ABC):
             Analysis response
         """
         pass
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream a text completion as chunks.
+
+        The default yields the complete generate() result as a single chunk;
+        backends with a streaming API override it. Closing the iterator early
+        cancels the request.
+
+        Args:
+            prompt: The user prompt to complete
+            system: Optional system prompt for context
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text chunks in order
+        """
+        yield self.generate(prompt, system, temperature, max_tokens)
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream an image analysis as chunks.
+
+        Args:
+            image_paths: List of paths to image files
+            prompt: Question or instruction about the images
+            system: Optional system prompt for context
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text chunks in order
+        """
+        yield self.analyze_images(image_paths, prompt, system, max_tokens)
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        """Generate a JSON document matching a schema.
+
+        Backends with supports_structured_output constrain decoding to the
+        schema. The default makes a plain generate()/analyze_images() call,
+        so callers must still be able to extract JSON from free text.
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt for context
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            image_paths: Optional images to attach (vision request)
+
+        Returns:
+            Response text (bare JSON when the backend supports structured output)
+        """
+        if image_paths:
+            return self.analyze_images(image_paths, prompt, system, max_tokens)
+        return self.generate(prompt, system, temperature, max_tokens)
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        """Streaming version of generate_structured().
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt for context
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            image_paths: Optional images to attach (vision request)
+
+        Yields:
+            Text chunks in order
+        """
+        if image_paths:
+            yield from self.stream_analyze_images(image_paths, prompt, system, max_tokens)
+        else:
+            yield from self.stream_generate(prompt, system, temperature, max_tokens)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Awaitable version of generate().
+
+        Args:
+            prompt: The user prompt to complete
+            system: Optional system prompt for context
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Generated text response
+        """
+        return await asyncio.to_thread(self.generate, prompt, system, temperature, max_tokens)
+
+    async def aanalyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> str:
+        """Awaitable version of analyze_image().
+
+        Args:
+            image_path: Path to the image file
+            prompt: Question or instruction about the image
+            system: Optional system prompt for context
+
+        Returns:
+            Analysis response
+        """
+        return await asyncio.to_thread(self.analyze_image, image_path, prompt, system)
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Awaitable version of analyze_images().
+
+        Args:
+            image_paths: List of paths to image files
+            prompt: Question or instruction about the images
+            system: Optional system prompt for context
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Analysis response
+        """
+        return await asyncio.to_thread(
+            self.analyze_images, image_paths, prompt, system, max_tokens
+        )
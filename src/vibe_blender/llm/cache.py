@@ -0,0 +1,369 @@
+"""Disk-backed cache of LLM responses."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .base import BaseLLM
+from .images import image_cache
+from .wrapper import LLMWrapper
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB = "responses.sqlite3"
+
+
+class LLMResponseCache:
+    """SQLite store of LLM responses with TTL and LRU size eviction.
+
+    Entries older than ``ttl_hours`` are treated as misses and purged.
+    Once the stored responses grow past ``max_size_mb``, the
+    least-recently-used entries are deleted. One cache can be shared by
+    several CachedLLM wrappers (and threads).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str,
+        max_size_mb: int = 256,
+        ttl_hours: Optional[float] = 168,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the SQLite database
+            max_size_mb: Size limit before least-recently-used entries are evicted
+            ttl_hours: Entry lifetime in hours (None = never expire)
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.ttl_seconds = ttl_hours * 3600 if ttl_hours else None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(self.cache_dir / CACHE_DB, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Hash the request parameters into a cache key."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached response text, or None if absent or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and self._expired(row[1], now):
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.evictions += 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response under key and evict entries past the limits.
+
+        Args:
+            key: Cache key
+            response: Response text to store
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (key, response, size, now, now),
+                )
+                self._evict_locked(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not store LLM cache entry: {e}")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current cache size."""
+        total = self.hits + self.misses
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_mb": size / (1024 * 1024),
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def _evict_locked(self, now: float) -> None:
+        """Delete expired entries, then least-recently-used ones until under the size limit."""
+        if self.ttl_seconds is not None:
+            cursor = self._db.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+            logger.debug(f"Evicted LLM cache entry {key[:12]}")
+
+
+class CachedLLM(LLMWrapper):
+    """LLM wrapper that serves repeated requests from an LLMResponseCache.
+
+    The key covers the backend class, model, system prompt, prompt,
+    temperature, max_tokens and the content hashes of attached images, so
+    editing a reference image or switching models never returns a stale
+    response. Wrap only deterministic-enough roles (planning, clarification):
+    a cached sampling generator would always return its first sample.
+    """
+
+    def __init__(self, llm: BaseLLM, cache: LLMResponseCache, name: str = "llm"):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend to forward cache misses to
+            cache: Response store (may be shared between wrappers)
+            name: Label used in logs and stats, typically the agent name
+        """
+        super().__init__(llm)
+        self.cache = cache
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        key = self._key("generate", prompt, system, temperature, max_tokens)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.llm.generate(prompt, system, temperature, max_tokens)
+        self.cache.put(key, response)
+        return response
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        key = self._key("analyze_images", prompt, system, None, max_tokens, image_paths)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.llm.analyze_images(image_paths, prompt, system, max_tokens)
+        self.cache.put(key, response)
+        return response
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        key = self._key("generate", prompt, system, temperature, max_tokens)
+        return self._stream(key, lambda: self.llm.stream_generate(
+            prompt, system, temperature, max_tokens
+        ))
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        key = self._key("analyze_images", prompt, system, None, max_tokens, image_paths)
+        return self._stream(key, lambda: self.llm.stream_analyze_images(
+            image_paths, prompt, system, max_tokens
+        ))
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        key = self._key(
+            "structured", prompt, system, temperature, max_tokens, image_paths, schema
+        )
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.llm.generate_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+        self.cache.put(key, response)
+        return response
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        key = self._key(
+            "structured", prompt, system, temperature, max_tokens, image_paths, schema
+        )
+        return self._stream(key, lambda: self.llm.stream_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        ))
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        key = self._key("generate", prompt, system, temperature, max_tokens)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.agenerate(prompt, system, temperature, max_tokens)
+        self.cache.put(key, response)
+        return response
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        key = self._key("analyze_images", prompt, system, None, max_tokens, image_paths)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.aanalyze_images(image_paths, prompt, system, max_tokens)
+        self.cache.put(key, response)
+        return response
+
+    def stats(self) -> dict:
+        """Return this wrapper's hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _key(
+        self,
+        method: str,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        image_paths: Optional[list[Path | str]] = None,
+        schema: Optional[dict] = None,
+    ) -> str:
+        backend = self.backend
+        model = getattr(backend, "model", None)
+        if image_paths:
+            model = getattr(backend, "vision_model", model)
+        return self.cache.make_key(
+            method=method,
+            backend=type(backend).__name__,
+            model=model,
+            system=system or "",
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            images=[image_cache.digest(path) for path in image_paths or []],
+            schema=schema,
+        )
+
+    def _stream(self, key: str, open_stream) -> Iterator[str]:
+        """Yield a cached response, or stream a miss and store it if read to the end."""
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        stream = open_stream()
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            stream.close()
+        # Only reached when the consumer read the whole response
+        self.cache.put(key, "".join(chunks))
+
+    def _lookup(self, key: str) -> Optional[str]:
+        cached = self.cache.get(key)
+        if cached is None:
+            self.misses += 1
+            logger.debug(f"LLM cache miss for {self.name} ({key[:12]})")
+            return None
+        self.hits += 1
+        logger.info(f"LLM cache hit for {self.name} ({key[:12]}), skipped LLM call")
+        return cached
@@ -0,0 +1,234 @@
+"""Cache of encoded image payloads shared by the LLM backends."""
+
+import base64
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+def media_type(path: Path | str) -> str:
+    """Return the MIME type for an image path (PNG if unknown)."""
+    return MEDIA_TYPES.get(Path(path).suffix.lower(), "image/png")
+
+
+class ImagePayloadCache:
+    """Bounded in-memory LRU of base64 payloads and content digests.
+
+    Reference images are sent with every clarification, planning, generation
+    and critique call. Entries are keyed on the resolved path, mtime and size,
+    so each file is read and encoded once until it changes on disk. Payloads
+    are evicted least-recently-used first past ``max_size_mb``.
+    """
+
+    def __init__(self, max_size_mb: int = 128):
+        """Initialize the cache.
+
+        Args:
+            max_size_mb: Memory limit for cached payloads
+        """
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def base64(self, path: Path | str) -> str:
+        """Return the file's contents as a base64 string (Ollama format).
+
+        Raises:
+            FileNotFoundError: If the image doesn't exist
+        """
+        return self._get(path, "base64", lambda data, _: base64.b64encode(data).decode("utf-8"))
+
+    def data_url(self, path: Path | str) -> str:
+        """Return the file as a ``data:`` URL (OpenAI format).
+
+        Raises:
+            FileNotFoundError: If the image doesn't exist
+        """
+        return self._get(
+            path,
+            "data_url",
+            lambda data, p: f"data:{media_type(p)};base64,{base64.b64encode(data).decode('utf-8')}",
+        )
+
+    def digest(self, path: Path | str) -> str:
+        """Return the SHA-256 hex digest of the file's contents.
+
+        Raises:
+            FileNotFoundError: If the image doesn't exist
+        """
+        return self._get(path, "sha256", lambda data, _: hashlib.sha256(data).hexdigest())
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current memory use."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_mb": self._size / (1024 * 1024),
+        }
+
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _get(self, path: Path | str, kind: str, encode) -> str:
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image not found: {path}")
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size, kind)
+
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        payload = encode(path.read_bytes(), path)
+        logger.debug(f"Encoded {path.name} as {kind} ({len(payload)} chars)")
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = payload
+                self._size += len(payload)
+                self._evict_locked()
+        return payload
+
+    def _evict_locked(self) -> None:
+        """Drop least-recently-used payloads until under the memory limit."""
+        while self._size > self.max_bytes and self._entries:
+            _, payload = self._entries.popitem(last=False)
+            self._size -= len(payload)
+            self.evictions += 1
+
+
+# Process-wide cache used by the backends unless they are given their own
+image_cache = ImagePayloadCache()
+
+PREPROCESS_FORMATS = {"JPEG": ".jpg", "WEBP": ".webp"}
+
+
+@dataclass
+class PreparedImage:
+    """A reference image resized and re-encoded for upload."""
+
+    source: Path
+    path: Path
+    original_size: tuple[int, int]
+    size: tuple[int, int]
+    original_bytes: int
+    bytes: int
+    estimated_tokens: int = 0
+
+
+def fit_size(size: tuple[int, int], max_size: tuple[int, int]) -> tuple[int, int]:
+    """Scale (width, height) down to fit a (long side, short side) limit.
+
+    Args:
+        size: Original (width, height)
+        max_size: Maximum (long side, short side)
+
+    Returns:
+        New (width, height), never larger than the original
+    """
+    width, height = size
+    long_side, short_side = max_size
+    scale = min(1.0, long_side / max(width, height), short_side / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def preprocess_image(
+    path: Path | str,
+    out_dir: Path | str,
+    max_size: tuple[int, int],
+    fmt: str = "JPEG",
+    quality: int = 85,
+) -> PreparedImage:
+    """Downscale, strip metadata and re-encode an image for upload.
+
+    Results are cached in out_dir under a name derived from the source
+    contents and the settings, so repeated runs reuse the converted file.
+
+    Args:
+        path: Source image
+        out_dir: Directory for converted images
+        max_size: Maximum (long side, short side) in pixels
+        fmt: Output format, JPEG or WEBP
+        quality: Encoder quality (1-100)
+
+    Returns:
+        PreparedImage describing the converted file
+
+    Raises:
+        FileNotFoundError: If the image doesn't exist
+        ValueError: If fmt is not supported
+    """
+    fmt = fmt.upper()
+    if fmt not in PREPROCESS_FORMATS:
+        raise ValueError(f"Unsupported format {fmt}, must be one of: {set(PREPROCESS_FORMATS)}")
+
+    path = Path(path)
+    out_dir = Path(out_dir)
+    digest = image_cache.digest(path)
+
+    with Image.open(path) as image:
+        # Apply the EXIF rotation before the metadata is dropped
+        image = ImageOps.exif_transpose(image)
+        original_size = image.size
+        size = fit_size(original_size, max_size)
+
+        target = out_dir / (
+            f"{path.stem}-{digest[:12]}-{size[0]}x{size[1]}-q{quality}{PREPROCESS_FORMATS[fmt]}"
+        )
+        if not target.exists():
+            if image.mode in ("RGBA", "LA", "P"):
+                # Flatten transparency onto white; JPEG has no alpha
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            if image.size != size:
+                image = image.resize(size, Image.Resampling.LANCZOS)
+
+            out_dir.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            image.save(tmp, format=fmt, quality=quality, optimize=True)
+            tmp.replace(target)
+
+    return PreparedImage(
+        source=path,
+        path=target,
+        original_size=original_size,
+        size=size,
+        original_bytes=path.stat().st_size,
+        bytes=target.stat().st_size,
+    )
@@ -0,0 +1,80 @@
+"""Per-call timing metrics for LLM requests."""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class LLMCallMetrics:
+    """Timing of a single LLM call."""
+
+    label: str
+    first_token_seconds: Optional[float] = None
+    total_seconds: float = 0.0
+    chars: int = 0
+    stopped_early: bool = False
+
+
+class LLMMetrics:
+    """Thread-safe collection of LLMCallMetrics with summary statistics.
+
+    Also keeps named event counters, e.g. how often an agent had to fall
+    back to heuristic JSON extraction. Each Orchestrator has its own; only
+    the most recent ``max_calls`` calls are kept.
+    """
+
+    def __init__(self, max_calls: int = 10_000):
+        """Initialize the collection.
+
+        Args:
+            max_calls: Calls kept for the summary; older ones are dropped
+        """
+        self.calls: deque[LLMCallMetrics] = deque(maxlen=max_calls)
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics: LLMCallMetrics) -> None:
+        """Add one call's metrics."""
+        with self._lock:
+            self.calls.append(metrics)
+
+    def increment(self, name: str) -> None:
+        """Increment a named event counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def summary(self) -> dict[str, dict]:
+        """Aggregate the recorded calls per label.
+
+        Returns:
+            Mapping of label to call count, mean time to first token, mean
+            and total duration, and the number of calls stopped early
+        """
+        with self._lock:
+            calls = list(self.calls)
+
+        summary: dict[str, dict] = {}
+        for label in sorted({call.label for call in calls}):
+            group = [call for call in calls if call.label == label]
+            ttfts = [c.first_token_seconds for c in group if c.first_token_seconds is not None]
+            total = sum(call.total_seconds for call in group)
+            summary[label] = {
+                "calls": len(group),
+                "mean_first_token_seconds": sum(ttfts) / len(ttfts) if ttfts else None,
+                "mean_seconds": total / len(group),
+                "total_seconds": total,
+                "stopped_early": sum(call.stopped_early for call in group),
+            }
+        return summary
+
+    def clear(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            self.calls.clear()
+            self.counters.clear()
+
+
+# Default collector for agents and collect() calls not given their own
+llm_metrics = LLMMetrics()
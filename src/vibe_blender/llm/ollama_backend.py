@@ -1,17 +1,31 @@
 """Ollama backend for local LLM operations."""
 
-import base64
+import asyncio
+import json
 import logging
+import math
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import httpx
 
 from .base import BaseLLM
+from .images import ImagePayloadCache
+from .images import image_cache as default_image_cache
+from .usage import report_usage
 
 logger = logging.getLogger(__name__)
 
 
+def _report_usage(data: dict, model: str) -> None:
+    """Report token counts from a final /api/generate response.
+
+    prompt_eval_count is omitted when Ollama reuses a cached prompt, in
+    which case the call's usage is estimated instead.
+    """
+    report_usage(data.get("prompt_eval_count"), data.get("eval_count"), model)
+
+
 class OllamaBackend(BaseLLM):
     """Ollama backend for local model inference.
 
@@ -19,12 +33,18 @@ class OllamaBackend(BaseLLM):
     and vision analysis with LLaVA.
     """
 
+    # LLaVA-style models tile images into at most 2x2 crops of 336px
+    max_image_size = (672, 672)
+    # /api/generate accepts a JSON schema as "format" (Ollama >= 0.5)
+    supports_structured_output = True
+
     def __init__(
         self,
         base_url: str = "http://localhost:11434",
         model: str = "llama3",
         vision_model: str = "llava",
         timeout: float = 120.0,
+        image_cache: Optional[ImagePayloadCache] = None,
     ):
         """Initialize Ollama backend.
 
@@ -33,16 +53,36 @@ class OllamaBackend(BaseLLM):
             model: Model name for text generation
             vision_model: Model name for vision tasks
             timeout: Request timeout in seconds
+            image_cache: Encoded image cache (defaults to the shared process-wide one)
         """
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.vision_model = vision_model
         self.timeout = timeout
+        self.image_cache = image_cache or default_image_cache
         self.client = httpx.Client(timeout=timeout)
+        # Async client is bound to the event loop it was created on
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 
         logger.info(f"Initialized Ollama backend at {base_url}")
         logger.info(f"Text model: {model}, Vision model: {vision_model}")
 
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        """Estimate image tokens for LLaVA: 576 per 336px crop plus an overview.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            Estimated token count
+        """
+        long_side, _ = self.max_image_size
+        scale = min(1.0, long_side / max(width, height))
+        crops = math.ceil(width * scale / 336) * math.ceil(height * scale / 336)
+        return 576 * (1 + crops)
+
     def _check_server(self) -> bool:
         """Check if Ollama server is running."""
         try:
@@ -69,24 +109,7 @@ class OllamaBackend(BaseLLM):
         Returns:
             Generated text response
         """
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-            },
-        }
-
-        if system:
-            payload["system"] = system
-
-        if max_tokens:
-            payload["options"]["num_predict"] = max_tokens
-
-        logger.debug(f"Generating with {self.model}, temp={temperature}")
-        logger.debug(f"LLM Input - System: {(system[:300] + '...') if system and len(system) > 300 else system}")
-        logger.debug(f"LLM Input - Prompt: {(prompt[:500] + '...') if len(prompt) > 500 else prompt}")
+        payload = self._generate_payload(prompt, system, temperature, max_tokens)
 
         try:
             response = self.client.post(
@@ -94,17 +117,58 @@ class OllamaBackend(BaseLLM):
                 json=payload,
             )
             response.raise_for_status()
+        except httpx.RequestError as e:
+            raise ConnectionError(
+                f"Failed to connect to Ollama at {self.base_url}. "
+                f"Ensure Ollama is running: {e}"
+            )
 
-            result = response.json()["response"]
-            logger.debug(f"LLM Output ({len(result)} chars): {(result[:500] + '...') if len(result) > 500 else result}")
-            return result
+        data = response.json()
+        _report_usage(data, payload["model"])
+        result = data["response"]
+        preview = (result[:500] + "...") if len(result) > 500 else result
+        logger.debug(f"LLM Output ({len(result)} chars): {preview}")
+        return result
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Generate text using Ollama without blocking the event loop.
 
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens (num_predict in Ollama)
+
+        Returns:
+            Generated text response
+        """
+        payload = self._generate_payload(prompt, system, temperature, max_tokens)
+
+        try:
+            response = await self._get_async_client().post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+            )
+            response.raise_for_status()
         except httpx.RequestError as e:
             raise ConnectionError(
                 f"Failed to connect to Ollama at {self.base_url}. "
                 f"Ensure Ollama is running: {e}"
             )
 
+        data = response.json()
+        _report_usage(data, payload["model"])
+        result = data["response"]
+        preview = (result[:500] + "...") if len(result) > 500 else result
+        logger.debug(f"LLM Output ({len(result)} chars): {preview}")
+        return result
+
     def analyze_image(
         self,
         image_path: Path | str,
@@ -143,16 +207,280 @@ class OllamaBackend(BaseLLM):
         Returns:
             Analysis response
         """
-        # Encode all images
-        images = []
-        for image_path in image_paths:
-            image_path = Path(image_path)
-            if not image_path.exists():
-                raise FileNotFoundError(f"Image not found: {image_path}")
+        payload = self._vision_payload(image_paths, prompt, system)
+
+        try:
+            response = self.client.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+            )
+            response.raise_for_status()
+        except httpx.RequestError as e:
+            raise ConnectionError(
+                f"Failed to connect to Ollama at {self.base_url}. "
+                f"Ensure Ollama is running with LLaVA model: {e}"
+            )
+
+        data = response.json()
+        _report_usage(data, payload["model"])
+        result = data["response"]
+        preview = (result[:800] + "...") if len(result) > 800 else result
+        logger.debug(f"Vision Output ({len(result)} chars): {preview}")
+        return result
+
+    async def aanalyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Analyze a single image using LLaVA without blocking the event loop.
+
+        Args:
+            image_path: Path to the image
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Returns:
+            Analysis response
+        """
+        return await self.aanalyze_images([image_path], prompt, system, max_tokens)
 
-            with open(image_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
-            images.append(image_data)
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Analyze multiple images using LLaVA without blocking the event loop.
+
+        Args:
+            image_paths: List of image paths
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Returns:
+            Analysis response
+        """
+        payload = self._vision_payload(image_paths, prompt, system)
+
+        try:
+            response = await self._get_async_client().post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+            )
+            response.raise_for_status()
+        except httpx.RequestError as e:
+            raise ConnectionError(
+                f"Failed to connect to Ollama at {self.base_url}. "
+                f"Ensure Ollama is running with LLaVA model: {e}"
+            )
+
+        data = response.json()
+        _report_usage(data, payload["model"])
+        result = data["response"]
+        preview = (result[:800] + "...") if len(result) > 800 else result
+        logger.debug(f"Vision Output ({len(result)} chars): {preview}")
+        return result
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream generated text from Ollama.
+
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens (num_predict in Ollama)
+
+        Yields:
+            Text chunks in order
+        """
+        payload = self._generate_payload(prompt, system, temperature, max_tokens)
+        yield from self._stream(payload, "Ensure Ollama is running")
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream an image analysis from LLaVA.
+
+        Args:
+            image_paths: List of image paths
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Yields:
+            Text chunks in order
+        """
+        payload = self._vision_payload(image_paths, prompt, system)
+        yield from self._stream(payload, "Ensure Ollama is running with LLaVA model")
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        """Generate a JSON document constrained to a schema via "format".
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt
+            temperature: Sampling temperature (text requests only)
+            max_tokens: Maximum tokens (text requests only)
+            image_paths: Optional images to attach (vision request)
+
+        Returns:
+            JSON response text
+        """
+        return "".join(
+            self.stream_structured(prompt, schema, system, temperature, max_tokens, image_paths)
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        """Stream a JSON document constrained to a schema via "format".
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt
+            temperature: Sampling temperature (text requests only)
+            max_tokens: Maximum tokens (text requests only)
+            image_paths: Optional images to attach (vision request)
+
+        Yields:
+            Text chunks in order
+        """
+        if image_paths:
+            payload = self._vision_payload(image_paths, prompt, system)
+        else:
+            payload = self._generate_payload(prompt, system, temperature, max_tokens)
+        payload["format"] = schema
+        yield from self._stream(payload, "Ensure Ollama is running")
+
+    def _stream(self, payload: dict, hint: str) -> Iterator[str]:
+        """POST a streaming /api/generate request and yield response fragments.
+
+        Ollama streams one JSON object per line. Leaving the ``with`` block
+        (including when the consumer closes the generator) closes the
+        connection, which cancels generation on the server.
+        """
+        payload = {**payload, "stream": True}
+        try:
+            with self.client.stream(
+                "POST", f"{self.base_url}/api/generate", json=payload
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        _report_usage(data, payload["model"])
+                        break
+        except httpx.RequestError as e:
+            raise ConnectionError(
+                f"Failed to connect to Ollama at {self.base_url}. {hint}: {e}"
+            )
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return an AsyncClient bound to the running event loop.
+
+        httpx connection pools cannot be shared across event loops, so a new
+        client is created whenever the caller's loop changes (e.g. successive
+        asyncio.run() calls), and the previous one is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._drop_async_client()
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+            self._async_loop = loop
+        return self._async_client
+
+    def _drop_async_client(self) -> None:
+        """Close the AsyncClient of a previous event loop, if any.
+
+        Its connections can only be closed on their own loop: if that loop
+        is still running (in another thread) the client is closed there.
+        A finished loop can't run the close any more, so the client is
+        dropped and its sockets are released when it is garbage collected.
+        """
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is None or loop is None:
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            logger.debug("Dropping Ollama AsyncClient of a finished event loop")
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> dict:
+        """Build the /api/generate request body for a text request."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+            },
+        }
+
+        if system:
+            payload["system"] = system
+
+        if max_tokens:
+            payload["options"]["num_predict"] = max_tokens
+
+        logger.debug(f"Generating with {self.model}, temp={temperature}")
+        logger.debug(f"LLM Input - System: {(system[:300] + '...') if system and len(system) > 300 else system}")
+        logger.debug(f"LLM Input - Prompt: {(prompt[:500] + '...') if len(prompt) > 500 else prompt}")
+
+        return payload
+
+    def _vision_payload(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str],
+    ) -> dict:
+        """Build the /api/generate request body with base64-encoded images."""
+        # Encoded once per file and reused across calls
+        images = [self.image_cache.base64(image_path) for image_path in image_paths]
 
         payload = {
             "model": self.vision_model,
@@ -167,22 +495,14 @@ class OllamaBackend(BaseLLM):
         logger.debug(f"Analyzing {len(images)} images with {self.vision_model}")
         logger.debug(f"Vision Input - Prompt: {(prompt[:500] + '...') if len(prompt) > 500 else prompt}")
 
-        try:
-            response = self.client.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-            )
-            response.raise_for_status()
+        return payload
 
-            result = response.json()["response"]
-            logger.debug(f"Vision Output ({len(result)} chars): {(result[:800] + '...') if len(result) > 800 else result}")
-            return result
-
-        except httpx.RequestError as e:
-            raise ConnectionError(
-                f"Failed to connect to Ollama at {self.base_url}. "
-                f"Ensure Ollama is running with LLaVA model: {e}"
-            )
+    async def aclose(self) -> None:
+        """Close the async HTTP client from inside its event loop."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
 
     def __del__(self):
         """Clean up HTTP client."""
@@ -1,14 +1,17 @@
 """OpenAI API backend for LLM operations."""
 
-import base64
 import logging
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from .base import BaseLLM
+from .images import ImagePayloadCache
+from .images import image_cache as default_image_cache
+from .structured import strict_schema
+from .usage import report_usage
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +22,25 @@ class OpenAIBackend(BaseLLM):
     Supports both text generation and vision analysis using GPT-4o.
     """
 
+    supports_structured_output = True
+
     def __init__(
         self,
         model: str = "gpt-4o",
         api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        image_cache: Optional[ImagePayloadCache] = None,
     ):
         """Initialize OpenAI backend.
 
         Args:
             model: Model name to use (default: gpt-4o)
             api_key: API key (defaults to OPENAI_API_KEY env var)
+            base_url: OpenAI-compatible endpoint (defaults to OPENAI_BASE_URL or the OpenAI API)
+            image_cache: Encoded image cache (defaults to the shared process-wide one)
         """
         self.model = model
+        self.image_cache = image_cache or default_image_cache
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
 
         if not self.api_key:
@@ -39,8 +49,12 @@ class OpenAIBackend(BaseLLM):
                 "or pass api_key parameter."
             )
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, base_url=base_url)
         logger.info(f"Initialized OpenAI backend with model: {model}")
+        if base_url:
+            logger.info(f"OpenAI endpoint: {base_url}")
 
     def generate(
         self,
@@ -60,33 +74,31 @@ class OpenAIBackend(BaseLLM):
         Returns:
             Generated text response
         """
-        messages = []
-
-        if system:
-            messages.append({"role": "system", "content": system})
-
-        messages.append({"role": "user", "content": prompt})
-
-        logger.debug(f"Generating with {self.model}, temp={temperature}")
-        logger.info(f"LLM Input chars: {len(system+prompt)}")
-        logger.debug(f"LLM Input - System: {system}")
-        logger.debug(f"LLM Input - Prompt: {prompt}")
-
-        kwargs = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-        }
+        kwargs = self._generate_request(prompt, system, temperature, max_tokens)
+        response = self.client.chat.completions.create(**kwargs)
+        return self._generate_result(response)
 
-        # if max_tokens:
-        #     kwargs["max_completion_tokens"] = max_tokens
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = "",
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Generate text completion using the async OpenAI client.
 
-        response = self.client.chat.completions.create(**kwargs)
-        result = response.choices[0].message.content
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
 
-        logger.info(f"LLM Output chars: {len(result)}")
-        logger.debug(f"LLM Output: {(result[:500] + '...') if len(result) > 500 else result}")
-        return result
+        Returns:
+            Generated text response
+        """
+        kwargs = self._generate_request(prompt, system, temperature, max_tokens)
+        response = await self.async_client.chat.completions.create(**kwargs)
+        return self._generate_result(response)
 
     def analyze_image(
         self,
@@ -108,6 +120,26 @@ class OpenAIBackend(BaseLLM):
         """
         return self.analyze_images([image_path], prompt, system, max_tokens)
 
+    async def aanalyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Analyze a single image using the async OpenAI client.
+
+        Args:
+            image_path: Path to the image
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Returns:
+            Analysis response
+        """
+        return await self.aanalyze_images([image_path], prompt, system, max_tokens)
+
     def analyze_images(
         self,
         image_paths: list[Path | str],
@@ -126,6 +158,250 @@ class OpenAIBackend(BaseLLM):
         Returns:
             Analysis response
         """
+        messages = self._vision_messages(image_paths, prompt, system)
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            # max_completion_tokens=2000,
+        )
+        return self._vision_result(response)
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = "",
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Analyze multiple images using the async OpenAI client.
+
+        Args:
+            image_paths: List of image paths
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Returns:
+            Analysis response
+        """
+        messages = self._vision_messages(image_paths, prompt, system)
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+        )
+        return self._vision_result(response)
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = "",
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream a text completion from the OpenAI API.
+
+        Args:
+            prompt: The user prompt
+            system: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text chunks in order
+        """
+        kwargs = self._generate_request(prompt, system, temperature, max_tokens)
+        yield from self._stream(
+            self.client.chat.completions.create(
+                **kwargs, stream=True, stream_options={"include_usage": True}
+            )
+        )
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = "",
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """Stream a GPT-4o vision analysis.
+
+        Args:
+            image_paths: List of image paths
+            prompt: Analysis prompt
+            system: Optional system prompt
+            max_tokens: Maximum tokens (unused, for API compatibility)
+
+        Yields:
+            Text chunks in order
+        """
+        messages = self._vision_messages(image_paths, prompt, system)
+        yield from self._stream(
+            self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        )
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = "",
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        """Generate a JSON document constrained to a schema via response_format.
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt
+            temperature: Sampling temperature (text requests only)
+            max_tokens: Maximum tokens to generate
+            image_paths: Optional images to attach (vision request)
+
+        Returns:
+            JSON response text
+        """
+        kwargs = self._structured_request(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+        response = self.client.chat.completions.create(**kwargs)
+        if image_paths:
+            return self._vision_result(response)
+        return self._generate_result(response)
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = "",
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        """Stream a JSON document constrained to a schema via response_format.
+
+        Args:
+            prompt: The user prompt
+            schema: JSON schema from llm.structured.response_schema()
+            system: Optional system prompt
+            temperature: Sampling temperature (text requests only)
+            max_tokens: Maximum tokens to generate
+            image_paths: Optional images to attach (vision request)
+
+        Yields:
+            Text chunks in order
+        """
+        kwargs = self._structured_request(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+        yield from self._stream(
+            self.client.chat.completions.create(
+                **kwargs, stream=True, stream_options={"include_usage": True}
+            )
+        )
+
+    def _structured_request(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        image_paths: Optional[list[Path | str]],
+    ) -> dict:
+        """Build chat completion arguments with a json_schema response_format.
+
+        Strict mode is used when the schema fits OpenAI's strict subset;
+        schemas with open dicts or tuples are sent non-strict.
+        """
+        if image_paths:
+            kwargs = {
+                "model": self.model,
+                "messages": self._vision_messages(image_paths, prompt, system),
+            }
+        else:
+            kwargs = self._generate_request(prompt, system, temperature, max_tokens)
+
+        strict = strict_schema(schema)
+        kwargs["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.get("title", "response"),
+                "schema": strict or schema,
+                "strict": strict is not None,
+            },
+        }
+        return kwargs
+
+    @staticmethod
+    def _stream(response) -> Iterator[str]:
+        """Yield content deltas, closing the HTTP stream if the consumer stops early.
+
+        The final chunk carries the token usage (requested with
+        ``include_usage``); streams closed early end without it.
+        """
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    report_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        finally:
+            response.close()
+
+    def _generate_request(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> dict:
+        """Build chat completion arguments for a text request."""
+        messages = []
+
+        if system:
+            messages.append({"role": "system", "content": system})
+
+        messages.append({"role": "user", "content": prompt})
+
+        logger.debug(f"Generating with {self.model}, temp={temperature}")
+        logger.info(f"LLM Input chars: {len((system or '') + prompt)}")
+        logger.debug(f"LLM Input - System: {system}")
+        logger.debug(f"LLM Input - Prompt: {prompt}")
+
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+
+        # if max_tokens:
+        #     kwargs["max_completion_tokens"] = max_tokens
+
+        return kwargs
+
+    def _generate_result(self, response) -> str:
+        """Extract and log the text of a chat completion, reporting its token usage."""
+        result = response.choices[0].message.content
+        if response.usage:
+            report_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+
+        logger.info(f"LLM Output chars: {len(result)}")
+        logger.debug(f"LLM Output: {(result[:500] + '...') if len(result) > 500 else result}")
+        return result
+
+    def _vision_messages(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str],
+    ) -> list[dict]:
+        """Build chat messages with the images attached as data URLs."""
         messages = []
 
         if system:
@@ -135,29 +411,10 @@ class OpenAIBackend(BaseLLM):
         content = []
 
         for image_path in image_paths:
-            image_path = Path(image_path)
-            if not image_path.exists():
-                raise FileNotFoundError(f"Image not found: {image_path}")
-
-            # Read and encode image
-            with open(image_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode("utf-8")
-
-            # Determine media type
-            suffix = image_path.suffix.lower()
-            media_types = {
-                ".png": "image/png",
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".gif": "image/gif",
-                ".webp": "image/webp",
-            }
-            media_type = media_types.get(suffix, "image/png")
-
             content.append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:{media_type};base64,{image_data}",
+                    "url": self.image_cache.data_url(image_path),
                     "detail": "high",
                 },
             })
@@ -166,17 +423,17 @@ class OpenAIBackend(BaseLLM):
 
         messages.append({"role": "user", "content": content})
 
-        logger.info(f"Vision Critic Input chars: {len(system+prompt)}")
+        logger.info(f"Vision Critic Input chars: {len((system or '') + prompt)}")
         logger.debug(f"Analyzing {len(image_paths)} images with {self.model}")
         logger.debug(f"Vision Critic Input - Prompt: {(prompt[:500] + '...') if len(prompt) > 500 else prompt}")
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            # max_completion_tokens=2000,
-        )
+        return messages
 
+    def _vision_result(self, response) -> str:
+        """Extract and log the text of a vision completion, reporting its token usage."""
         result = response.choices[0].message.content
+        if response.usage:
+            report_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
         logger.info(f"Vision Critic Output chars: {len(result)}")
         logger.debug(f"Vision Critic Output: {(result[:800] + '...') if len(result) > 800 else result}")
 
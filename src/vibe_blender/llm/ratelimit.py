@@ -0,0 +1,510 @@
+"""Token-bucket rate limiting of LLM calls, shared across pipelines.
+
+Providers enforce requests-per-minute and tokens-per-minute limits per
+model and account, not per client. A RateLimiter is shared by every backend
+for the same model in the process (see get_rate_limiter) and, with a lock
+file, by every process on the machine. A ConcurrencyLimitedLLM caps the
+number of calls in flight, e.g. across the jobs of a batch run.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, Optional
+
+from ..scheduling import ResourcePool
+from .base import BaseLLM
+from .usage import estimate_image_tokens, estimate_text_tokens
+from .wrapper import LLMWrapper
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Assumed completion length when a call doesn't set max_tokens
+DEFAULT_OUTPUT_TOKENS = 1024
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``per_minute`` units per minute.
+
+    Capacity equals one minute's budget, so an idle limiter allows a burst
+    of up to a full minute's worth of calls.
+    """
+
+    def __init__(self, per_minute: float, level: Optional[float] = None):
+        self.per_minute = per_minute
+        self.level = per_minute if level is None else level
+
+    def refill(self, elapsed: float) -> None:
+        self.level = min(self.per_minute, self.level + elapsed * self.per_minute / 60)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if available now)."""
+        # A request larger than the whole bucket waits for a full bucket
+        amount = min(amount, self.per_minute)
+        missing = amount - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+
+class RateLimiter:
+    """FIFO rate limiter budgeting requests and estimated tokens per minute.
+
+    Callers queue in arrival order: a large request at the head of the
+    queue isn't starved by small requests that would fit sooner. Queue
+    depth and time spent waiting are tracked for sizing concurrency.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        lock_file: Optional[Path | str] = None,
+        name: str = "llm",
+    ):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget (None = unlimited)
+            tokens_per_minute: Token budget, prompt plus completion (None = unlimited)
+            lock_file: File holding the bucket levels, shared by all processes
+                using it (ignored where file locking isn't available)
+            name: Key of this limiter's state in the lock file, and log label
+        """
+        self.name = name
+        self.buckets: dict[str, TokenBucket] = {}
+        if requests_per_minute:
+            self.buckets["requests"] = TokenBucket(requests_per_minute)
+        if tokens_per_minute:
+            self.buckets["tokens"] = TokenBucket(tokens_per_minute)
+        self._updated = time.monotonic()
+
+        self.lock_file = Path(lock_file).expanduser() if lock_file else None
+        if self.lock_file and fcntl is None:
+            logger.warning("File locking unavailable; LLM rate limit applies per process only")
+            self.lock_file = None
+        if self.lock_file:
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Callers currently waiting, including the one at the head."""
+        return self._next_ticket - self._serving
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request and ``tokens`` tokens fit the budget, then take them.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the call
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.buckets:
+            return 0.0
+
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            while ticket != self._serving:
+                self._cond.wait()
+
+        try:
+            amounts = {"requests": 1, "tokens": tokens}
+            while True:
+                delay = self._try_take(amounts)
+                if delay == 0:
+                    break
+                time.sleep(delay)
+        finally:
+            with self._cond:
+                self._serving += 1
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self.acquired += 1
+            if waited > 0.01:
+                self.waited += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+                logger.debug(f"Rate limiter {self.name}: waited {waited:.2f}s")
+        return waited
+
+    def stats(self) -> dict:
+        """Return request counts, wait times and queue depth."""
+        with self._cond:
+            return {
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "wait_seconds": round(self.wait_seconds, 2),
+                "max_wait_seconds": round(self.max_wait_seconds, 2),
+                "mean_wait_seconds": round(self.wait_seconds / self.acquired, 3)
+                if self.acquired
+                else 0.0,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+            }
+
+    def _try_take(self, amounts: dict[str, float]) -> float:
+        """Take the amounts if all buckets have them; otherwise return the wait time."""
+        if self.lock_file:
+            return self._try_take_shared(amounts)
+        now = time.monotonic()
+        for bucket in self.buckets.values():
+            bucket.refill(now - self._updated)
+        self._updated = now
+        return self._take(amounts)
+
+    def _try_take_shared(self, amounts: dict[str, float]) -> float:
+        # Levels live in the lock file so that all processes draw from them;
+        # wall-clock time is used because monotonic clocks aren't shared
+        with open(self.lock_file, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    shared = json.loads(f.read() or "{}")
+                except json.JSONDecodeError:
+                    shared = {}
+                state = shared.get(self.name, {})
+                now = time.time()
+                elapsed = max(0.0, now - state.get("updated", now))
+                for key, bucket in self.buckets.items():
+                    bucket.level = state.get(key, bucket.per_minute)
+                    bucket.refill(elapsed)
+
+                delay = self._take(amounts)
+                shared[self.name] = {key: bucket.level for key, bucket in self.buckets.items()}
+                shared[self.name]["updated"] = now
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(shared))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return delay
+
+    def _take(self, amounts: dict[str, float]) -> float:
+        delay = max(self.buckets[key].wait_time(amounts[key]) for key in self.buckets)
+        if delay == 0:
+            for key, bucket in self.buckets.items():
+                bucket.level -= min(amounts[key], bucket.per_minute)
+        return delay
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    name: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    lock_file: Optional[Path | str] = None,
+) -> RateLimiter:
+    """Return the process-wide limiter for a name, creating it on first use.
+
+    Args:
+        name: Limit scope, typically "backend:model"
+        requests_per_minute: Request budget for a new limiter
+        tokens_per_minute: Token budget for a new limiter
+        lock_file: Cross-process state file for a new limiter
+
+    Returns:
+        The shared RateLimiter (budgets of an existing limiter are kept)
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(
+                requests_per_minute, tokens_per_minute, lock_file=lock_file, name=name
+            )
+        return _limiters[name]
+
+
+def estimate_tokens(
+    llm: BaseLLM,
+    prompt: str,
+    system: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    image_paths: Optional[list[Path | str]] = None,
+) -> int:
+    """Estimate the tokens a call will consume, for budgeting.
+
+    Uses ~4 characters per text token, the backend's image token formula
+    and max_tokens (or DEFAULT_OUTPUT_TOKENS) for the completion.
+
+    Args:
+        llm: Backend the call goes to
+        prompt: User prompt
+        system: System prompt
+        max_tokens: Completion limit of the call
+        image_paths: Attached images
+
+    Returns:
+        Estimated prompt plus completion tokens
+    """
+    tokens = estimate_text_tokens(prompt + (system or "")) + estimate_image_tokens(llm, image_paths)
+    return tokens + (max_tokens or DEFAULT_OUTPUT_TOKENS)
+
+
+class RateLimitedLLM(LLMWrapper):
+    """LLM wrapper that takes a slot from a RateLimiter before every call."""
+
+    def __init__(self, llm: BaseLLM, limiter: RateLimiter):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend to call
+            limiter: Limiter to draw from (usually shared, see get_rate_limiter)
+        """
+        super().__init__(llm)
+        self.limiter = limiter
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        self._acquire(prompt, system, max_tokens)
+        return self.llm.generate(prompt, system, temperature, max_tokens)
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        self._acquire(prompt, system, max_tokens, image_paths)
+        return self.llm.analyze_images(image_paths, prompt, system, max_tokens)
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        self._acquire(prompt, system, max_tokens, image_paths)
+        return self.llm.generate_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        self._acquire(prompt, system, max_tokens)
+        return self.llm.stream_generate(prompt, system, temperature, max_tokens)
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        self._acquire(prompt, system, max_tokens, image_paths)
+        return self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens)
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        self._acquire(prompt, system, max_tokens, image_paths)
+        return self.llm.stream_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        await asyncio.to_thread(self._acquire, prompt, system, max_tokens)
+        return await self.llm.agenerate(prompt, system, temperature, max_tokens)
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        await asyncio.to_thread(self._acquire, prompt, system, max_tokens, image_paths)
+        return await self.llm.aanalyze_images(image_paths, prompt, system, max_tokens)
+
+    def stats(self) -> dict:
+        """Return the shared limiter's stats."""
+        return self.limiter.stats()
+
+    def _acquire(
+        self,
+        prompt: str,
+        system: Optional[str],
+        max_tokens: Optional[int],
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> None:
+        tokens = estimate_tokens(self.llm, prompt, system, max_tokens, image_paths)
+        self.limiter.acquire(tokens)
+
+
+class ConcurrencyLimitedLLM(LLMWrapper):
+    """LLM wrapper allowing at most a fixed number of calls in flight.
+
+    The slot is taken when a call starts (for streams, when the first chunk
+    is requested) and held until the response, or the whole stream, is read.
+    """
+
+    def __init__(self, llm: BaseLLM, slots: ResourcePool):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend to call
+            slots: Pool shared by every backend the limit applies to
+        """
+        super().__init__(llm)
+        self.slots = slots
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        with self.slots:
+            return self.llm.generate(prompt, system, temperature, max_tokens)
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        with self.slots:
+            return self.llm.analyze_images(image_paths, prompt, system, max_tokens)
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        with self.slots:
+            return self.llm.generate_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            )
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_generate(prompt, system, temperature, max_tokens)
+        )
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens)
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            )
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.agenerate(prompt, system, temperature, max_tokens)
+        )
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.aanalyze_images(image_paths, prompt, system, max_tokens)
+        )
+
+    def stats(self) -> dict:
+        """Return the shared pool's utilization and queueing."""
+        return self.slots.stats()
+
+    async def _acall(self, fn: Callable[[], Awaitable[str]]) -> str:
+        # Wait in a worker thread so the event loop keeps serving other calls
+        await asyncio.to_thread(self.slots.acquire)
+        try:
+            return await fn()
+        finally:
+            self.slots.release()
+
+    def _stream(self, open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        with self.slots:
+            # Closing this generator closes the inner stream too
+            yield from open_stream()
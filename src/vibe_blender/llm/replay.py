@@ -0,0 +1,447 @@
+"""Record LLM interactions to a cassette and replay them deterministically.
+
+A cassette is a JSON-lines file. The first line of each recording session
+describes the recorded backend; every further line is one interaction
+(request key, response text, latency). Replaying a cassette runs the whole
+pipeline offline and deterministically, which, together with a fake
+Blender, measures pure pipeline overhead and catches parsing regressions.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .base import BaseLLM
+from .images import image_cache
+from .wrapper import LLMWrapper
+
+logger = logging.getLogger(__name__)
+
+# Replayed streams are split into chunks of this many characters
+REPLAY_CHUNK_CHARS = 64
+
+# Run-specific details that must not change a request's key
+_VOLATILE = [
+    (re.compile(r"\d{8}_\d{6}"), "<run>"),  # output directory timestamps
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?"), "<time>"),
+]
+
+
+class CassetteMissError(LookupError):
+    """Raised in strict replay when a request isn't in the cassette."""
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """Normalize a prompt for matching: collapse whitespace, mask timestamps."""
+    text = " ".join((text or "").split())
+    for pattern, placeholder in _VOLATILE:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def interaction_key(
+    method: str,
+    prompt: str,
+    system: Optional[str] = None,
+    image_paths: Optional[list[Path | str]] = None,
+    schema: Optional[dict] = None,
+) -> str:
+    """Return the replay key of a request.
+
+    The key covers the method (streamed and blocking variants share one),
+    the normalized system prompt and prompt, the content hashes of attached
+    images and the response schema. Sampling parameters are ignored.
+
+    Args:
+        method: generate, analyze_images or generate_structured
+        prompt: User prompt
+        system: System prompt
+        image_paths: Attached images
+        schema: JSON schema of structured output
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = {
+        "method": method,
+        "system": normalize_prompt(system),
+        "prompt": normalize_prompt(prompt),
+        "images": [image_cache.digest(path) for path in image_paths or []],
+        "schema": schema,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class CassetteWriter:
+    """Thread-safe appender of interactions to a cassette file."""
+
+    def __init__(self, path: Path | str):
+        """Initialize the writer.
+
+        Args:
+            path: Cassette file; new recordings are appended to it
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def write(self, entry: dict) -> None:
+        """Append one line."""
+        line = json.dumps(entry)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class RecordingLLM(LLMWrapper):
+    """LLM wrapper that records every completed request and response to a cassette."""
+
+    def __init__(self, llm: BaseLLM, cassette: CassetteWriter):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend whose responses are recorded
+            cassette: Writer shared by all recorders of a run
+        """
+        super().__init__(llm)
+        self.cassette = cassette
+        self.cassette.write(
+            {
+                "type": "backend",
+                "backend": type(self.backend).__name__,
+                "model": getattr(llm, "model", None),
+                "max_image_size": list(llm.max_image_size),
+                "supports_structured_output": llm.supports_structured_output,
+            }
+        )
+        logger.info(f"Recording LLM interactions to {self.cassette.path}")
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.generate(prompt, system, temperature, max_tokens),
+            "generate",
+            prompt,
+            system,
+        )
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.analyze_images(image_paths, prompt, system, max_tokens),
+            "analyze_images",
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.generate_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            ),
+            "generate_structured",
+            prompt,
+            system,
+            image_paths,
+            schema,
+        )
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_generate(prompt, system, temperature, max_tokens),
+            "generate",
+            prompt,
+            system,
+        )
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens),
+            "analyze_images",
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            ),
+            "generate_structured",
+            prompt,
+            system,
+            image_paths,
+            schema,
+        )
+
+    def _call(self, fn: Callable[[], str], method: str, *request) -> str:
+        started = time.perf_counter()
+        response = fn()
+        self._record(method, request, response, time.perf_counter() - started)
+        return response
+
+    def _stream(self, open_stream: Callable[[], Iterator[str]], method: str, *request):
+        # Record what the consumer read, even if it closed the stream early:
+        # replaying that text makes the consumer stop at the same point
+        started = time.perf_counter()
+        chunks = []
+        failed = False
+        stream = open_stream()
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            failed = True
+            raise
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            if not failed:
+                self._record(method, request, "".join(chunks), time.perf_counter() - started)
+
+    def _record(self, method: str, request: tuple, response: str, latency: float) -> None:
+        prompt, system, *rest = request
+        self.cassette.write(
+            {
+                "type": "interaction",
+                "method": method,
+                "key": interaction_key(method, prompt, system, *rest),
+                "model": getattr(self.llm, "model", None),
+                "prompt": normalize_prompt(prompt)[:200],
+                "response": response,
+                "latency_seconds": round(latency, 3),
+            }
+        )
+
+
+class ReplayLLM(BaseLLM):
+    """Backend answering from a recorded cassette instead of a model.
+
+    Requests are matched by interaction_key(). A request recorded several
+    times replays its responses in recorded order, repeating the last one.
+    On a miss, strict mode raises CassetteMissError; otherwise the next
+    unplayed interaction of the same method is returned, so runs whose
+    renders differ slightly from the recording (and hence whose critique
+    images hash differently) still replay in order.
+    """
+
+    def __init__(
+        self,
+        cassette: Path | str = "cassette.jsonl",
+        latency_scale: float = 0.0,
+        strict: bool = False,
+    ):
+        """Initialize the backend.
+
+        Args:
+            cassette: Cassette file written by RecordingLLM
+            latency_scale: Fraction of the recorded latency to simulate (0 = instant)
+            strict: Raise on requests missing from the cassette
+
+        Raises:
+            FileNotFoundError: If the cassette doesn't exist
+        """
+        self.path = Path(cassette).expanduser()
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.model = "replay"
+
+        self.interactions: list[dict] = []
+        self._by_key: dict[str, deque[dict]] = defaultdict(deque)
+        self._played: set[int] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["type"] == "backend":
+                    if not self.interactions:
+                        # Match the recorded backend's behavior affecting prompts and images
+                        self.model = entry.get("model") or self.model
+                        self.max_image_size = tuple(entry["max_image_size"])
+                        self.supports_structured_output = entry["supports_structured_output"]
+                    continue
+                entry["index"] = len(self.interactions)
+                self.interactions.append(entry)
+                self._by_key[entry["key"]].append(entry)
+
+        logger.info(f"Replaying {len(self.interactions)} LLM interactions from {self.path}")
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        entry = self._lookup("generate", prompt, system)
+        self._sleep(entry)
+        return entry["response"]
+
+    def analyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> str:
+        return self.analyze_images([image_path], prompt, system)
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        entry = self._lookup("analyze_images", prompt, system, image_paths)
+        self._sleep(entry)
+        return entry["response"]
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        entry = self._lookup("generate_structured", prompt, system, image_paths, schema)
+        self._sleep(entry)
+        return entry["response"]
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        yield from self._chunks(self._lookup("generate", prompt, system))
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        yield from self._chunks(self._lookup("analyze_images", prompt, system, image_paths))
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        entry = self._lookup("generate_structured", prompt, system, image_paths, schema)
+        yield from self._chunks(entry)
+
+    def stats(self) -> dict:
+        """Return matched and unmatched request counts."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "unplayed": len(self.interactions) - len(self._played),
+        }
+
+    def _lookup(
+        self,
+        method: str,
+        prompt: str,
+        system: Optional[str],
+        image_paths: Optional[list[Path | str]] = None,
+        schema: Optional[dict] = None,
+    ) -> dict:
+        key = interaction_key(method, prompt, system, image_paths, schema)
+        with self._lock:
+            queue = self._by_key.get(key)
+            if queue:
+                entry = queue.popleft() if len(queue) > 1 else queue[0]
+                self.hits += 1
+            else:
+                self.misses += 1
+                if self.strict:
+                    raise CassetteMissError(
+                        f"No recorded {method} response for: {normalize_prompt(prompt)[:100]}"
+                    )
+                entry = next(
+                    (
+                        e
+                        for e in self.interactions
+                        if e["method"] == method and e["index"] not in self._played
+                    ),
+                    None,
+                )
+                if entry is None:
+                    raise CassetteMissError(f"Cassette has no unplayed {method} responses left")
+                logger.warning(
+                    f"No exact cassette match for {method}; "
+                    f"replaying interaction {entry['index']} in recorded order"
+                )
+            self._played.add(entry["index"])
+        return entry
+
+    def _sleep(self, entry: dict) -> None:
+        if self.latency_scale:
+            time.sleep(entry.get("latency_seconds", 0) * self.latency_scale)
+
+    def _chunks(self, entry: dict) -> Iterator[str]:
+        self._sleep(entry)
+        text = entry["response"]
+        for start in range(0, len(text), REPLAY_CHUNK_CHARS):
+            yield text[start : start + REPLAY_CHUNK_CHARS]
@@ -0,0 +1,410 @@
+"""Retry, backoff and circuit breaking for LLM calls."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, Optional
+
+import httpx
+import openai
+
+from .base import BaseLLM
+from .wrapper import LLMWrapper
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without calling the backend while its circuit breaker is open."""
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(getattr(error, "response", None), httpx.Response):
+        status = error.response.status_code
+    return status
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for transient errors: connection problems, timeouts, 429 and 5xx."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(
+        error,
+        (
+            ConnectionError,
+            TimeoutError,
+            httpx.TransportError,
+            openai.APIConnectionError,
+        ),
+    ):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Return the server's requested delay in seconds from a Retry-After header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` transient failures in a row the circuit opens
+    and calls fail fast with CircuitOpenError. After ``reset_seconds`` one
+    trial call is let through (half-open); success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60.0):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.opens = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """closed, open or half-open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may proceed."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+        raise CircuitOpenError(
+            f"LLM backend unavailable after {self.failures} consecutive failures; "
+            f"retrying in {max(remaining, 0):.0f}s"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(
+                        f"Opening LLM circuit breaker after {self.failures} consecutive failures"
+                    )
+                self.opened_at = time.monotonic()
+                self.opens += 1
+
+
+class ResilientLLM(LLMWrapper):
+    """LLM wrapper adding retries with backoff, a per-call deadline and a circuit breaker.
+
+    Transient failures (connection errors, timeouts, 429, 5xx) are retried
+    with full-jitter exponential backoff, waiting at least as long as the
+    server's Retry-After asks. Retries stop once the per-call deadline
+    would be exceeded. Streams are retried only if they fail before the
+    first chunk was delivered.
+    """
+
+    def __init__(
+        self,
+        llm: BaseLLM,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = 300.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend to call
+            max_retries: Retries after the first attempt
+            base_delay: Backoff base in seconds (doubled per attempt)
+            max_delay: Backoff cap in seconds
+            deadline: Total seconds one call may take including retries (None = no limit)
+            breaker: Circuit breaker (a new one by default)
+        """
+        super().__init__(llm)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.breaker = breaker or CircuitBreaker()
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(lambda: self.llm.generate(prompt, system, temperature, max_tokens))
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.analyze_images(image_paths, prompt, system, max_tokens)
+        )
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.generate_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            )
+        )
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_generate(prompt, system, temperature, max_tokens)
+        )
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens)
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            )
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.agenerate(prompt, system, temperature, max_tokens)
+        )
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.aanalyze_images(image_paths, prompt, system, max_tokens)
+        )
+
+    def stats(self) -> dict:
+        """Return call, retry and backoff counters and the breaker state."""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "backoff_seconds": round(self.backoff_seconds, 2),
+            "circuit": self.breaker.state,
+            "circuit_opens": self.breaker.opens,
+        }
+
+    def _call(self, fn: Callable[[], str]) -> str:
+        # Blocking calls can't be interrupted; the backend's own request
+        # timeout bounds each attempt and the deadline bounds the retries
+        started = time.monotonic()
+        attempt = 0
+        self._count("calls")
+        while True:
+            self.breaker.before_call()
+            try:
+                result = fn()
+            except Exception as e:
+                time.sleep(self._on_error(e, attempt, started))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def _acall(self, fn: Callable[[], Awaitable[str]]) -> str:
+        started = time.monotonic()
+        attempt = 0
+        self._count("calls")
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await asyncio.wait_for(fn(), timeout=self._remaining(started))
+            except Exception as e:
+                if self._remaining(started) == 0:
+                    self.breaker.record_failure()
+                    self._count("failures")
+                    raise TimeoutError(
+                        f"LLM call exceeded its {self.deadline:.0f}s deadline"
+                    ) from e
+                await asyncio.sleep(self._on_error(e, attempt, started))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _stream(self, open_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        started = time.monotonic()
+        attempt = 0
+        self._count("calls")
+        while True:
+            self.breaker.before_call()
+            stream = None
+            delivered = False
+            try:
+                stream = open_stream()
+                for chunk in stream:
+                    delivered = True
+                    yield chunk
+            except GeneratorExit:
+                # Closed early by the caller, which only happens at a yield: the
+                # backend answered, so settle the breaker (and a half-open trial)
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                if delivered:
+                    # Part of the answer already reached the caller; it can't be replayed
+                    self.breaker.record_failure()
+                    self._count("failures")
+                    raise
+                time.sleep(self._on_error(e, attempt, started))
+                attempt += 1
+                continue
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+            self.breaker.record_success()
+            return
+
+    def _on_error(self, error: Exception, attempt: int, started: float) -> float:
+        """Return the backoff delay before the next attempt, or re-raise error.
+
+        Args:
+            error: Exception raised by the attempt
+            attempt: Zero-based number of the failed attempt
+            started: time.monotonic() when the call started
+
+        Returns:
+            Seconds to sleep before retrying
+
+        Raises:
+            Exception: error itself, if it isn't transient or retries are exhausted
+        """
+        if not is_retryable(error):
+            # The server answered (e.g. 400, 401); it is alive but the request is bad
+            self.breaker.record_success()
+            raise error
+
+        self.breaker.record_failure()
+        delay = min(self.max_delay, self.base_delay * 2**attempt) * random.random()
+        server_delay = retry_after(error)
+        if server_delay is not None:
+            delay = max(delay, server_delay)
+
+        remaining = self._remaining(started)
+        if attempt >= self.max_retries or (remaining is not None and delay >= remaining):
+            self._count("failures")
+            logger.error(f"LLM call failed after {attempt + 1} attempts: {error}")
+            raise error
+
+        self._count("retries")
+        with self._lock:
+            self.backoff_seconds += delay
+        logger.warning(
+            f"LLM call failed ({type(error).__name__}: {error}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+        )
+        return delay
+
+    def _remaining(self, started: float) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - started))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
@@ -0,0 +1,120 @@
+"""Per-role routing of LLM calls to different backends and models."""
+
+import json
+import logging
+from typing import Optional
+
+from ..config import LLM_ROLES, LLMConfig
+from ..scheduling import ResourcePool
+from .base import BaseLLM
+from .ratelimit import ConcurrencyLimitedLLM, RateLimitedLLM, get_rate_limiter
+from .replay import CassetteWriter, RecordingLLM
+from .resilience import CircuitBreaker, ResilientLLM
+from .wrapper import LLMWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class LLMRouter(LLMWrapper):
+    """Default backend plus optional per-role backends.
+
+    Called directly, the router behaves like its default backend. Agents get
+    their own backend via for_role(), which lets lightweight phases
+    (clarification, planning) run on a small, fast model while generation
+    and critique use a strong one. Roles with identical settings share one
+    backend instance, and with it one retry policy and circuit breaker.
+    """
+
+    def __init__(self, default: BaseLLM, roles: Optional[dict[str, BaseLLM]] = None):
+        """Initialize the router.
+
+        Args:
+            default: Backend for roles without an override
+            roles: Mapping of role name to backend
+        """
+        super().__init__(default)
+        self.roles = roles or {}
+
+    @classmethod
+    def from_config(cls, config: LLMConfig, slots: Optional[ResourcePool] = None) -> "LLMRouter":
+        """Build backends for the default and every configured role.
+
+        Args:
+            config: LLM configuration
+            slots: In-flight call slots shared by all backends, e.g. with a
+                scheduler (default: rate_limit.max_concurrent slots, or no limit)
+
+        Returns:
+            Router with one resilient backend per distinct (backend, settings) pair.
+            If every role is overridden the default backend isn't built and the
+            generator's backend stands in for it.
+        """
+        from . import create_llm
+
+        retry = config.retry
+        rate_limit = config.rate_limit
+        cassette = CassetteWriter(config.record) if config.record else None
+        # One pool of in-flight slots for all backends of this router
+        if slots is None and rate_limit.max_concurrent:
+            slots = ResourcePool("llm", rate_limit.max_concurrent)
+
+        instances: dict[str, BaseLLM] = {}
+
+        def build(role: Optional[str]) -> BaseLLM:
+            backend, settings = config.backend_settings(role)
+            key = json.dumps([backend, settings], sort_keys=True)
+            if key not in instances:
+                llm = create_llm(backend, **settings)
+                if cassette:
+                    llm = RecordingLLM(llm, cassette)
+                if slots:
+                    llm = ConcurrencyLimitedLLM(llm, slots)
+                if rate_limit.requests_per_minute or rate_limit.tokens_per_minute:
+                    # Retries go through the limiter too, so it wraps the backend directly
+                    limiter = get_rate_limiter(
+                        f"{backend}:{settings.get('model')}",
+                        rate_limit.requests_per_minute,
+                        rate_limit.tokens_per_minute,
+                        lock_file=rate_limit.lock_file,
+                    )
+                    llm = RateLimitedLLM(llm, limiter)
+                instances[key] = ResilientLLM(
+                    llm,
+                    max_retries=retry.max_retries,
+                    base_delay=retry.base_delay,
+                    max_delay=retry.max_delay,
+                    deadline=retry.call_deadline,
+                    breaker=CircuitBreaker(retry.breaker_failures, retry.breaker_reset_seconds),
+                )
+                logger.info(f"LLM for {role or 'default'}: {backend} {settings.get('model')}")
+            return instances[key]
+
+        # Only build the default if a role falls back to it, so overriding every
+        # role needs no credentials (or limiter, or cassette entry) for it
+        default = build(None) if LLM_ROLES - set(config.roles) else None
+        roles = {role: build(role) for role in sorted(config.roles)}
+        return cls(default or roles["generator"], roles)
+
+    def for_role(self, role: str) -> BaseLLM:
+        """Return the backend configured for a role.
+
+        Args:
+            role: One of clarification, planner, generator, critic
+
+        Returns:
+            The role's backend, or the default backend
+
+        Raises:
+            ValueError: If the role name is unknown
+        """
+        if role not in LLM_ROLES:
+            raise ValueError(f"Unknown role {role}, must be in: {LLM_ROLES}")
+        return self.roles.get(role, self.llm)
+
+    @property
+    def backends(self) -> list[BaseLLM]:
+        """The distinct backends behind the default and all roles."""
+        unique: dict[int, BaseLLM] = {id(self.llm): self.llm}
+        for llm in self.roles.values():
+            unique.setdefault(id(llm), llm)
+        return list(unique.values())
@@ -0,0 +1,147 @@
+"""Incremental extraction of answers from streamed LLM responses.
+
+Agents only need the code block or JSON value in a response; anything the
+model writes after it is discarded by the parsers. An extractor watches the
+stream and reports when that answer is complete so the caller can close the
+stream and stop paying for (and waiting on) the rest.
+"""
+
+import logging
+import re
+import time
+from typing import Iterator, Optional
+
+from .metrics import LLMCallMetrics, LLMMetrics, llm_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class StreamExtractor:
+    """Base extractor: never stops early, so the whole response is read."""
+
+    def __init__(self):
+        self.text = ""
+
+    def feed(self, chunk: str) -> bool:
+        """Append a chunk and return True once the answer is complete."""
+        self.text += chunk
+        return False
+
+
+class CodeBlockExtractor(StreamExtractor):
+    """Stops when a fenced code block in the given language is closed.
+
+    Matches ``GeneratorAgent._extract_code``, which prefers the first
+    ```python block; responses without one are read to the end so the
+    parser's fallbacks still see everything.
+    """
+
+    def __init__(self, language: str = "python"):
+        super().__init__()
+        self._pattern = re.compile(rf"```{re.escape(language)}\n.*?```", re.DOTALL)
+        self._scan_from = 0
+
+    def feed(self, chunk: str) -> bool:
+        self.text += chunk
+        match = self._pattern.search(self.text, self._scan_from)
+        if match:
+            return True
+        # Restart at the last unclosed opening fence (or near the end)
+        opening = self.text.rfind("```", self._scan_from)
+        self._scan_from = opening if opening != -1 else max(0, len(self.text) - 16)
+        return False
+
+
+class JsonExtractor(StreamExtractor):
+    """Stops when a ```json block closes or a top-level JSON value balances.
+
+    Args:
+        opening: "{" for objects (critique, plan) or "[" for arrays (edits)
+    """
+
+    def __init__(self, opening: str = "{"):
+        super().__init__()
+        self.opening = opening
+        self.closing = {"{": "}", "[": "]"}[opening]
+        self._fence = re.compile(r"```json\s*[\s\S]*?```")
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape_next = False
+        self._fenced = False
+
+    def feed(self, chunk: str) -> bool:
+        start = len(self.text)
+        self.text += chunk
+
+        if "```" in self.text[max(0, start - 2):]:
+            self._fenced = True
+        if self._fenced:
+            # Inside fences, leave the choice of block to the parser
+            return bool(self._fence.search(self.text))
+
+        for char in self.text[start:]:
+            if self._escape_next:
+                self._escape_next = False
+            elif self._depth and char == "\\" and self._in_string:
+                self._escape_next = True
+            elif self._depth and char == '"':
+                self._in_string = not self._in_string
+            elif self._in_string:
+                continue
+            elif char == self.opening:
+                self._depth += 1
+            elif char == self.closing and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    return True
+        return False
+
+
+def collect(
+    chunks: Iterator[str],
+    extractor: Optional[StreamExtractor] = None,
+    label: str = "llm",
+    collector: Optional[LLMMetrics] = None,
+) -> str:
+    """Read a response stream until it ends or the extractor is satisfied.
+
+    Closing the stream early cancels the request on the server. Timing
+    (time to first token, total) is recorded in ``collector``.
+
+    Args:
+        chunks: Text chunks from a ``stream_*`` method
+        extractor: Decides when the answer is complete (default: read all)
+        label: Name of the calling agent, for metrics and logs
+        collector: Metrics to record the call in (default: the shared llm_metrics)
+
+    Returns:
+        The text read so far
+    """
+    extractor = extractor or StreamExtractor()
+    metrics = LLMCallMetrics(label=label)
+    started = time.perf_counter()
+
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if metrics.first_token_seconds is None:
+                metrics.first_token_seconds = time.perf_counter() - started
+            if extractor.feed(chunk):
+                metrics.stopped_early = True
+                break
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+    metrics.total_seconds = time.perf_counter() - started
+    metrics.chars = len(extractor.text)
+    (collector or llm_metrics).record(metrics)
+    logger.info(
+        f"LLM stream ({label}): first token {metrics.first_token_seconds or 0:.2f}s, "
+        f"total {metrics.total_seconds:.2f}s, {metrics.chars} chars"
+        + (", stopped after answer" if metrics.stopped_early else "")
+    )
+    return extractor.text
@@ -0,0 +1,98 @@
+"""JSON schemas for schema-constrained (structured) LLM output."""
+
+import copy
+import json
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# Keywords OpenAI's strict mode rejects; they only narrow values, so
+# dropping them keeps the schema valid and the Pydantic model re-checks them
+UNSUPPORTED_STRICT_KEYWORDS = {
+    "default",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "pattern",
+    "format",
+}
+
+
+def response_schema(model: type[BaseModel], exclude: frozenset[str] = frozenset()) -> dict:
+    """Build the JSON schema an LLM should fill in for a Pydantic model.
+
+    Args:
+        model: Pydantic model describing the response
+        exclude: Top-level fields set by the pipeline rather than the LLM
+            (timestamps, iteration numbers)
+
+    Returns:
+        JSON schema dict, titled with the model name
+    """
+    schema = model.model_json_schema()
+    for name in exclude:
+        schema.get("properties", {}).pop(name, None)
+        if name in schema.get("required", []):
+            schema["required"].remove(name)
+    return schema
+
+
+def strict_schema(schema: dict) -> Optional[dict]:
+    """Convert a JSON schema to OpenAI's strict subset, if possible.
+
+    Strict mode requires every object to list all its properties as
+    required and forbid additional ones. Schemas with open dicts or tuples
+    can't be expressed that way; for those None is returned and the caller
+    should fall back to non-strict mode.
+
+    Args:
+        schema: Schema from response_schema()
+
+    Returns:
+        Strict copy of the schema, or None if it can't be made strict
+    """
+    schema = copy.deepcopy(schema)
+
+    def visit(node: Any) -> bool:
+        if isinstance(node, list):
+            return all(visit(item) for item in node)
+        if not isinstance(node, dict):
+            return True
+        if "prefixItems" in node:
+            return False
+        if node.get("type") == "object":
+            if "properties" not in node or node.get("additionalProperties") not in (None, False):
+                return False
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"])
+        for keyword in UNSUPPORTED_STRICT_KEYWORDS:
+            # "default" etc. may also be property names; only drop keyword values
+            if keyword in node and not isinstance(node[keyword], dict):
+                del node[keyword]
+        return all(visit(value) for value in node.values())
+
+    return schema if visit(schema) else None
+
+
+def load_json(text: str) -> Optional[Any]:
+    """Parse a response that is entirely JSON, as structured output is.
+
+    Args:
+        text: Raw LLM response
+
+    Returns:
+        Parsed value, or None if the response isn't a bare JSON document
+        (the caller then falls back to heuristic extraction)
+    """
+    text = text.strip()
+    if not text.startswith(("{", "[")):
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
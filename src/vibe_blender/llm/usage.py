@@ -0,0 +1,370 @@
+"""Token, latency and cost accounting of LLM calls.
+
+Backends report the token counts from the API response with report_usage();
+a UsageLLM wrapper around each agent's LLM collects them together with the
+agent name and latency into a UsageTracker. Calls whose backend reports no
+usage (e.g. a stream closed before the final usage chunk) are estimated.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, Optional
+
+from PIL import Image
+
+from ..models import LLMUsage
+from .base import BaseLLM
+from .wrapper import LLMWrapper
+
+logger = logging.getLogger(__name__)
+
+# USD per million (input, output) tokens at list price; matched by longest prefix
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-5": (1.25, 10.00),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5-nano": (0.05, 0.40),
+}
+
+# Usage reported by the backend for the call running in this context
+_reported: ContextVar[Optional[dict]] = ContextVar("llm_usage_reported", default=None)
+
+
+def report_usage(
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+    model: Optional[str] = None,
+) -> None:
+    """Report the token counts of the current call; called by backends.
+
+    Does nothing outside a UsageLLM call or when the API returned no counts.
+
+    Args:
+        prompt_tokens: Input tokens from the API response
+        completion_tokens: Output tokens from the API response
+        model: Model that served the call, if it differs from ``llm.model``
+    """
+    reported = _reported.get()
+    if reported is None or prompt_tokens is None or completion_tokens is None:
+        return
+    reported.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    if model:
+        reported["model"] = model
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate tokens of English text or code at ~4 characters per token."""
+    return len(text) // 4
+
+
+def estimate_image_tokens(llm: BaseLLM, image_paths: Optional[list[Path | str]]) -> int:
+    """Estimate the prompt tokens a backend spends on attached images.
+
+    Args:
+        llm: Backend the images are sent to
+        image_paths: Attached images
+
+    Returns:
+        Estimated image tokens (unreadable images count as 0)
+    """
+    tokens = 0
+    for path in image_paths or []:
+        try:
+            with Image.open(path) as image:
+                tokens += llm.estimate_image_tokens(*image.size)
+        except OSError:
+            continue
+    return tokens
+
+
+def model_price(model: str, prices: Optional[dict] = None) -> Optional[tuple[float, float]]:
+    """Look up (input, output) USD per million tokens for a model.
+
+    Args:
+        model: Model name, possibly with a date or tag suffix
+        prices: Overrides of MODEL_PRICES
+
+    Returns:
+        Prices of the longest matching model prefix, or None if unknown
+    """
+    table = {**MODEL_PRICES, **(prices or {})}
+    matches = [name for name in table if model == name or model.startswith(f"{name}-")]
+    if not matches:
+        return None
+    return tuple(table[max(matches, key=len)])
+
+
+class UsageTracker:
+    """Thread-safe list of LLMUsage records for one orchestrator."""
+
+    def __init__(self, prices: Optional[dict[str, tuple[float, float]]] = None):
+        """Initialize the tracker.
+
+        Args:
+            prices: Overrides of MODEL_PRICES (USD per million input/output tokens)
+        """
+        self.prices = prices or {}
+        self.records: list[LLMUsage] = []
+        self._lock = threading.Lock()
+
+    def record(self, usage: LLMUsage) -> None:
+        """Add one call's usage, pricing it if the model is known."""
+        price = model_price(usage.model, self.prices)
+        if price is not None:
+            usage.cost_usd = (
+                usage.prompt_tokens * price[0] + usage.completion_tokens * price[1]
+            ) / 1_000_000
+        with self._lock:
+            self.records.append(usage)
+
+    def restore(self, records: list[LLMUsage]) -> None:
+        """Add already priced records, e.g. of a run resumed from a checkpoint."""
+        with self._lock:
+            self.records.extend(records)
+
+    def mark(self) -> int:
+        """Return a position to pass to since()."""
+        with self._lock:
+            return len(self.records)
+
+    def since(self, mark: int) -> list[LLMUsage]:
+        """Return the records added after mark()."""
+        with self._lock:
+            return self.records[mark:]
+
+
+class UsageLLM(LLMWrapper):
+    """LLM wrapper recording each call's tokens and latency under an agent name."""
+
+    def __init__(self, llm: BaseLLM, tracker: UsageTracker, agent: str):
+        """Initialize the wrapper.
+
+        Args:
+            llm: LLM to forward calls to
+            tracker: Where records are collected
+            agent: Calling agent, used to aggregate usage by phase
+        """
+        super().__init__(llm)
+        self.tracker = tracker
+        self.agent = agent
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.generate(prompt, system, temperature, max_tokens),
+            prompt,
+            system,
+        )
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.analyze_images(image_paths, prompt, system, max_tokens),
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        return self._call(
+            lambda: self.llm.generate_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            ),
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_generate(prompt, system, temperature, max_tokens),
+            prompt,
+            system,
+        )
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens),
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        return self._stream(
+            lambda: self.llm.stream_structured(
+                prompt, schema, system, temperature, max_tokens, image_paths
+            ),
+            prompt,
+            system,
+            image_paths,
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.agenerate(prompt, system, temperature, max_tokens),
+            prompt,
+            system,
+        )
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self._acall(
+            lambda: self.llm.aanalyze_images(image_paths, prompt, system, max_tokens),
+            prompt,
+            system,
+            image_paths,
+        )
+
+    def _call(self, fn: Callable[[], str], prompt, system, image_paths=None) -> str:
+        reported: dict = {}
+        started = time.perf_counter()
+        token = _reported.set(reported)
+        try:
+            result = fn()
+        finally:
+            _reported.reset(token)
+        self._record(reported, started, prompt, system, image_paths, result)
+        return result
+
+    async def _acall(
+        self, fn: Callable[[], Awaitable[str]], prompt, system, image_paths=None
+    ) -> str:
+        reported: dict = {}
+        started = time.perf_counter()
+        token = _reported.set(reported)
+        try:
+            # Backends running in a worker thread get a copy of this context,
+            # which still refers to the same dict
+            result = await fn()
+        finally:
+            _reported.reset(token)
+        self._record(reported, started, prompt, system, image_paths, result)
+        return result
+
+    def _stream(
+        self, open_stream: Callable[[], Iterator[str]], prompt, system, image_paths=None
+    ) -> Iterator[str]:
+        # The context variable is only set while the inner stream runs, so it
+        # never leaks into the consumer's code between chunks
+        reported: dict = {}
+        started = time.perf_counter()
+        text = []
+        token = _reported.set(reported)
+        try:
+            stream = open_stream()
+        finally:
+            _reported.reset(token)
+        failed = False
+        try:
+            while True:
+                token = _reported.set(reported)
+                try:
+                    chunk = next(stream)
+                except StopIteration:
+                    break
+                except Exception:
+                    failed = True
+                    raise
+                finally:
+                    _reported.reset(token)
+                text.append(chunk)
+                yield chunk
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            # Completed or closed early by the consumer; failed calls aren't billed
+            if not failed:
+                self._record(reported, started, prompt, system, image_paths, "".join(text))
+
+    def _record(
+        self,
+        reported: dict,
+        started: float,
+        prompt: str,
+        system: Optional[str],
+        image_paths: Optional[list[Path | str]],
+        result: str,
+    ) -> None:
+        image_tokens = estimate_image_tokens(self.backend, image_paths)
+        estimated = "prompt_tokens" not in reported
+        if estimated:
+            reported["prompt_tokens"] = (
+                estimate_text_tokens(prompt + (system or "")) + image_tokens
+            )
+            reported["completion_tokens"] = estimate_text_tokens(result)
+        model = reported.get("model") or getattr(self.backend, "model", "unknown")
+
+        usage = LLMUsage(
+            agent=self.agent,
+            model=model,
+            prompt_tokens=reported["prompt_tokens"],
+            completion_tokens=reported["completion_tokens"],
+            image_tokens=image_tokens,
+            latency_seconds=time.perf_counter() - started,
+            estimated=estimated,
+        )
+        self.tracker.record(usage)
+        logger.info(
+            f"LLM usage ({self.agent}, {model}): {usage.prompt_tokens} prompt"
+            f" + {usage.completion_tokens} completion tokens"
+            + (" (estimated)" if estimated else "")
+            + f", {usage.latency_seconds:.2f}s"
+        )
@@ -0,0 +1,145 @@
+"""Base class for LLM backends that wrap another backend."""
+
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .base import BaseLLM
+
+
+class LLMWrapper(BaseLLM):
+    """BaseLLM that forwards every call to an inner backend.
+
+    Subclasses override the methods they need (caching, retries, ...) and
+    inherit plain forwarding for the rest. Attributes not defined on the
+    wrapper, such as ``model``, are looked up on the inner backend so
+    wrappers can be stacked transparently.
+    """
+
+    def __init__(self, llm: BaseLLM):
+        """Initialize the wrapper.
+
+        Args:
+            llm: Backend to forward calls to
+        """
+        self.llm = llm
+
+    def __getattr__(self, name: str):
+        # Only called for attributes missing on the wrapper itself
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
+
+    @property
+    def backend(self) -> BaseLLM:
+        """The innermost (unwrapped) backend."""
+        llm = self.llm
+        while isinstance(llm, LLMWrapper):
+            llm = llm.llm
+        return llm
+
+    @property
+    def max_image_size(self) -> tuple[int, int]:
+        return self.llm.max_image_size
+
+    @property
+    def supports_structured_output(self) -> bool:
+        return self.llm.supports_structured_output
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        return self.llm.estimate_image_tokens(width, height)
+
+    def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self.llm.generate(prompt, system, temperature, max_tokens)
+
+    def analyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> str:
+        return self.analyze_images([image_path], prompt, system)
+
+    def analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return self.llm.analyze_images(image_paths, prompt, system, max_tokens)
+
+    def stream_generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self.llm.stream_generate(prompt, system, temperature, max_tokens)
+
+    def stream_analyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        return self.llm.stream_analyze_images(image_paths, prompt, system, max_tokens)
+
+    def generate_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> str:
+        return self.llm.generate_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: dict,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        image_paths: Optional[list[Path | str]] = None,
+    ) -> Iterator[str]:
+        return self.llm.stream_structured(
+            prompt, schema, system, temperature, max_tokens, image_paths
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self.llm.agenerate(prompt, system, temperature, max_tokens)
+
+    async def aanalyze_image(
+        self,
+        image_path: Path | str,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> str:
+        return await self.aanalyze_images([image_path], prompt, system)
+
+    async def aanalyze_images(
+        self,
+        image_paths: list[Path | str],
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        return await self.llm.aanalyze_images(image_paths, prompt, system, max_tokens)
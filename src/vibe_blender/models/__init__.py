@@ -1,18 +1,26 @@
 """Data models for Vibe-Blender pipeline."""
 
 from .schemas import (
+      BatchJob,
+      BatchResult,
       ClarificationQuestion,
       ClarificationRequest,
       ClarificationResponse,
+      CodeEdit,
       CritiqueResult,
       CritiqueVerdict,
+      EditList,
       GeneratedScript,
       IterationRecord,
+      LLMUsage,
       PipelineState,
       PipelineStatus,
       RenderOutput,
+      RenderStats,
       SceneDescription,
+      SceneStats,
       UserPrompt,
+      summarize_llm_usage,
   )
 
 __all__ = [
@@ -21,11 +29,19 @@ __all__ = [
     "ClarificationResponse",
     "UserPrompt",
     "SceneDescription",
+    "SceneStats",
     "GeneratedScript",
+    "CodeEdit",
+    "EditList",
     "RenderOutput",
+    "RenderStats",
     "CritiqueResult",
     "PipelineState",
     "CritiqueVerdict",
     "IterationRecord",
     "PipelineStatus",
+    "LLMUsage",
+    "BatchJob",
+    "BatchResult",
+    "summarize_llm_usage",
 ]
@@ -132,6 +132,58 @@ class GeneratedScript(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class CodeEdit(BaseModel):
+    """A single search/replace edit proposed by the Generator during refinement."""
+
+    old_code: str = Field(..., description="Exact, unique substring of the current script")
+    new_code: str = Field(..., description="Replacement text (empty string to delete)")
+
+
+class EditList(BaseModel):
+    """Edits requested from the LLM in structured-output mode."""
+
+    edits: list[CodeEdit] = Field(..., description="Edits applied in order (at most 5)")
+
+
+class SceneStats(BaseModel):
+    """Geometry statistics collected in Blender before rendering."""
+
+    objects: int = Field(0, description="Total objects in the scene")
+    mesh_objects: int = Field(0, description="Objects with renderable geometry")
+    vertices: int = Field(0, description="Total vertices after modifiers")
+    faces: int = Field(0, description="Total faces after modifiers")
+    materials: int = Field(0, description="Distinct materials assigned to objects")
+    bounds_min: Optional[list[float]] = Field(None, description="World-space bounds minimum")
+    bounds_max: Optional[list[float]] = Field(None, description="World-space bounds maximum")
+    finite_bounds: bool = Field(True, description="False if any object had NaN/inf bounds")
+    skip_reason: Optional[str] = Field(None, description="Why rendering was skipped, if it was")
+
+
+class RenderStats(BaseModel):
+    """Timing and resource use reported by the render template (render_stats.json)."""
+
+    stages: dict[str, float] = Field(
+        default_factory=dict, description="Wall time in seconds per stage"
+    )
+    engine: Optional[str] = Field(None, description="Render engine actually used")
+    device: Optional[str] = Field(None, description="Render device actually used")
+    samples: Optional[int] = Field(None, description="Render samples")
+    peak_memory_mb: Optional[float] = Field(
+        None, description="Peak render memory reported by Blender"
+    )
+    peak_rss_mb: Optional[float] = Field(
+        None, description="Peak resident memory of the Blender process"
+    )
+    vertices: Optional[int] = Field(None, description="Evaluated vertex count")
+    faces: Optional[int] = Field(None, description="Evaluated face count")
+    blender_version: Optional[str] = Field(None, description="Blender version string")
+
+    @property
+    def total_seconds(self) -> float:
+        """Sum of all stage times."""
+        return sum(self.stages.values())
+
+
 class RenderOutput(BaseModel):
     """Paths to rendered output files."""
 
@@ -141,6 +193,8 @@ class RenderOutput(BaseModel):
     turntable_gif: Optional[Path] = Field(None, description="Path to turntable animation GIF")
     render_dir: Path = Field(..., description="Directory containing all renders")
     blender_error: Optional[str] = Field(None, description="Blender stderr if script had errors")
+    scene_stats: Optional[SceneStats] = Field(None, description="Pre-render geometry statistics")
+    render_stats: Optional[RenderStats] = Field(None, description="Per-stage timing from Blender")
 
 
 class CritiqueVerdict(str, Enum):
@@ -170,6 +224,55 @@ class PipelineStatus(str, Enum):
     MAX_RETRIES = "max_retries"
 
 
+class LLMUsage(BaseModel):
+    """Token use, latency and cost of a single LLM call."""
+
+    agent: str = Field(..., description="Calling agent: clarification, planner, generator, critic")
+    model: str = Field(..., description="Model that served the call")
+    prompt_tokens: int = Field(default=0, description="Input tokens, including images")
+    completion_tokens: int = Field(default=0, description="Output tokens")
+    image_tokens: int = Field(default=0, description="Estimated share of prompt_tokens for images")
+    latency_seconds: float = Field(default=0.0, description="Wall time including retries")
+    estimated: bool = Field(
+        default=False, description="Token counts estimated because the API reported none"
+    )
+    cost_usd: Optional[float] = Field(None, description="Cost at list price, if known")
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+
+def summarize_llm_usage(records: list[LLMUsage]) -> dict[str, dict]:
+    """Aggregate LLM usage records per agent.
+
+    Args:
+        records: Usage records
+
+    Returns:
+        Mapping of agent to call count, token totals, latency and cost
+    """
+    totals: dict[str, dict] = {}
+    for usage in records:
+        agent = totals.setdefault(
+            usage.agent,
+            {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "image_tokens": 0,
+                "latency_seconds": 0.0,
+                "cost_usd": 0.0,
+                "estimated_calls": 0,
+            },
+        )
+        agent["calls"] += 1
+        agent["prompt_tokens"] += usage.prompt_tokens
+        agent["completion_tokens"] += usage.completion_tokens
+        agent["image_tokens"] += usage.image_tokens
+        agent["latency_seconds"] += usage.latency_seconds
+        agent["cost_usd"] += usage.cost_usd or 0.0
+        agent["estimated_calls"] += usage.estimated
+    return totals
+
+
 class IterationRecord(BaseModel):
     """Record of a single iteration in the pipeline."""
 
@@ -178,6 +281,7 @@ class IterationRecord(BaseModel):
     render_output: Optional[RenderOutput] = None
     critique: Optional[CritiqueResult] = None
     error: Optional[str] = None
+    llm_usage: list[LLMUsage] = Field(default_factory=list)
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
@@ -190,8 +294,14 @@ class PipelineState(BaseModel):
     max_retries: int = Field(default=5)
     status: PipelineStatus = Field(default=PipelineStatus.RUNNING)
     iterations: list[IterationRecord] = Field(default_factory=list)
+    pending_iteration: Optional[IterationRecord] = Field(
+        None, description="Iteration in progress, checkpointed between its phases"
+    )
     final_output: Optional[RenderOutput] = None
     output_dir: Path
+    llm_usage: list[LLMUsage] = Field(
+        default_factory=list, description="Every LLM call of the run, including planning"
+    )
     started_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
 
@@ -207,6 +317,19 @@ class PipelineState(BaseModel):
                 return record.critique
         return None
 
+    def get_render_stage_totals(self) -> dict[str, float]:
+        """Sum render stage times across all iterations."""
+        totals: dict[str, float] = {}
+        for record in self.iterations:
+            if record.render_output and record.render_output.render_stats:
+                for stage, seconds in record.render_output.render_stats.stages.items():
+                    totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def get_llm_usage_totals(self) -> dict[str, dict]:
+        """Sum LLM tokens, latency and cost per agent across the run."""
+        return summarize_llm_usage(self.llm_usage)
+
     def get_feedback_history(self) -> list[str]:
         """Get all feedback from previous iterations."""
         return [
@@ -214,3 +337,34 @@ class PipelineState(BaseModel):
             for record in self.iterations
             if record.critique and record.critique.verdict == CritiqueVerdict.FAIL
         ]
+
+
+class BatchJob(BaseModel):
+    """One prompt of a batch run, read from a line of the prompts JSONL file."""
+
+    id: str = Field(..., description="Job name, also its output subdirectory")
+    prompt: str = Field(..., description="Text prompt of the model to generate")
+    references: list[Path] = Field(
+        default_factory=list, description="Reference image paths for style guidance"
+    )
+    max_retries: Optional[int] = Field(
+        None, ge=1, le=10, description="Override of pipeline.max_retries for this job"
+    )
+
+
+class BatchResult(BaseModel):
+    """Outcome of one batch job, written as a line of results.jsonl."""
+
+    id: str = Field(..., description="Job name")
+    prompt: str = Field(..., description="Text prompt of the job")
+    status: PipelineStatus = Field(..., description="Final pipeline status")
+    output_dir: Path = Field(..., description="The job's output directory")
+    iterations: int = Field(default=0, description="ReAct iterations run")
+    score: Optional[float] = Field(None, description="Score of the last critique")
+    grid_image: Optional[Path] = Field(None, description="Grid render of the final model")
+    blend_file: Optional[Path] = Field(None, description="Saved .blend of the final model")
+    error: Optional[str] = Field(None, description="Failure reason, if the job failed")
+    duration_seconds: float = Field(default=0.0, description="Wall time of the job")
+    llm_tokens: int = Field(default=0, description="Prompt plus completion tokens")
+    cost_usd: float = Field(default=0.0, description="LLM cost at list price, where known")
+    completed_at: datetime = Field(default_factory=datetime.now)
@@ -4,7 +4,9 @@ Implements the ReAct (Reasoning + Acting) loop that coordinates
 all agents and execution components.
 """
 
+import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable
@@ -12,11 +14,27 @@ from typing import Optional, Callable
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from .config import Config
-from .llm import create_llm, BaseLLM
+from .config import LLM_ROLES, Config
+from .llm import (
+    create_router,
+    BaseLLM,
+    CachedLLM,
+    LLMResponseCache,
+    LLMRouter,
+    LLMWrapper,
+    RateLimitedLLM,
+    ReplayLLM,
+    ResilientLLM,
+    UsageLLM,
+    UsageTracker,
+)
+from .llm.images import image_cache, preprocess_image
+from .llm.metrics import LLMMetrics
 from .agents import PlannerAgent, GeneratorAgent, CriticAgent
 from .execution import BlenderExecutor, Watchdog
 from .models import (
+    RenderOutput,
+    RenderStats,
     UserPrompt,
     PipelineState,
     PipelineStatus,
@@ -24,11 +42,34 @@ from .models import (
     CritiqueVerdict,
     ClarificationRequest,
     ClarificationResponse,
+    summarize_llm_usage,
 )
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Pipeline state saved in the output directory after every phase
+CHECKPOINT_FILE = "pipeline_state.json"
+
+
+def load_checkpoint(output_dir: Path | str) -> PipelineState:
+    """Load the pipeline state checkpointed in an output directory.
+
+    Args:
+        output_dir: Output directory of an earlier run
+
+    Returns:
+        The state as of the last finished phase
+
+    Raises:
+        FileNotFoundError: If the directory has no checkpoint
+        ValueError: If the checkpoint can't be parsed
+    """
+    path = Path(output_dir) / CHECKPOINT_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"No pipeline checkpoint in {output_dir}")
+    return PipelineState.model_validate_json(path.read_text())
+
 
 class Orchestrator:
     """Main pipeline orchestrator implementing the ReAct loop.
@@ -47,6 +88,7 @@ class Orchestrator:
         llm: Optional[BaseLLM] = None,
         on_iteration: Optional[Callable[[IterationRecord], None]] = None,
         interactive: bool = True,
+        executor: Optional[BlenderExecutor] = None,
     ):
         """Initialize the orchestrator.
 
@@ -55,36 +97,45 @@ class Orchestrator:
             llm: Optional LLM backend (created from config if not provided)
             on_iteration: Optional callback for iteration events
             interactive: Whether to enable interactive clarification prompts (default: True)
+            executor: Optional Blender executor, e.g. one shared by a batch of pipelines
+                (created from config if not provided)
         """
         self.config = config
         self.interactive = interactive
 
-        # Create LLM if not provided
+        # Create LLMs (default plus per-role overrides) if not provided
         if llm is None:
-            llm_config = config.llm
-            if llm_config.backend == "openai":
-                llm = create_llm(
-                    "openai",
-                    model=llm_config.openai.model,
-                    api_key=llm_config.openai.api_key,
-                )
-            else:
-                llm = create_llm(
-                    "ollama",
-                    base_url=llm_config.ollama.base_url,
-                    model=llm_config.ollama.model,
-                    vision_model=llm_config.ollama.vision_model,
-                )
+            llm = create_router(config.llm)
 
         self.llm = llm
 
+        # Optional response cache, applied only to the agents that opt in
+        self.llm_cache: Optional[LLMResponseCache] = None
+        if config.llm_cache.enabled:
+            self.llm_cache = LLMResponseCache(
+                config.llm_cache.dir,
+                max_size_mb=config.llm_cache.max_size_mb,
+                ttl_hours=config.llm_cache.ttl_hours,
+            )
+
+        # Token and cost accounting of every agent's calls
+        self.usage = UsageTracker(config.llm.prices)
+        self._usage_mark = 0
+
+        # Stream timing and parse fallbacks of this orchestrator's agents only
+        self.metrics = LLMMetrics()
+
         # Initialize agents
-        self.planner = PlannerAgent(llm)
-        self.generator = GeneratorAgent(llm)
-        self.critic = CriticAgent(llm)
+        self.planner = PlannerAgent(
+            self._agent_llm("planner", llm),
+            clarification_llm=self._agent_llm("clarification", llm),
+            metrics=self.metrics,
+        )
+        self.generator = GeneratorAgent(self._agent_llm("generator", llm), metrics=self.metrics)
+        self.critic = CriticAgent(self._agent_llm("critic", llm), metrics=self.metrics)
 
         # Initialize execution components
-        self.executor = BlenderExecutor(config)
+        self.executor = executor or BlenderExecutor(config)
         self.watchdog = Watchdog(config.pipeline.max_retries)
 
         # Callbacks
@@ -93,6 +144,16 @@ class Orchestrator:
             Callable[[ClarificationRequest], Optional[ClarificationResponse]]
         ] = None
 
+    def _agent_llm(self, role: str, llm: BaseLLM) -> BaseLLM:
+        """Return the LLM a role should use: routed, and cached if the role opted in."""
+        if isinstance(llm, LLMRouter):
+            llm = llm.for_role(role)
+        # Inside the cache, so cache hits don't count as spend
+        llm = UsageLLM(llm, self.usage, agent=role)
+        if self.llm_cache and role in self.config.llm_cache.agents:
+            return CachedLLM(llm, self.llm_cache, name=role)
+        return llm
+
     def run(
         self,
         prompt: str,
@@ -121,6 +182,11 @@ class Orchestrator:
         logger.info(f"Interactive mode: {self.interactive}")
         logger.info(f"Reference images: {len(reference_images) if reference_images else 0}")
 
+        # Boot warm Blender workers while the LLM phases run
+        self.executor.warm_up()
+        self._usage_mark = self.usage.mark()
+        self.metrics.clear()
+
         try:
             # Create initial user prompt
             user_prompt = UserPrompt(text=prompt)
@@ -136,6 +202,11 @@ class Orchestrator:
                         logger.error(error)
                     raise ValueError(f"Reference image validation failed: {errors[0]}")
 
+                if self.config.pipeline.preprocess_references:
+                    user_prompt.reference_images = self._prepare_references(
+                        user_prompt.reference_images, output_dir / "references"
+                    )
+
             # Phase 0: Clarification check (considers both text AND reference images)
             if self.interactive:
                 console.print("[bold blue]Phase 0: Analyzing prompt clarity...[/bold blue]")
@@ -152,31 +223,193 @@ class Orchestrator:
                 max_retries=self.config.pipeline.max_retries,
                 output_dir=output_dir,
             )
+            self._checkpoint(state)
+
+            self._plan_and_loop(state)
+
+        except Exception as e:
+            logger.exception(f"Pipeline failed: {e}")
+            self.watchdog.update_state_for_failure(state, str(e))
+
+        return self._finish(state)
+
+    def resume(self, output_dir: Path, max_retries: Optional[int] = None) -> PipelineState:
+        """Continue a run from the checkpoint in its output directory.
+
+        Finished iterations are kept, and an iteration interrupted after
+        Blender ran reuses its renders instead of executing the script
+        again. Runs that failed are retried from where they stopped.
+
+        Args:
+            output_dir: Output directory of the earlier run
+            max_retries: New iteration limit (default: the run's own limit)
+
+        Returns:
+            Final PipelineState with results
+
+        Raises:
+            FileNotFoundError: If the directory has no checkpoint
+            ValueError: If the checkpoint can't be parsed
+        """
+        state = load_checkpoint(output_dir)
+        state.output_dir = Path(output_dir)
+        if max_retries:
+            state.max_retries = max_retries
+        self.watchdog = Watchdog(state.max_retries)
+
+        if state.status == PipelineStatus.SUCCESS or (
+            state.status == PipelineStatus.MAX_RETRIES
+            and state.current_iteration >= state.max_retries
+        ):
+            logger.info(f"Run in {output_dir} already finished: {state.status.value}")
+            return state
+
+        logger.info(
+            f"Resuming pipeline in {output_dir} after iteration {state.current_iteration} "
+            f"(status: {state.status.value})"
+        )
+        state.status = PipelineStatus.RUNNING
+        state.completed_at = None
+
+        self.executor.warm_up()
+        self.metrics.clear()
+        # Earlier calls stay part of the run's usage
+        self._usage_mark = self.usage.mark()
+        self.usage.restore(state.llm_usage)
+
+        try:
+            if self.watchdog.check_completion(state):
+                # Stopped between the passing critique and the final render
+                self.watchdog.update_state_for_success(state, finalize=self._final_render)
+            else:
+                self._plan_and_loop(state)
+        except Exception as e:
+            logger.exception(f"Pipeline failed: {e}")
+            self.watchdog.update_state_for_failure(state, str(e))
+
+        return self._finish(state)
 
+    def _plan_and_loop(self, state: PipelineState) -> None:
+        """Plan the scene unless already planned, then run the ReAct loop.
+
+        Args:
+            state: Pipeline state to update
+        """
+        if state.scene_description is None:
             # Phase 1: Planning
             console.print("[bold blue]Phase 1: Planning scene...[/bold blue]")
             logger.info("Phase 1: Planning scene...")
             state.scene_description = self.planner.plan(
-                user_prompt.text,
-                user_prompt.clarifications,
-                user_prompt.reference_images,
+                state.user_prompt.text,
+                state.user_prompt.clarifications,
+                state.user_prompt.reference_images,
             )
             logger.info(f"Scene planned: {state.scene_description.summary}")
+            self._checkpoint(state)
 
-            # Phase 2: ReAct Loop
-            console.print("[bold blue]Phase 2: Generation loop...[/bold blue]")
-            logger.info("Phase 2: Generation loop...")
-            self._run_react_loop(state)
+        # Phase 2: ReAct Loop
+        console.print("[bold blue]Phase 2: Generation loop...[/bold blue]")
+        logger.info("Phase 2: Generation loop...")
+        self._run_react_loop(state)
 
-        except Exception as e:
-            logger.exception(f"Pipeline failed: {e}")
-            self.watchdog.update_state_for_failure(state, str(e))
+    def _finish(self, state: PipelineState) -> PipelineState:
+        """Save the final state and usage report, and log the outcome.
+
+        Args:
+            state: Final pipeline state
+
+        Returns:
+            The same state
+        """
+        self._checkpoint(state)
+        self._write_usage_report(state)
 
         # Log final status
         self._log_completion(state)
 
         return state
 
+    def _checkpoint(self, state: PipelineState) -> None:
+        """Atomically save the pipeline state to the output directory.
+
+        The state is written to a temporary file and renamed over the
+        checkpoint, so a crash leaves either the old or the new state.
+
+        Args:
+            state: Pipeline state to save
+        """
+        state.llm_usage = self.usage.since(self._usage_mark)
+        path = state.output_dir / CHECKPOINT_FILE
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(state.model_dump_json(indent=2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save pipeline checkpoint: {e}")
+
+    def _role_backends(self) -> list[BaseLLM]:
+        """Return the distinct backends the agents' roles are routed to."""
+        if not isinstance(self.llm, LLMRouter):
+            return [self.llm]
+        unique: dict[int, BaseLLM] = {}
+        for role in sorted(LLM_ROLES):
+            llm = self.llm.for_role(role)
+            unique.setdefault(id(llm), llm)
+        return list(unique.values())
+
+    def _prepare_references(self, reference_images: list[Path], out_dir: Path) -> list[Path]:
+        """Resize and re-encode reference images for the LLM backends.
+
+        Args:
+            reference_images: Validated reference image paths
+            out_dir: Directory for the converted images
+
+        Returns:
+            Paths of the converted images (originals if conversion fails)
+        """
+        # Every role sees the references: fit the smallest backend's limit and
+        # count tokens for the most expensive one
+        receivers = self._role_backends()
+        max_size = (
+            min(llm.max_image_size[0] for llm in receivers),
+            min(llm.max_image_size[1] for llm in receivers),
+        )
+
+        prepared_paths = []
+        total_tokens = 0
+        for path in reference_images:
+            try:
+                prepared = preprocess_image(
+                    path,
+                    out_dir,
+                    max_size,
+                    fmt=self.config.pipeline.reference_format,
+                    quality=self.config.pipeline.reference_quality,
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not preprocess {path.name}, sending original: {e}")
+                prepared_paths.append(path)
+                continue
+
+            prepared.estimated_tokens = max(
+                llm.estimate_image_tokens(*prepared.size) for llm in receivers
+            )
+            total_tokens += prepared.estimated_tokens
+            logger.info(
+                f"Reference {path.name}: "
+                f"{prepared.original_size[0]}x{prepared.original_size[1]} -> "
+                f"{prepared.size[0]}x{prepared.size[1]}, "
+                f"{prepared.original_bytes / 1024:.0f} KB -> {prepared.bytes / 1024:.0f} KB, "
+                f"~{prepared.estimated_tokens} tokens per call"
+            )
+            prepared_paths.append(prepared.path)
+
+        logger.info(f"Reference images: ~{total_tokens} tokens per vision call")
+        return prepared_paths
+
     def _clarification_phase(
         self,
         prompt: str,
@@ -223,42 +456,64 @@ class Orchestrator:
         Args:
             state: Pipeline state to update
         """
-        feedback = None
+        # Feedback for the next iteration follows from the last finished one
+        feedback = self._feedback_for(state.iterations[-1]) if state.iterations else None
 
         while self.watchdog.can_continue(state):
-            iteration = state.current_iteration + 1
+            # An iteration interrupted between phases continues where it stopped
+            record = state.pending_iteration or IterationRecord(
+                iteration=state.current_iteration + 1, script=None
+            )
+            state.pending_iteration = record
+            iteration = record.iteration
             console.print(f"\n[cyan]Iteration {iteration}/{state.max_retries}[/cyan]")
             logger.info(f"=== Iteration {iteration}/{state.max_retries} ===")
 
-            record = IterationRecord(iteration=iteration, script=None)
+            prior_usage = record.llm_usage
+            usage_mark = self.usage.mark()
 
             try:
-                # Generate script
-                console.print("  Generating Blender script...")
-                logger.info("Generating Blender script...")
-                if feedback:
-                    script = self.generator.refine(
-                        original_script=state.iterations[-1].script,
-                        scene_description=state.scene_description,
-                        feedback=feedback,
-                        iteration=iteration,
-                        reference_images=state.user_prompt.reference_images,
-                    )
+                if record.script is None:
+                    # Generate script
+                    console.print("  Generating Blender script...")
+                    logger.info("Generating Blender script...")
+                    if feedback:
+                        script = self.generator.refine(
+                            original_script=state.iterations[-1].script,
+                            scene_description=state.scene_description,
+                            feedback=feedback,
+                            iteration=iteration,
+                            reference_images=state.user_prompt.reference_images,
+                        )
+                    else:
+                        script = self.generator.generate(
+                            scene_description=state.scene_description,
+                            iteration=iteration,
+                            reference_images=state.user_prompt.reference_images,
+                        )
+                    record.script = script
+                    logger.info("Script generated successfully")
+                    record.llm_usage = prior_usage + self.usage.since(usage_mark)
+                    self._checkpoint(state)
                 else:
-                    script = self.generator.generate(
-                        scene_description=state.scene_description,
-                        iteration=iteration,
-                        reference_images=state.user_prompt.reference_images,
-                    )
-                record.script = script
-                logger.info("Script generated successfully")
+                    script = record.script
+                    logger.info("Reusing script from checkpoint")
 
-                # Execute script
-                console.print("  Executing in Blender...")
-                logger.info("Executing in Blender...")
-                render_output = self.executor.execute(script, state.output_dir)
-                record.render_output = render_output
-                logger.info(f"Blender execution complete. Grid: {render_output.grid_image is not None}, Error: {render_output.blender_error is not None}")
+                if record.render_output and self._renders_exist(record.render_output):
+                    render_output = record.render_output
+                    console.print("  Reusing renders from checkpoint...")
+                    logger.info(f"Reusing renders of iteration {iteration} from checkpoint")
+                else:
+                    # Execute script
+                    console.print("  Executing in Blender...")
+                    logger.info("Executing in Blender...")
+                    render_output = self.executor.execute(script, state.output_dir)
+                    record.render_output = render_output
+                    logger.info(f"Blender execution complete. Grid: {render_output.grid_image is not None}, Error: {render_output.blender_error is not None}")
+                    if render_output.render_stats:
+                        self._log_render_stats(render_output.render_stats)
+                    record.llm_usage = prior_usage + self.usage.since(usage_mark)
+                    self._checkpoint(state)
 
                 # Critique output
                 console.print("  Analyzing output...")
@@ -284,26 +539,17 @@ class Orchestrator:
                     console.print(f"  Feedback: {critique.feedback[:100]}...")
                     logger.info(f"Feedback: {critique.feedback[:200]}...")
 
-                    # Merge feedback, issues, and suggestions into comprehensive feedback
-                    feedback_parts = [critique.feedback]
-
-                    if critique.issues:
-                        issues_text = "\n".join(f"  - {issue}" for issue in critique.issues)
-                        feedback_parts.append(f"\nKey Issues:\n{issues_text}")
-
-                    if critique.suggestions:
-                        suggestions_text = "\n".join(f"  - {suggestion}" for suggestion in critique.suggestions)
-                        feedback_parts.append(f"\nSuggestions:\n{suggestions_text}")
-
-                    feedback = "\n".join(feedback_parts)
-
             except Exception as e:
                 logger.error(f"Iteration {iteration} failed: {e}")
                 record.error = str(e)
-                feedback = f"Error in previous iteration: {e}"
+
+            feedback = self._feedback_for(record)
 
             # Record iteration
+            record.llm_usage = prior_usage + self.usage.since(usage_mark)
+            state.pending_iteration = None
             state.add_iteration(record)
+            self._checkpoint(state)
 
             # Callback
             if self.on_iteration:
@@ -313,7 +559,7 @@ class Orchestrator:
             if self.watchdog.check_completion(state):
                 console.print("[bold green]Success![/bold green]")
                 logger.info("SUCCESS - Model passed critique!")
-                self.watchdog.update_state_for_success(state)
+                self.watchdog.update_state_for_success(state, finalize=self._final_render)
                 return
 
             # Check for early stop conditions
@@ -327,7 +573,115 @@ class Orchestrator:
         # Max retries reached
         console.print("[yellow]Max retries reached[/yellow]")
         logger.warning("Max retries reached")
-        self.watchdog.update_state_for_max_retries(state)
+        self.watchdog.update_state_for_max_retries(state, finalize=self._final_render)
+
+    @staticmethod
+    def _feedback_for(record: IterationRecord) -> Optional[str]:
+        """Build the generator feedback from a finished iteration.
+
+        Args:
+            record: The iteration to learn from
+
+        Returns:
+            The error, or the critique's feedback, issues and suggestions
+            merged together; None if the iteration passed
+        """
+        if record.error:
+            return f"Error in previous iteration: {record.error}"
+
+        critique = record.critique
+        if critique is None or critique.verdict != CritiqueVerdict.FAIL:
+            return None
+
+        # Merge feedback, issues, and suggestions into comprehensive feedback
+        feedback_parts = [critique.feedback]
+
+        if critique.issues:
+            issues_text = "\n".join(f"  - {issue}" for issue in critique.issues)
+            feedback_parts.append(f"\nKey Issues:\n{issues_text}")
+
+        if critique.suggestions:
+            suggestions_text = "\n".join(f"  - {suggestion}" for suggestion in critique.suggestions)
+            feedback_parts.append(f"\nSuggestions:\n{suggestions_text}")
+
+        return "\n".join(feedback_parts)
+
+    @staticmethod
+    def _renders_exist(render_output: RenderOutput) -> bool:
+        """Whether a checkpointed execution result can be reused as is.
+
+        Script errors are reused (the script would fail again); successful
+        runs only if their grid image is still on disk.
+        """
+        if render_output.blender_error:
+            return True
+        return render_output.grid_image is not None and render_output.grid_image.exists()
+
+    def _final_render(self, render_output: RenderOutput) -> RenderOutput:
+        """Re-render the chosen iteration at final quality if previews were used.
+
+        Args:
+            render_output: Output of the chosen iteration
+
+        Returns:
+            Final-quality output, or the original output if no re-render is needed
+            or the re-render fails
+        """
+        if self.config.pipeline.preview_quality is None:
+            return render_output
+
+        console.print("  Rendering final quality...")
+        logger.info("Re-rendering chosen iteration at final quality...")
+        try:
+            final = self.executor.rerender(render_output, self.config.pipeline.final_quality)
+        except Exception as e:
+            logger.warning(f"Final-quality render failed, keeping preview renders: {e}")
+            return render_output
+
+        if final.blender_error or final.grid_image is None:
+            logger.warning("Final-quality render produced no images, keeping preview renders")
+            return render_output
+        return final
+
+    def _log_render_stats(self, stats: RenderStats) -> None:
+        """Log where Blender spent its time in one execution.
+
+        Args:
+            stats: Render stats reported by the render template
+        """
+        stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in stats.stages.items())
+        logger.info(
+            f"Render stats: {stats.engine} on {stats.device}, {stats.samples} samples, "
+            f"{stats.faces} faces, peak {stats.peak_memory_mb or stats.peak_rss_mb or 0:.0f} MB"
+        )
+        logger.info(f"Render stages ({stats.total_seconds:.2f}s): {stages}")
+
+    def _write_usage_report(self, state: PipelineState) -> None:
+        """Write LLM token use and cost of the run, by agent and iteration, to llm_usage.json.
+
+        Args:
+            state: Pipeline state with its usage records
+        """
+        by_agent = state.get_llm_usage_totals()
+        total: dict[str, float] = {}
+        for totals in by_agent.values():
+            for key, value in totals.items():
+                total[key] = total.get(key, 0) + value
+
+        report = {
+            "total": total,
+            "by_agent": by_agent,
+            "by_iteration": {
+                str(record.iteration): summarize_llm_usage(record.llm_usage)
+                for record in state.iterations
+            },
+            "calls": [usage.model_dump(mode="json") for usage in state.llm_usage],
+        }
+        path = state.output_dir / "llm_usage.json"
+        try:
+            path.write_text(json.dumps(report, indent=2))
+        except OSError as e:
+            logger.warning(f"Could not write LLM usage report: {e}")
 
     def _log_completion(self, state: PipelineState) -> None:
         """Log pipeline completion status.
@@ -349,6 +703,89 @@ class Orchestrator:
         logger.info(f"Iterations: {state.current_iteration}")
         logger.info(f"Duration: {duration.total_seconds():.1f}s")
 
+        stage_totals = state.get_render_stage_totals()
+        if stage_totals:
+            slowest = sorted(stage_totals.items(), key=lambda item: item[1], reverse=True)
+            logger.info(
+                "Render time by stage: "
+                + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest)
+            )
+
+        if self.executor.cache:
+            stats = self.executor.cache.stats()
+            console.print(
+                f"Execution cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['size_mb']:.0f} MB)"
+            )
+            logger.info(f"Execution cache stats: {stats}")
+
+        if self.llm_cache:
+            stats = self.llm_cache.stats()
+            console.print(
+                f"LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%} hit rate)"
+            )
+            role_llms = (
+                self.planner.clarification_llm,
+                self.planner.llm,
+                self.generator.llm,
+                self.critic.llm,
+            )
+            for role_llm in role_llms:
+                if isinstance(role_llm, CachedLLM):
+                    logger.info(f"LLM cache stats ({role_llm.name}): {role_llm.stats()}")
+            logger.info(f"LLM cache stats: {stats}")
+
+        logger.info(f"Image payload cache stats: {image_cache.stats()}")
+
+        for label, stats in self.metrics.summary().items():
+            ttft = stats["mean_first_token_seconds"]
+            logger.info(
+                f"LLM {label}: {stats['calls']} calls, "
+                f"first token {ttft or 0:.2f}s avg, {stats['mean_seconds']:.2f}s avg, "
+                f"{stats['stopped_early']} stopped after answer"
+            )
+        if self.metrics.counters:
+            logger.info(f"LLM parse fallbacks: {self.metrics.counters}")
+
+        usage_totals = state.get_llm_usage_totals()
+        if usage_totals:
+            tokens = sum(t["prompt_tokens"] + t["completion_tokens"] for t in usage_totals.values())
+            cost = sum(t["cost_usd"] for t in usage_totals.values())
+            console.print(f"LLM usage: {tokens} tokens (${cost:.2f})")
+            for agent, totals in usage_totals.items():
+                logger.info(
+                    f"LLM usage ({agent}): {totals['calls']} calls, "
+                    f"{totals['prompt_tokens']} prompt ({totals['image_tokens']} image) + "
+                    f"{totals['completion_tokens']} completion tokens, "
+                    f"{totals['latency_seconds']:.1f}s, ${totals['cost_usd']:.4f}"
+                )
+
+        backends = self.llm.backends if isinstance(self.llm, LLMRouter) else [self.llm]
+        for backend in backends:
+            inner = backend.backend if isinstance(backend, LLMWrapper) else backend
+            if isinstance(inner, ReplayLLM):
+                logger.info(f"LLM replay stats ({inner.path}): {inner.stats()}")
+            if isinstance(backend, ResilientLLM):
+                stats = backend.stats()
+                if stats["retries"] or stats["failures"]:
+                    console.print(
+                        f"LLM retries ({backend.model}): {stats['retries']} retries, "
+                        f"{stats['backoff_seconds']:.1f}s in backoff, "
+                        f"{stats['failures']} failed calls"
+                    )
+                logger.info(f"LLM resilience stats ({backend.model}): {stats}")
+                backend = backend.llm
+            if isinstance(backend, RateLimitedLLM):
+                stats = backend.stats()
+                if stats["waited"]:
+                    console.print(
+                        f"LLM rate limit ({backend.limiter.name}): {stats['waited']} calls "
+                        f"waited {stats['wait_seconds']:.1f}s, "
+                        f"max queue depth {stats['max_queue_depth']}"
+                    )
+                logger.info(f"LLM rate limiter stats ({backend.limiter.name}): {stats}")
+
         if state.final_output:
             console.print(f"\nOutput directory: {state.output_dir}")
             logger.info(f"Output directory: {state.output_dir}")
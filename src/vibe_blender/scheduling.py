@@ -0,0 +1,251 @@
+"""Scheduling of concurrent pipelines over the LLM and Blender resource pools.
+
+Each pipeline alternates between waiting on the LLM (planning, generation,
+critique) and running Blender. The two are separate resources with their
+own limits: a ResourcePool for each caps how many calls or executions run
+at once and accounts for how busy it was. The PipelineScheduler decides how
+many pipelines to keep in flight, so that while some jobs wait on the
+network, others keep the Blender slots filled.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResourcePool:
+    """Slots for one kind of work, handed out in FIFO order.
+
+    Tracks slot-seconds in use, so that utilization (busy share of the
+    capacity over the pool's lifetime) and time spent queueing can be
+    reported. Usable as a context manager, like a semaphore.
+    """
+
+    def __init__(self, name: str, capacity: Optional[int] = None):
+        """Initialize the pool.
+
+        Args:
+            name: Label for logs and stats
+            capacity: Slots (None = unlimited; usage is still accounted)
+        """
+        self.name = name
+        self.capacity = capacity
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+        self.in_use = 0
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_waiting = 0
+        self._busy_seconds = 0.0
+        self._started = time.monotonic()
+        self._updated = self._started
+
+    @property
+    def waiting(self) -> int:
+        """Callers queued for a slot."""
+        return self._next_ticket - self._serving
+
+    @property
+    def saturated(self) -> bool:
+        """Whether all slots are taken or already promised to queued callers."""
+        if self.capacity is None:
+            return False
+        with self._cond:
+            return self.in_use + self.waiting >= self.capacity
+
+    def acquire(self) -> float:
+        """Block until a slot is free, then take it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            while ticket != self._serving or (
+                self.capacity is not None and self.in_use >= self.capacity
+            ):
+                self._cond.wait()
+            self._serving += 1
+            self._advance()
+            self.in_use += 1
+            self.acquired += 1
+            waited = time.monotonic() - started
+            if waited > 0.01:
+                self.waited += 1
+                self.wait_seconds += waited
+            # The next ticket may be servable too
+            self._cond.notify_all()
+        return waited
+
+    def release(self) -> None:
+        """Return a slot."""
+        with self._cond:
+            self._advance()
+            self.in_use -= 1
+            self._cond.notify_all()
+
+    def __enter__(self) -> "ResourcePool":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def stats(self) -> dict:
+        """Return utilization, slot usage and queueing since the pool was created."""
+        with self._cond:
+            self._advance()
+            elapsed = max(self._updated - self._started, 1e-9)
+            return {
+                "capacity": self.capacity,
+                "acquired": self.acquired,
+                "busy_seconds": round(self._busy_seconds, 2),
+                "mean_in_use": round(self._busy_seconds / elapsed, 2),
+                "utilization": round(self._busy_seconds / (elapsed * self.capacity), 3)
+                if self.capacity
+                else None,
+                "waited": self.waited,
+                "wait_seconds": round(self.wait_seconds, 2),
+                "mean_wait_seconds": round(self.wait_seconds / self.acquired, 3)
+                if self.acquired
+                else 0.0,
+                "max_waiting": self.max_waiting,
+            }
+
+    def _advance(self) -> None:
+        """Add the slot-seconds used since the last change (caller holds the lock)."""
+        now = time.monotonic()
+        self._busy_seconds += self.in_use * (now - self._updated)
+        self._updated = now
+
+
+class PipelineScheduler:
+    """Runs jobs on their own threads, admitting new ones while the pools have headroom.
+
+    At least ``min_jobs`` (by default one per Blender slot) run at once. Up
+    to ``max_jobs`` run while neither pool is saturated: if Blender slots
+    are idle and the LLM has capacity to spare, another job creates more
+    Blender work; once either pool has a queue, more jobs would only wait
+    in it. Jobs are admitted one per ``poll_interval`` beyond the minimum,
+    so that newly started jobs show up as demand before the next decision.
+    """
+
+    def __init__(
+        self,
+        blender: ResourcePool,
+        llm: ResourcePool,
+        max_jobs: int,
+        min_jobs: Optional[int] = None,
+        poll_interval: float = 0.5,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            blender: Pool of Blender execution slots
+            llm: Pool of in-flight LLM call slots
+            max_jobs: Jobs run at once, at most
+            min_jobs: Jobs run at once regardless of pool load
+                (default: Blender capacity, or max_jobs if unlimited)
+            poll_interval: Seconds between admission decisions
+        """
+        self.blender = blender
+        self.llm = llm
+        self.max_jobs = max(1, max_jobs)
+        if min_jobs is None:
+            min_jobs = blender.capacity or self.max_jobs
+        self.min_jobs = max(1, min(min_jobs, self.max_jobs))
+        self.poll_interval = poll_interval
+
+        self.remaining = 0
+        self.max_active = 0
+        self._active: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._job_seconds = 0.0
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def run(self, items: Iterable[T], fn: Callable[[T], None]) -> None:
+        """Call fn on every item, each on its own thread, until done or stopped.
+
+        Exceptions raised by fn are logged and don't stop the other jobs.
+
+        Args:
+            items: Jobs in the order they should start
+            fn: Job body
+        """
+        pending = list(items)
+        self.remaining = len(pending)
+        self._started = time.monotonic()
+        try:
+            while pending and not self._stop.is_set():
+                self._active = [thread for thread in self._active if thread.is_alive()]
+                admitted = 0
+                while pending and self._can_admit(admitted):
+                    self._start(fn, pending.pop(0))
+                    admitted += 1
+                self.remaining = len(pending)
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+            self.join()
+        finally:
+            self._finished = time.monotonic()
+
+    def stop(self) -> None:
+        """Stop admitting jobs; running jobs finish."""
+        self._stop.set()
+        self._wake.set()
+
+    def join(self) -> None:
+        """Wait for running jobs (interruptible by KeyboardInterrupt)."""
+        for thread in list(self._active):
+            while thread.is_alive():
+                thread.join(0.5)
+
+    def stats(self) -> dict:
+        """Return per-pool utilization and job concurrency of the last run()."""
+        elapsed = (self._finished or time.monotonic()) - (self._started or time.monotonic())
+        return {
+            "blender": self.blender.stats(),
+            "llm": self.llm.stats(),
+            "max_active_jobs": self.max_active,
+            "mean_active_jobs": round(self._job_seconds / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def _can_admit(self, admitted: int) -> bool:
+        active = len(self._active)
+        if active < self.min_jobs:
+            return True
+        if active >= self.max_jobs or admitted:
+            return False
+        return not (self.blender.saturated or self.llm.saturated)
+
+    def _start(self, fn: Callable[[T], None], item: T) -> None:
+        def job() -> None:
+            started = time.monotonic()
+            try:
+                fn(item)
+            except Exception as e:
+                logger.exception(f"Scheduled job failed: {e}")
+            finally:
+                with self._lock:
+                    self._job_seconds += time.monotonic() - started
+                self._wake.set()
+
+        # Daemon threads, so that an aborted run doesn't wait for them at exit
+        thread = threading.Thread(target=job, daemon=True)
+        self._active.append(thread)
+        self.max_active = max(self.max_active, len(self._active))
+        thread.start()
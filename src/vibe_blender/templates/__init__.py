@@ -1,5 +1,5 @@
 """Blender script templates."""
 
-from .render_views import RENDER_TEMPLATE
+from .render_views import RENDER_STATS_HEADER, RENDER_TEMPLATE, RENDER_TEMPLATE_VERSION
 
-__all__ = ["RENDER_TEMPLATE"]
+__all__ = ["RENDER_STATS_HEADER", "RENDER_TEMPLATE", "RENDER_TEMPLATE_VERSION"]
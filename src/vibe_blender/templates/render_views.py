@@ -1,9 +1,50 @@
 """Blender rendering template for multi-view output.
 
 This code is injected into generated scripts to handle rendering.
-Variables OUTPUT_DIR and RENDER_RESOLUTION must be defined before this code.
+Variables OUTPUT_DIR and RENDER_RESOLUTION must be defined before this code;
+TURNTABLE_FRAMES, TURNTABLE_ANGLE_STEP (degrees) and the quality settings
+RENDER_ENGINE, RENDER_SAMPLES and RENDER_DENOISE are optional.
+
+RENDER_MODE selects what runs: "full" (default) renders everything in this
+process, "prepare" saves the lit, camera-rigged scene to SCENE_BLEND_PATH for
+sharded rendering, and "shard" renders SHARD_VIEWS and SHARD_FRAME_RANGE
+from such a scene using RENDER_THREADS threads.
+
+Before rendering, scene statistics are written to OUTPUT_DIR/scene_stats.json
+and rendering is skipped if the scene is empty, has non-finite bounds or
+exceeds the optional MAX_POLY_COUNT face budget.
+
+Wall time per stage, the engine, device and sample count actually used,
+peak memory and poly counts are written to OUTPUT_DIR/render_stats.json
+(render_stats_shard_NN.json for shard SHARD_INDEX). RENDER_STATS_HEADER is
+injected before the generated code so its run time and .blend saves are
+measured too.
 """
 
+# Bump whenever RENDER_TEMPLATE changes in a way that affects rendered output;
+# it is part of the execution cache key.
+RENDER_TEMPLATE_VERSION = "6"
+
+RENDER_STATS_HEADER = '''
+# Time the generated code and its .blend saves for render_stats.json
+import time as _render_stats_time
+_RENDER_STATS_SAVE = {'start': None, 'total': 0.0}
+
+def _render_stats_save_pre(*args):
+    _RENDER_STATS_SAVE['start'] = _render_stats_time.perf_counter()
+
+def _render_stats_save_post(*args):
+    if _RENDER_STATS_SAVE['start'] is not None:
+        _RENDER_STATS_SAVE['total'] += (
+            _render_stats_time.perf_counter() - _RENDER_STATS_SAVE['start']
+        )
+        _RENDER_STATS_SAVE['start'] = None
+
+bpy.app.handlers.save_pre.append(_render_stats_save_pre)
+bpy.app.handlers.save_post.append(_render_stats_save_post)
+USER_CODE_START_TIME = _render_stats_time.perf_counter()
+'''
+
 RENDER_TEMPLATE = '''
 # ============================================
 # RENDERING SETUP (Auto-injected by Vibe-Blender)
@@ -12,6 +53,83 @@ RENDER_TEMPLATE = '''
 import bpy
 import math
 import os
+import re
+import time
+from contextlib import contextmanager
+
+RENDER_STATS = {'stages': {}, 'peak_memory_mb': None}
+
+@contextmanager
+def timed_stage(name):
+    """Record the wall time of a block under RENDER_STATS['stages'][name]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        RENDER_STATS['stages'][name] = round(time.perf_counter() - start, 4)
+
+def record_render_memory(stats_line, *args):
+    """render_stats handler: track the peak memory Blender reports while rendering."""
+    match = re.search(r"Peak[: ]\\s*([\\d.]+)([KMG])", str(stats_line))
+    if match:
+        scale = {'K': 1.0 / 1024, 'M': 1.0, 'G': 1024.0}[match.group(2)]
+        peak = float(match.group(1)) * scale
+        RENDER_STATS['peak_memory_mb'] = max(RENDER_STATS['peak_memory_mb'] or 0.0, peak)
+
+def render_device():
+    """Device the active render engine actually uses."""
+    scene = bpy.context.scene
+    if scene.render.engine != 'CYCLES':
+        return 'GPU'
+    if scene.cycles.device != 'GPU':
+        return 'CPU'
+    try:
+        compute = bpy.context.preferences.addons['cycles'].preferences.compute_device_type
+    except (KeyError, AttributeError):
+        compute = 'NONE'
+    # Cycles silently falls back to the CPU when no GPU backend is configured
+    return 'CPU' if compute == 'NONE' else f'GPU ({compute})'
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unavailable)."""
+    import sys
+    try:
+        import resource
+    except ImportError:
+        # No resource module on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+def write_render_stats(output_dir, filename="render_stats.json", scene_stats=None):
+    """Write RENDER_STATS plus engine, device, samples and memory for the executor."""
+    import json
+
+    scene = bpy.context.scene
+    engine = scene.render.engine
+    if engine == 'CYCLES':
+        samples = scene.cycles.samples
+    elif engine in EEVEE_ENGINE_NAMES:
+        samples = scene.eevee.taa_render_samples
+    else:
+        samples = None
+
+    stats = dict(RENDER_STATS)
+    stats.update({
+        'engine': engine,
+        'device': render_device(),
+        'samples': samples,
+        'peak_rss_mb': peak_rss_mb(),
+        'blender_version': bpy.app.version_string,
+    })
+    if scene_stats:
+        stats['vertices'] = scene_stats['vertices']
+        stats['faces'] = scene_stats['faces']
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, filename), "w") as f:
+        json.dump(stats, f, indent=2)
 
 def setup_camera(name, location, rotation, ortho=True, ortho_scale=5):
     """Create and configure a camera."""
@@ -79,13 +197,13 @@ def create_grid_image(image_paths, output_path, resolution):
     except ImportError:
         return False
 
-def render_turntable(camera, output_dir, frames=36, resolution=(512, 512)):
-    """Render a turntable animation."""
-    scene = bpy.context.scene
-    scene.camera = camera
-    scene.render.resolution_x = resolution[0]
-    scene.render.resolution_y = resolution[1]
-    scene.render.image_settings.file_format = 'PNG'
+def setup_turntable(camera, frames=12, angle_step=None):
+    """Parent the camera to a pivot keyframed once per turntable frame.
+
+    One keyframe per frame keeps every angle exact regardless of interpolation.
+    """
+    if angle_step is None:
+        angle_step = 360.0 / frames
 
     # Create empty at origin to rotate around
     bpy.ops.object.empty_add(location=(0, 0, 0))
@@ -95,18 +213,41 @@ def render_turntable(camera, output_dir, frames=36, resolution=(512, 512)):
     # Parent camera to pivot
     camera.parent = pivot
 
-    frame_paths = []
     for i in range(frames):
-        angle = (2 * math.pi * i) / frames
-        pivot.rotation_euler = (0, 0, angle)
-        bpy.context.view_layer.update()
+        pivot.rotation_euler = (0, 0, math.radians(angle_step * i))
+        pivot.keyframe_insert(data_path="rotation_euler", index=2, frame=i)
 
-        filepath = os.path.join(output_dir, f"turntable_{i:03d}.png")
-        scene.render.filepath = filepath
-        bpy.ops.render.render(write_still=True)
-        frame_paths.append(filepath)
+    return pivot
 
-    return frame_paths
+def render_turntable(camera, output_dir, frames=12, resolution=(512, 512), angle_step=None,
+                     frame_range=None):
+    """Render a turntable as a single keyframed animation job.
+
+    The whole range is rendered with one animation render, so the engine can
+    keep scene data (BVH, textures) alive between frames instead of
+    rebuilding it per frame. Frames are written as turntable_000.png,
+    turntable_001.png, ... frame_range=(start, end) renders a subset.
+    """
+    scene = bpy.context.scene
+    scene.camera = camera
+    scene.render.resolution_x = resolution[0]
+    scene.render.resolution_y = resolution[1]
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.use_persistent_data = True
+
+    if bpy.data.objects.get("TurntablePivot") is None:
+        setup_turntable(camera, frames, angle_step)
+
+    start, end = frame_range if frame_range else (0, frames - 1)
+
+    saved_range = (scene.frame_start, scene.frame_end, scene.frame_current)
+    scene.frame_start = start
+    scene.frame_end = end
+    scene.render.filepath = os.path.join(output_dir, "turntable_###")
+    bpy.ops.render.render(animation=True)
+    scene.frame_start, scene.frame_end, scene.frame_current = saved_range
+
+    return [os.path.join(output_dir, f"turntable_{i:03d}.png") for i in range(start, end + 1)]
 
 def create_gif(frame_paths, output_path, duration=100):
     """Create GIF from frames using PIL."""
@@ -125,21 +266,130 @@ def create_gif(frame_paths, output_path, duration=100):
     except ImportError:
         return False
 
-def run_render_pipeline(output_dir, resolution=(512, 512)):
-    """Run the complete rendering pipeline."""
+GEOMETRY_TYPES = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}
+
+def collect_scene_stats():
+    """Collect object, polygon, bounds and material counts for the evaluated scene."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    stats = {
+        'objects': len(bpy.context.scene.objects),
+        'mesh_objects': 0,
+        'vertices': 0,
+        'faces': 0,
+        'materials': 0,
+        'bounds_min': None,
+        'bounds_max': None,
+        'finite_bounds': True,
+    }
+
+    min_coord = [float('inf')] * 3
+    max_coord = [float('-inf')] * 3
+    materials = set()
+
+    for obj in bpy.context.scene.objects:
+        if obj.type not in GEOMETRY_TYPES:
+            continue
+        stats['mesh_objects'] += 1
+
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        if mesh is not None:
+            stats['vertices'] += len(mesh.vertices)
+            stats['faces'] += len(mesh.polygons)
+            eval_obj.to_mesh_clear()
+
+        for corner in eval_obj.bound_box:
+            world_corner = eval_obj.matrix_world @ mathutils.Vector(corner)
+            # min()/max() silently drop NaN, so track non-finite corners explicitly
+            if not all(math.isfinite(c) for c in world_corner):
+                stats['finite_bounds'] = False
+                continue
+            for i in range(3):
+                min_coord[i] = min(min_coord[i], world_corner[i])
+                max_coord[i] = max(max_coord[i], world_corner[i])
+
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                materials.add(slot.material.name)
+
+    stats['materials'] = len(materials)
+    if stats['mesh_objects'] and min_coord[0] != float('inf'):
+        stats['bounds_min'] = min_coord
+        stats['bounds_max'] = max_coord
+    return stats
+
+def check_scene_stats(stats, max_faces=None):
+    """Return why the scene should not be rendered, or None if it looks renderable."""
+    if stats['mesh_objects'] == 0 or stats['faces'] == 0:
+        return f"Scene is empty: {stats['objects']} objects, {stats['faces']} faces"
+
+    if not stats['finite_bounds'] or stats['bounds_min'] is None:
+        return "Scene bounds are not finite (NaN or infinite object transforms)"
+
+    size = max(stats['bounds_max'][i] - stats['bounds_min'][i] for i in range(3))
+    if size <= 0:
+        return "Scene has zero size"
+
+    if max_faces is not None and stats['faces'] > max_faces:
+        return f"Scene has {stats['faces']} faces, over the poly budget of {max_faces}"
+
+    return None
+
+def write_scene_stats(stats, output_dir):
+    """Write scene stats to scene_stats.json for the executor to read."""
+    import json
+
     os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "scene_stats.json"), "w") as f:
+        json.dump(stats, f, indent=2)
 
-    # Set up render engine
-    bpy.context.scene.render.engine = 'CYCLES'
-    bpy.context.scene.cycles.samples = 64
-    bpy.context.scene.cycles.use_denoising = True
+CAMERA_NAMES = {'front': 'CamFront', 'top': 'CamTop', 'side': 'CamSide', 'iso': 'CamIso'}
 
-    # Fallback to EEVEE if Cycles unavailable
-    try:
-        bpy.context.scene.cycles.device = 'GPU'
-    except:
-        bpy.context.scene.render.engine = 'BLENDER_EEVEE_NEXT'
+EEVEE_ENGINE_NAMES = ('BLENDER_EEVEE_NEXT', 'BLENDER_EEVEE')
+
+def configure_render_engine(quality=None, threads=None):
+    """Select the render engine, samples and optional fixed render thread count.
+
+    quality is a dict with 'engine' (CYCLES, BLENDER_EEVEE_NEXT or
+    BLENDER_WORKBENCH), 'samples' and 'denoise'; defaults to Cycles at 64
+    samples with denoising.
+    """
+    quality = quality or {}
+    engine = quality.get('engine', 'CYCLES')
+    samples = quality.get('samples', 64)
+    scene = bpy.context.scene
 
+    if engine == 'CYCLES':
+        scene.render.engine = 'CYCLES'
+        scene.cycles.samples = samples
+        scene.cycles.use_denoising = quality.get('denoise', True)
+
+        # Fallback to EEVEE if Cycles unavailable
+        try:
+            scene.cycles.device = 'GPU'
+        except:
+            engine = 'BLENDER_EEVEE_NEXT'
+
+    if engine in EEVEE_ENGINE_NAMES:
+        # The EEVEE identifier differs between Blender versions
+        for name in (engine,) + EEVEE_ENGINE_NAMES:
+            try:
+                scene.render.engine = name
+                break
+            except TypeError:
+                continue
+        scene.eevee.taa_render_samples = samples
+    elif engine == 'BLENDER_WORKBENCH':
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'MATERIAL'
+
+    if threads:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = threads
+
+def setup_render_scene():
+    """Add lights and the four view cameras framed on the scene bounds."""
     # Set up lighting
     setup_lighting()
 
@@ -166,36 +416,63 @@ def run_render_pipeline(output_dir, resolution=(512, 512)):
     ortho_scale = size * 1.5
 
     # Create cameras for 4 views
-    cameras = {
-        'front': setup_camera('CamFront', (center[0], -dist, center[2]), (math.radians(90), 0, 0), True, ortho_scale),
-        'top': setup_camera('CamTop', (center[0], center[1], dist), (0, 0, 0), True, ortho_scale),
-        'side': setup_camera('CamSide', (dist, center[1], center[2]), (math.radians(90), 0, math.radians(90)), True, ortho_scale),
-        'iso': setup_camera('CamIso', (dist*0.7, -dist*0.7, dist*0.7), (math.radians(54.7), 0, math.radians(45)), False),
+    return {
+        'front': setup_camera(
+            CAMERA_NAMES['front'], (center[0], -dist, center[2]),
+            (math.radians(90), 0, 0), True, ortho_scale,
+        ),
+        'top': setup_camera(
+            CAMERA_NAMES['top'], (center[0], center[1], dist), (0, 0, 0), True, ortho_scale,
+        ),
+        'side': setup_camera(
+            CAMERA_NAMES['side'], (dist, center[1], center[2]),
+            (math.radians(90), 0, math.radians(90)), True, ortho_scale,
+        ),
+        'iso': setup_camera(
+            CAMERA_NAMES['iso'], (dist*0.7, -dist*0.7, dist*0.7),
+            (math.radians(54.7), 0, math.radians(45)), False,
+        ),
     }
 
-    # Render each view
+def run_render_pipeline(output_dir, resolution=(512, 512), turntable_frames=12,
+                        turntable_angle_step=None, quality=None):
+    """Run the complete rendering pipeline."""
+    os.makedirs(output_dir, exist_ok=True)
+
+    with timed_stage('setup'):
+        configure_render_engine(quality)
+        cameras = setup_render_scene()
+
+    # Render each view (the first one also pays for the BVH build)
     view_paths = []
     for name, cam in cameras.items():
         filepath = os.path.join(output_dir, f"view_{name}.png")
-        render_view(cam, filepath, resolution)
+        with timed_stage(f'view_{name}'):
+            render_view(cam, filepath, resolution)
         view_paths.append(filepath)
 
     # Create grid image
     grid_path = os.path.join(output_dir, "grid_4view.png")
-    if not create_grid_image(view_paths, grid_path, resolution):
-        grid_path = None
+    with timed_stage('grid'):
+        if not create_grid_image(view_paths, grid_path, resolution):
+            grid_path = None
 
     # Render turntable
     turntable_dir = os.path.join(output_dir, "turntable_frames")
     os.makedirs(turntable_dir, exist_ok=True)
 
-    # Use isometric camera for turntable (12 frames = 30° per frame)
-    frame_paths = render_turntable(cameras['iso'], turntable_dir, frames=12, resolution=resolution)
+    # Use isometric camera for turntable (default 12 frames = 30° per frame)
+    with timed_stage('turntable'):
+        frame_paths = render_turntable(
+            cameras['iso'], turntable_dir,
+            frames=turntable_frames, resolution=resolution, angle_step=turntable_angle_step,
+        )
 
     # Create GIF
     gif_path = os.path.join(output_dir, "turntable.gif")
-    if not create_gif(frame_paths, gif_path):
-        gif_path = None
+    with timed_stage('gif'):
+        if not create_gif(frame_paths, gif_path):
+            gif_path = None
 
     return {
         'views': view_paths,
@@ -203,10 +480,117 @@ def run_render_pipeline(output_dir, resolution=(512, 512)):
         'gif': gif_path,
     }
 
+def prepare_render_scene(scene_blend_path, turntable_frames=12, turntable_angle_step=None,
+                         quality=None):
+    """Build the render scene (lights, cameras, turntable) and save a copy for sharded rendering."""
+    with timed_stage('setup'):
+        configure_render_engine(quality)
+        cameras = setup_render_scene()
+        setup_turntable(cameras['iso'], turntable_frames, turntable_angle_step)
+    with timed_stage('scene_save'):
+        bpy.ops.wm.save_as_mainfile(filepath=scene_blend_path, copy=True)
+    return scene_blend_path
+
+def render_shard(output_dir, resolution=(512, 512), views=(), frame_range=None,
+                 turntable_frames=12, threads=None, quality=None):
+    """Render a subset of views and turntable frames from a prepared render scene."""
+    os.makedirs(output_dir, exist_ok=True)
+    with timed_stage('setup'):
+        configure_render_engine(quality, threads)
+
+    # The prepared scene is saved at its current frame, where the turntable
+    # pivot is already rotated; render stills at frame 0 like a full render
+    if views:
+        bpy.context.scene.frame_set(0)
+
+    view_paths = []
+    for name in views:
+        filepath = os.path.join(output_dir, f"view_{name}.png")
+        with timed_stage(f'view_{name}'):
+            render_view(bpy.data.objects[CAMERA_NAMES[name]], filepath, resolution)
+        view_paths.append(filepath)
+
+    frame_paths = []
+    if frame_range:
+        turntable_dir = os.path.join(output_dir, "turntable_frames")
+        os.makedirs(turntable_dir, exist_ok=True)
+        with timed_stage(f'turntable_{frame_range[0]}-{frame_range[1]}'):
+            frame_paths = render_turntable(
+                bpy.data.objects[CAMERA_NAMES['iso']], turntable_dir,
+                frames=turntable_frames, resolution=resolution, frame_range=frame_range,
+            )
+
+    return {
+        'views': view_paths,
+        'frames': frame_paths,
+    }
+
 # Need mathutils for vector operations
 import mathutils
 
-# Run the pipeline if OUTPUT_DIR is defined
+# Run the pipeline if OUTPUT_DIR is defined. RENDER_MODE selects between a
+# full single-process render, preparing a scene for sharding, or one shard.
 if 'OUTPUT_DIR' in dir():
-    render_results = run_render_pipeline(OUTPUT_DIR, RENDER_RESOLUTION if 'RENDER_RESOLUTION' in dir() else (512, 512))
+    # Time spent in the generated code, excluding its .blend saves
+    if 'USER_CODE_START_TIME' in dir():
+        _blend_save = _RENDER_STATS_SAVE['total']
+        RENDER_STATS['stages']['user_code'] = round(
+            time.perf_counter() - USER_CODE_START_TIME - _blend_save, 4
+        )
+        RENDER_STATS['stages']['blend_save'] = round(_blend_save, 4)
+    bpy.app.handlers.render_stats.append(record_render_memory)
+
+    _render_mode = RENDER_MODE if 'RENDER_MODE' in dir() else 'full'
+    _resolution = RENDER_RESOLUTION if 'RENDER_RESOLUTION' in dir() else (512, 512)
+    _turntable_frames = TURNTABLE_FRAMES if 'TURNTABLE_FRAMES' in dir() else 12
+    _turntable_angle_step = TURNTABLE_ANGLE_STEP if 'TURNTABLE_ANGLE_STEP' in dir() else None
+    _quality = {
+        'engine': RENDER_ENGINE if 'RENDER_ENGINE' in dir() else 'CYCLES',
+        'samples': RENDER_SAMPLES if 'RENDER_SAMPLES' in dir() else 64,
+        'denoise': RENDER_DENOISE if 'RENDER_DENOISE' in dir() else True,
+    }
+
+    # Fast-fail geometry check: skip rendering entirely for empty/degenerate scenes
+    scene_stats = None
+    if _render_mode != 'shard':
+        with timed_stage('scene_eval'):
+            scene_stats = collect_scene_stats()
+        scene_stats['skip_reason'] = check_scene_stats(
+            scene_stats, MAX_POLY_COUNT if 'MAX_POLY_COUNT' in dir() else None
+        )
+        write_scene_stats(scene_stats, OUTPUT_DIR)
+        if scene_stats['skip_reason']:
+            print(f"Skipping render: {scene_stats['skip_reason']}")
+            _render_mode = 'skip'
+
+    if _render_mode == 'skip':
+        render_results = None
+    elif _render_mode == 'prepare':
+        render_results = prepare_render_scene(
+            SCENE_BLEND_PATH, _turntable_frames, _turntable_angle_step, quality=_quality,
+        )
+    elif _render_mode == 'shard':
+        render_results = render_shard(
+            OUTPUT_DIR,
+            _resolution,
+            views=SHARD_VIEWS,
+            frame_range=SHARD_FRAME_RANGE,
+            turntable_frames=_turntable_frames,
+            threads=RENDER_THREADS if 'RENDER_THREADS' in dir() else None,
+            quality=_quality,
+        )
+    else:
+        render_results = run_render_pipeline(
+            OUTPUT_DIR,
+            _resolution,
+            turntable_frames=_turntable_frames,
+            turntable_angle_step=_turntable_angle_step,
+            quality=_quality,
+        )
+
+    if _render_mode == 'shard':
+        _shard_index = SHARD_INDEX if 'SHARD_INDEX' in dir() else 0
+        write_render_stats(OUTPUT_DIR, f"render_stats_shard_{_shard_index:02d}.json")
+    else:
+        write_render_stats(OUTPUT_DIR, scene_stats=scene_stats)
 '''
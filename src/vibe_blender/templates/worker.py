@@ -0,0 +1,138 @@
+"""Blender-side server loop for warm worker processes.
+
+This code runs inside a long-lived ``blender --background`` process started
+by ``BlenderWorkerPool``. It connects back to the host over a local socket,
+then executes one prepared script per request, resetting Blender to factory
+settings before each job.
+
+Environment variables VIBE_BLENDER_WORKER_PORT and VIBE_BLENDER_WORKER_TOKEN
+must be set by the host before launch.
+"""
+
+WORKER_TEMPLATE = '''
+# ============================================
+# WARM WORKER LOOP (Auto-injected by Vibe-Blender)
+# ============================================
+
+import contextlib
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+
+import bpy
+
+
+def _recv_exact(conn, size):
+    """Read exactly size bytes from the socket (or None on EOF)."""
+    chunks = []
+    while size > 0:
+        chunk = conn.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_message(conn):
+    """Receive one length-prefixed JSON message."""
+    header = _recv_exact(conn, 4)
+    if header is None:
+        return None
+    body = _recv_exact(conn, struct.unpack(">I", header)[0])
+    if body is None:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+def _send_message(conn, message):
+    """Send one length-prefixed JSON message."""
+    body = json.dumps(message).encode("utf-8")
+    conn.sendall(struct.pack(">I", len(body)) + body)
+
+
+def _memory_mb():
+    """Current resident memory of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except ImportError:
+        return 0.0
+
+
+def _run_job(job):
+    """Reset Blender, execute one script and capture its output."""
+    if job.get("blend_file"):
+        bpy.ops.wm.open_mainfile(filepath=job["blend_file"])
+    else:
+        bpy.ops.wm.read_factory_settings(use_empty=False)
+
+    script_path = job["script_path"]
+    with open(script_path) as f:
+        source = f.read()
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    script_globals = {"__name__": "__main__", "__file__": script_path}
+    success = True
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            code = compile(source, script_path, "exec")
+        except SyntaxError as e:
+            sys.stderr.write("Traceback (most recent call last):\\n")
+            traceback.print_exception(type(e), e, None)
+            code = None
+            success = False
+
+        if code is not None:
+            try:
+                exec(code, script_globals)
+            except SystemExit:
+                pass
+            except BaseException:
+                # Skip this loop's own frame so the traceback matches a normal run
+                exc_type, exc, tb = sys.exc_info()
+                traceback.print_exception(exc_type, exc, tb.tb_next)
+                success = False
+
+    return {
+        "success": success,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "memory_mb": _memory_mb(),
+    }
+
+
+def _serve():
+    """Connect to the host and process jobs until told to stop."""
+    port = int(os.environ["VIBE_BLENDER_WORKER_PORT"])
+    token = os.environ["VIBE_BLENDER_WORKER_TOKEN"]
+
+    conn = socket.create_connection(("127.0.0.1", port))
+    _send_message(conn, {"token": token, "memory_mb": _memory_mb()})
+
+    while True:
+        job = _recv_message(conn)
+        if job is None or job.get("command") == "shutdown":
+            break
+        _send_message(conn, _run_job(job))
+
+    conn.close()
+
+
+_serve()
+'''
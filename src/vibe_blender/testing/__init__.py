@@ -0,0 +1 @@
+"""Stand-ins for external tools, used by tests and benchmarks."""
@@ -0,0 +1,308 @@
+"""Offline stand-in for the Blender executable.
+
+Accepts the command lines BlenderExecutor uses::
+
+    vibe-blender-fake-blender --version
+    vibe-blender-fake-blender --background [file.blend] --python script.py
+
+Instead of running the script it reads the variables injected by the
+executor's script header (OUTPUT_DIR, OUTPUT_BLEND_PATH, RENDER_MODE, ...),
+sleeps for a simulated render time and writes placeholder outputs: view
+PNGs, turntable frames, scene_stats.json, render_stats.json and a dummy
+.blend. Warm pool workers are emulated too, so the executor, RenderManager
+and the full Orchestrator loop can be exercised on machines without Blender.
+
+Point ``blender.executable`` at the installed ``vibe-blender-fake-blender``
+script to use it. Behaviour is tuned with environment variables:
+
+    FAKE_BLENDER_STARTUP_TIME   seconds to simulate process startup (0.2)
+    FAKE_BLENDER_RENDER_TIME    seconds per rendered image (0.05)
+    FAKE_BLENDER_ERROR_RATE     probability of a simulated script traceback (0.0)
+    FAKE_BLENDER_VERSION        version reported by --version (4.2.0)
+"""
+
+import ast
+import io
+import json
+import os
+import random
+import socket
+import struct
+import sys
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from ..execution.streaming import USER_CODE_MARKER
+from ..templates.render_views import RENDER_TEMPLATE
+
+BLEND_MAGIC = b"BLENDER-v402"
+
+VIEW_NAMES = ["front", "top", "side", "iso"]
+VIEW_COLORS = {
+    "front": (200, 80, 80),
+    "top": (80, 200, 80),
+    "side": (80, 80, 200),
+    "iso": (200, 200, 80),
+}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _injected_vars(source: str) -> dict:
+    """Return the module-level constants assigned in a prepared script."""
+    tree = ast.parse(source)
+    values = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+        ):
+            try:
+                values[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+    return values
+
+
+def _write_image(path: Path, resolution: tuple[int, int], color: tuple[int, int, int]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", tuple(resolution), color).save(path)
+    time.sleep(_env_float("FAKE_BLENDER_RENDER_TIME", 0.05))
+
+
+def _write_blend(path: Path, scene: dict) -> None:
+    """Write a dummy .blend that remembers the fake scene contents."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(BLEND_MAGIC + json.dumps(scene).encode("utf-8"))
+
+
+def _read_blend(path: Optional[Path]) -> dict:
+    """Return the fake scene saved in a dummy .blend (empty if none)."""
+    if path is None or not path.exists():
+        return {"objects": 0, "materials": 0}
+    data = path.read_bytes()
+    if not data.startswith(BLEND_MAGIC):
+        return {"objects": 0, "materials": 0}
+    return json.loads(data[len(BLEND_MAGIC):].decode("utf-8"))
+
+
+def _build_scene(user_code: str, blend_file: Optional[Path]) -> dict:
+    """Fake scene: the opened .blend plus one object per `*_add(` call in the user code."""
+    scene = _read_blend(blend_file)
+    scene["objects"] += user_code.count("_add(")
+    scene["materials"] += user_code.count("materials.new(")
+    return scene
+
+
+def _scene_stats(scene: dict) -> dict:
+    """Scene statistics in the render template's format, one cube per object."""
+    objects = scene["objects"]
+    return {
+        "objects": objects,
+        "mesh_objects": objects,
+        "vertices": objects * 8,
+        "faces": objects * 6,
+        "materials": scene["materials"],
+        "bounds_min": [-1.0, -1.0, 0.0] if objects else None,
+        "bounds_max": [1.0, 1.0, 2.0] if objects else None,
+        "finite_bounds": True,
+        "skip_reason": None if objects else f"Scene is empty: {objects} objects, 0 faces",
+    }
+
+
+def _render(
+    values: dict, views: list[str], frames: range, stages: dict, turntable_stage: str
+) -> None:
+    output_dir = Path(values["OUTPUT_DIR"])
+    resolution = tuple(values.get("RENDER_RESOLUTION", (512, 512)))
+
+    for name in views:
+        start = time.perf_counter()
+        _write_image(output_dir / f"view_{name}.png", resolution, VIEW_COLORS[name])
+        stages[f"view_{name}"] = round(time.perf_counter() - start, 4)
+        print(f"Rendered {name} view")
+
+    start = time.perf_counter()
+    total = max(len(frames), 1)
+    for i in frames:
+        shade = int(255 * i / total)
+        _write_image(
+            output_dir / "turntable_frames" / f"turntable_{i:03d}.png",
+            resolution,
+            (shade, 128, 255 - shade),
+        )
+    if frames:
+        stages[turntable_stage] = round(time.perf_counter() - start, 4)
+        print(f"Rendered {len(frames)} turntable frames")
+
+
+def _write_render_stats(path: Path, values: dict, stages: dict, scene: Optional[dict]) -> None:
+    """Write render_stats.json in the render template's format."""
+    stats = {
+        "stages": stages,
+        "peak_memory_mb": 64.0,
+        "engine": values.get("RENDER_ENGINE", "CYCLES"),
+        "device": "CPU",
+        "samples": values.get("RENDER_SAMPLES", 64),
+        "peak_rss_mb": 150.0,
+        "blender_version": os.environ.get("FAKE_BLENDER_VERSION", "4.2.0"),
+    }
+    if scene is not None:
+        stats["vertices"] = scene["objects"] * 8
+        stats["faces"] = scene["objects"] * 6
+    path.write_text(json.dumps(stats, indent=2))
+
+
+def run_script(script_path: Path, blend_file: Optional[Path] = None) -> None:
+    """Simulate running one prepared script, printing to stdout/stderr like Blender.
+
+    Args:
+        script_path: Prepared script passed with --python
+        blend_file: .blend file opened before the script, if any
+    """
+    source = script_path.read_text()
+    if USER_CODE_MARKER in source:
+        sys.stderr.write(USER_CODE_MARKER + "\n")
+        sys.stderr.flush()
+
+    try:
+        compile(source, str(script_path), "exec")
+    except SyntaxError as e:
+        sys.stderr.write("Traceback (most recent call last):\n")
+        sys.stderr.write("".join(traceback.format_exception_only(type(e), e)))
+        return
+
+    if random.random() < _env_float("FAKE_BLENDER_ERROR_RATE", 0.0):
+        sys.stderr.write(
+            "Traceback (most recent call last):\n"
+            f'  File "{script_path}", line 1, in <module>\n'
+            "RuntimeError: Simulated failure from fake Blender\n"
+        )
+        return
+
+    values = _injected_vars(source)
+    if "OUTPUT_DIR" not in values:
+        return
+
+    mode = values.get("RENDER_MODE", "full")
+    frame_count = values.get("TURNTABLE_FRAMES", 12)
+    output_dir = Path(values["OUTPUT_DIR"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Generated code sits between the header's marker and the render template
+    user_code = ""
+    if USER_CODE_MARKER in source:
+        user_code = source.split(USER_CODE_MARKER)[-1].split(RENDER_TEMPLATE)[0]
+
+    scene = _build_scene(user_code, blend_file)
+    stages = {"user_code": 0.0, "blend_save": 0.0}
+    if mode != "shard":
+        if "OUTPUT_BLEND_PATH" in values and "save_as_mainfile" in user_code:
+            _write_blend(Path(values["OUTPUT_BLEND_PATH"]), scene)
+        stats = _scene_stats(scene)
+        (output_dir / "scene_stats.json").write_text(json.dumps(stats, indent=2))
+        if stats["skip_reason"]:
+            print(f"Skipping render: {stats['skip_reason']}")
+            _write_render_stats(output_dir / "render_stats.json", values, stages, scene)
+            return
+
+    if mode == "prepare":
+        _write_blend(Path(values["SCENE_BLEND_PATH"]), scene)
+    elif mode == "shard":
+        frame_range = values.get("SHARD_FRAME_RANGE")
+        frames = range(frame_range[0], frame_range[1] + 1) if frame_range else range(0)
+        stages = {}
+        _render(
+            values,
+            values.get("SHARD_VIEWS", []),
+            frames,
+            stages,
+            f"turntable_{frame_range[0]}-{frame_range[1]}" if frame_range else "turntable",
+        )
+        shard_file = f"render_stats_shard_{values.get('SHARD_INDEX', 0):02d}.json"
+        _write_render_stats(output_dir / shard_file, values, stages, None)
+        return
+    else:
+        _render(values, VIEW_NAMES, range(frame_count), stages, "turntable")
+
+    _write_render_stats(output_dir / "render_stats.json", values, stages, scene)
+
+
+def _send_message(conn: socket.socket, message: dict) -> None:
+    body = json.dumps(message).encode("utf-8")
+    conn.sendall(struct.pack(">I", len(body)) + body)
+
+
+def _recv_message(conn: socket.socket):
+    header = conn.recv(4, socket.MSG_WAITALL)
+    if len(header) < 4:
+        return None
+    (size,) = struct.unpack(">I", header)
+    return json.loads(conn.recv(size, socket.MSG_WAITALL).decode("utf-8"))
+
+
+def serve_worker() -> None:
+    """Emulate the warm worker loop of BlenderWorkerPool."""
+    conn = socket.create_connection(("127.0.0.1", int(os.environ["VIBE_BLENDER_WORKER_PORT"])))
+    _send_message(conn, {"token": os.environ["VIBE_BLENDER_WORKER_TOKEN"], "memory_mb": 150.0})
+
+    while True:
+        job = _recv_message(conn)
+        if job is None or job.get("command") == "shutdown":
+            break
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            blend_file = Path(job["blend_file"]) if job.get("blend_file") else None
+            run_script(Path(job["script_path"]), blend_file)
+        _send_message(
+            conn,
+            {
+                "success": "Traceback" not in stderr.getvalue(),
+                "stdout": stdout.getvalue(),
+                "stderr": stderr.getvalue(),
+                "memory_mb": 150.0,
+            },
+        )
+
+    conn.close()
+
+
+def main() -> None:
+    """Entry point mimicking the subset of Blender's CLI used by Vibe-Blender."""
+    args = sys.argv[1:]
+    if "--" in args:
+        args = args[: args.index("--")]
+
+    if "--version" in args or "-v" in args:
+        print(f"Blender {os.environ.get('FAKE_BLENDER_VERSION', '4.2.0')} (fake)")
+        return
+
+    time.sleep(_env_float("FAKE_BLENDER_STARTUP_TIME", 0.2))
+    print("Fake Blender started")
+
+    if "--python" not in args:
+        return
+    script_path = Path(args[args.index("--python") + 1])
+    blend_files = [Path(arg) for arg in args if arg.endswith(".blend")]
+
+    if "VIBE_BLENDER_WORKER_PORT" in os.environ:
+        serve_worker()
+    else:
+        run_script(script_path, blend_files[0] if blend_files else None)
+
+    print("\nBlender quit")
+
+
+if __name__ == "__main__":
+    main()
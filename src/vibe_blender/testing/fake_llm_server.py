@@ -0,0 +1,483 @@
+"""Local stand-in for the OpenAI and Ollama HTTP APIs.
+
+Serves the endpoints the LLM backends use::
+
+    POST /v1/chat/completions   OpenAI chat completions (blocking and SSE streaming)
+    POST /api/generate          Ollama generate (blocking and JSON-lines streaming)
+    GET  /api/tags              Ollama model list (health check)
+    GET  /stats                 Request, error and per-kind counters of this server
+
+Responses are canned per prompt kind (clarification, planner, generator,
+edit, critic), detected from the response schema or the prompt text, so
+the full Orchestrator loop runs against it: the critic fails the first
+critiques and passes from ``--pass-after`` on. Latency distributions and
+429/500/timeout injection make it usable for load testing concurrency,
+the rate limiter and connection reuse without touching a real API.
+
+Start it with::
+
+    vibe-blender-fake-llm-server --port 8089 --latency uniform:0.2,1.5 --error-429 0.05
+
+and point ``llm.openai.base_url`` at ``http://127.0.0.1:8089/v1`` (any API
+key is accepted) or ``llm.ollama.base_url`` at ``http://127.0.0.1:8089``.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+
+# Schema titles sent by the agents, mapped to prompt kinds
+SCHEMA_KINDS = {
+    "ClarificationRequest": "clarification",
+    "SceneDescription": "planner",
+    "EditList": "edit",
+    "CritiqueResult": "critic",
+}
+
+CHUNK_CHARS = 24
+
+GENERATED_SCRIPT = '''\
+import bpy
+
+bpy.ops.object.select_all(action="SELECT")
+bpy.ops.object.delete()
+
+bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0.5))
+model = bpy.context.active_object
+model.name = "Model"
+model.scale = (1.0, 1.0, 1.0)
+
+mat = bpy.data.materials.new(name="ModelMaterial")
+mat.use_nodes = True
+model.data.materials.append(mat)
+
+bpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)
+'''
+
+# The canned edit rewrites this line of GENERATED_SCRIPT
+EDIT_TARGET = "model.scale = (1.0, 1.0, 1.0)"
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Parse a latency distribution.
+
+    Args:
+        spec: ``0.5`` or ``fixed:0.5`` (seconds), ``uniform:low,high``, or
+            ``lognormal:median,sigma`` (long-tailed, like real APIs)
+
+    Returns:
+        Function returning one latency sample in seconds
+
+    Raises:
+        ValueError: If the spec can't be parsed
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    values = [float(value) for value in args.split(",")]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(*values)
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda: random.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+
+def canned_response(kind: str, critique_number: int, pass_after: int) -> str:
+    """Return the default response text for a prompt kind.
+
+    Args:
+        kind: clarification, planner, generator, edit or critic
+        critique_number: 1-based count of critiques served so far
+        pass_after: Critique number from which the verdict is "pass"
+
+    Returns:
+        Response text in the format the agent expects
+    """
+    if kind == "clarification":
+        return json.dumps({"needs_clarification": False, "reason": None, "questions": []})
+    if kind == "planner":
+        return json.dumps(
+            {
+                "summary": "A simple cube-based model",
+                "style": "low-poly",
+                "objects": [{"name": "Model", "shape": "cube", "details": "Unit cube"}],
+                "materials": [{"name": "ModelMaterial", "base_color": "#cccccc"}],
+                "lighting": "Three-point lighting",
+                "camera_notes": None,
+                "complexity": "simple",
+            }
+        )
+    if kind == "edit":
+        return json.dumps(
+            {"edits": [{"old_code": EDIT_TARGET, "new_code": "model.scale = (1.2, 1.0, 1.0)"}]}
+        )
+    if kind == "critic":
+        passed = critique_number >= pass_after
+        return json.dumps(
+            {
+                "verdict": "pass" if passed else "fail",
+                "score": 8.0 if passed else 5.0,
+                "feedback": "Looks good." if passed else "The model is too narrow.",
+                "issues": [] if passed else ["Proportions are off"],
+                "suggestions": [] if passed else ["Widen the model along X"],
+            }
+        )
+    return f"Here is the script:\n\n```python\n{GENERATED_SCRIPT}```\n"
+
+
+def detect_kind(text: str, schema_name: Optional[str] = None) -> str:
+    """Classify a request by its response schema, or by markers in its prompts."""
+    if schema_name in SCHEMA_KINDS:
+        return SCHEMA_KINDS[schema_name]
+    if "needs_clarification" in text:
+        return "clarification"
+    if "old_code" in text:
+        return "edit"
+    if '"verdict"' in text:
+        return "critic"
+    if "```python" in text:
+        return "generator"
+    if '"objects"' in text:
+        return "planner"
+    return "generator"
+
+
+class FakeLLMServer:
+    """Threaded HTTP server answering OpenAI and Ollama requests with canned responses."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8089,
+        latency: str = "0",
+        chunk_delay: float = 0.0,
+        error_rates: Optional[dict[str, float]] = None,
+        retry_after: float = 1.0,
+        timeout_seconds: float = 600.0,
+        responses: Optional[dict[str, str | list[str]]] = None,
+        pass_after: int = 2,
+    ):
+        """Initialize the server (call start() or serve_forever() to run it).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Time-to-first-byte distribution, see parse_latency()
+            chunk_delay: Seconds between streamed chunks
+            error_rates: Probability per request of "429", "500" or "timeout"
+            retry_after: Retry-After seconds sent with injected 429s
+            timeout_seconds: How long an injected timeout stalls before dropping
+                the connection
+            responses: Scripted response text per kind; lists are served in turn
+            pass_after: Critique number from which canned critiques pass
+        """
+        self.latency = parse_latency(latency)
+        self.chunk_delay = chunk_delay
+        self.error_rates = error_rates or {}
+        self.retry_after = retry_after
+        self.timeout_seconds = timeout_seconds
+        self.pass_after = pass_after
+        self._scripted = {
+            kind: itertools.cycle(value if isinstance(value, list) else [value])
+            for kind, value in (responses or {}).items()
+        }
+
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL, e.g. http://127.0.0.1:8089 (append /v1 for OpenAI clients)."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def count(self, name: str) -> int:
+        """Increment a counter and return its new value."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            return self.counters[name]
+
+    def respond(self, kind: str) -> str:
+        """Return the response text for a request of the given kind."""
+        number = self.count(f"kind.{kind}")
+        with self._lock:
+            scripted = self._scripted.get(kind)
+            if scripted is not None:
+                return next(scripted)
+        return canned_response(kind, number, self.pass_after)
+
+    def injected_error(self) -> Optional[str]:
+        """Draw an error to inject for this request, if any."""
+        roll = random.random()
+        for error in ("429", "500", "timeout"):
+            rate = self.error_rates.get(error, 0.0)
+            if roll < rate:
+                return error
+            roll -= rate
+        return None
+
+
+def _handler_for(server: FakeLLMServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(_FakeLLMHandler):
+        fake = server
+
+    return Handler
+
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, so clients' connection reuse is exercised
+    protocol_version = "HTTP/1.1"
+    fake: FakeLLMServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": "llama3"}, {"name": "llava"}]})
+        elif self.path == "/stats":
+            with self.fake._lock:
+                self._send_json(200, dict(self.fake.counters))
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.fake.count("requests")
+
+        if self.path not in ("/v1/chat/completions", "/api/generate"):
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        if self._inject_error():
+            return
+
+        time.sleep(max(0.0, self.fake.latency()))
+        if self.path == "/v1/chat/completions":
+            self._chat_completions(body)
+        else:
+            self._generate(body)
+
+    def _inject_error(self) -> bool:
+        error = self.fake.injected_error()
+        if error is None:
+            return False
+        self.fake.count(f"errors.{error}")
+        if error == "timeout":
+            # Stall, then drop the connection without a response
+            time.sleep(self.fake.timeout_seconds)
+            self.close_connection = True
+            return True
+        if error == "429":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}},
+                headers={"Retry-After": f"{self.fake.retry_after:g}"},
+            )
+        else:
+            self._send_json(500, {"error": {"message": "Injected server error"}})
+        return True
+
+    def _chat_completions(self, body: dict) -> None:
+        texts = []
+        for message in body.get("messages", []):
+            content = message.get("content")
+            if isinstance(content, list):
+                content = " ".join(part.get("text", "") for part in content)
+            texts.append(content or "")
+        prompt = "\n".join(texts)
+        schema = (body.get("response_format") or {}).get("json_schema", {})
+        text = self.fake.respond(detect_kind(prompt, schema.get("name")))
+
+        model = body.get("model", "fake")
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(text) // 4,
+            "total_tokens": (len(prompt) + len(text)) // 4,
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            self._send_json(
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": text},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        def chunk(delta: dict, finish_reason: Optional[str] = None, **extra) -> bytes:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        events = [chunk({"role": "assistant", "content": ""})]
+        events += [chunk({"content": piece}) for piece in _pieces(text)]
+        events.append(chunk({}, "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            events.append(chunk({}, choices=[], usage=usage))
+        events.append(b"data: [DONE]\n\n")
+        self._send_stream("text/event-stream", events)
+
+    def _generate(self, body: dict) -> None:
+        prompt = f"{body.get('system', '')}\n{body.get('prompt', '')}"
+        schema = body.get("format")
+        schema_name = schema.get("title") if isinstance(schema, dict) else None
+        text = self.fake.respond(detect_kind(prompt, schema_name))
+
+        model = body.get("model", "fake")
+        created_at = datetime.now(timezone.utc).isoformat()
+        final = {
+            "model": model,
+            "created_at": created_at,
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": len(prompt) // 4,
+            "eval_count": len(text) // 4,
+        }
+
+        if body.get("stream") is False:
+            self._send_json(200, {**final, "response": text})
+            return
+
+        partial = {"model": model, "created_at": created_at, "done": False}
+        lines = [
+            (json.dumps({**partial, "response": piece}) + "\n").encode() for piece in _pieces(text)
+        ]
+        lines.append((json.dumps({**final, "response": ""}) + "\n").encode())
+        self._send_stream("application/x-ndjson", lines)
+
+    def _send_json(self, status: int, data: dict, headers: Optional[dict] = None) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_stream(self, content_type: str, parts: list[bytes]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for part in parts:
+                self.wfile.write(f"{len(part):x}\r\n".encode() + part + b"\r\n")
+                self.wfile.flush()
+                if self.fake.chunk_delay:
+                    time.sleep(self.fake.chunk_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client closed the stream early (it had the answer it needed)
+            self.fake.count("streams_closed_early")
+            self.close_connection = True
+
+
+def _pieces(text: str) -> list[str]:
+    return [text[i : i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+
+
+def main() -> None:
+    """Run the server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency", default="0", help="fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA"
+    )
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between chunks")
+    parser.add_argument("--error-429", type=float, default=0.0, help="Probability of a 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="Probability of a 500")
+    parser.add_argument(
+        "--error-timeout", type=float, default=0.0, help="Probability of a stalled request"
+    )
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of 429s")
+    parser.add_argument("--timeout-seconds", type=float, default=600.0)
+    parser.add_argument(
+        "--responses",
+        type=Path,
+        help="JSON file mapping kinds (clarification, planner, generator, edit, critic) "
+        "to a response or list of responses",
+    )
+    parser.add_argument("--pass-after", type=int, default=2, help="First passing critique")
+    args = parser.parse_args()
+
+    responses = json.loads(args.responses.read_text()) if args.responses else None
+    server = FakeLLMServer(
+        args.host,
+        args.port,
+        latency=args.latency,
+        chunk_delay=args.chunk_delay,
+        error_rates={
+            "429": args.error_429,
+            "500": args.error_500,
+            "timeout": args.error_timeout,
+        },
+        retry_after=args.retry_after,
+        timeout_seconds=args.timeout_seconds,
+        responses=responses,
+        pass_after=args.pass_after,
+    )
+    print(f"Fake LLM server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Shared fixtures running the pipeline against the fake Blender and fake LLM server."""
+
+import sys
+
+import pytest
+
+from vibe_blender.config import BlenderConfig, Config, LLMConfig
+from vibe_blender.testing.fake_llm_server import FakeLLMServer
+
+
+@pytest.fixture
+def fake_blender(tmp_path, monkeypatch):
+    """Path of an executable wrapper around the fake Blender module, with no simulated delays."""
+    monkeypatch.setenv("FAKE_BLENDER_STARTUP_TIME", "0")
+    monkeypatch.setenv("FAKE_BLENDER_RENDER_TIME", "0")
+
+    wrapper = tmp_path / "blender"
+    wrapper.write_text(
+        f'#!/bin/sh\nexec "{sys.executable}" -m vibe_blender.testing.fake_blender "$@"\n'
+    )
+    wrapper.chmod(0o755)
+    return str(wrapper)
+
+
+@pytest.fixture
+def llm_server():
+    """Fake OpenAI/Ollama server whose critic passes on the second critique."""
+    with FakeLLMServer(port=0, pass_after=2) as server:
+        yield server
+
+
+@pytest.fixture
+def pipeline_config(fake_blender, llm_server, monkeypatch):
+    """Config pointing at the fake Blender and the fake OpenAI-compatible server."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return Config(
+        blender=BlenderConfig(executable=fake_blender),
+        llm=LLMConfig(openai={"base_url": f"{llm_server.url}/v1"}),
+        pipeline={"max_retries": 1, "turntable_frames": 2},
+    )
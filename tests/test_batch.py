@@ -0,0 +1,73 @@
+"""Tests of batch runs against the fake LLM server and fake Blender."""
+
+import json
+
+import pytest
+
+from vibe_blender.batch import BatchRunner, load_jobs, load_results
+from vibe_blender.models import BatchResult, PipelineStatus
+
+
+def test_load_jobs_names_and_dedupes(tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    prompts.write_text(
+        "\n".join([
+            json.dumps({"id": "chair", "prompt": "A chair", "references": ["chair.jpg"]}),
+            json.dumps("A table"),
+            "# comment",
+            json.dumps({"prompt": "A table", "max_retries": 2}),
+        ])
+    )
+
+    jobs = load_jobs(prompts)
+
+    assert [job.id for job in jobs[1:]] == [jobs[1].id, f"{jobs[1].id}-2"]
+    assert jobs[0].references == [tmp_path / "chair.jpg"]
+    assert jobs[2].max_retries == 2
+
+    prompts.write_text(json.dumps({"id": "../up", "prompt": "A lamp"}))
+    with pytest.raises(ValueError, match="plain file name"):
+        load_jobs(prompts)
+
+
+def test_batch_runs_jobs_and_writes_results(pipeline_config, tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    prompts.write_text("\n".join(json.dumps(p) for p in ["A chair", "A table", "A lamp"]))
+    jobs = load_jobs(prompts)
+
+    runner = BatchRunner(
+        pipeline_config, tmp_path / "batch", concurrency=3, blender_slots=1, llm_concurrency=2
+    )
+    results = runner.run(jobs)
+
+    assert sorted(result.id for result in results) == sorted(job.id for job in jobs)
+    for result in results:
+        assert result.status in (PipelineStatus.SUCCESS, PipelineStatus.MAX_RETRIES)
+        assert result.output_dir == tmp_path / "batch" / result.id
+        assert (result.output_dir / "pipeline.log").exists()
+    assert load_results(runner.results_path).keys() == {job.id for job in jobs}
+    assert runner.summary()["prompts_per_hour"] > 0
+
+
+def test_batch_resumes_after_finished_jobs(pipeline_config, tmp_path):
+    prompts = tmp_path / "prompts.jsonl"
+    prompts.write_text("\n".join(json.dumps(p) for p in ["A chair", "A table"]))
+    jobs = load_jobs(prompts)
+
+    batch_dir = tmp_path / "batch"
+    batch_dir.mkdir()
+    done = BatchResult(
+        id=jobs[0].id,
+        prompt=jobs[0].prompt,
+        status=PipelineStatus.SUCCESS,
+        output_dir=batch_dir / jobs[0].id,
+    )
+    # Second line was cut short when the previous batch was killed
+    (batch_dir / "results.jsonl").write_text(done.model_dump_json() + '\n{"id": "jo')
+
+    runner = BatchRunner(pipeline_config, batch_dir, concurrency=2)
+    results = runner.run(jobs)
+
+    assert [result.id for result in results] == [jobs[1].id]
+    assert runner.summary()["skipped"] == 1
+    assert not (batch_dir / jobs[0].id).exists()
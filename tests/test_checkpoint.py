@@ -0,0 +1,48 @@
+"""Tests of pipeline checkpoints and resume against the fake LLM server and fake Blender."""
+
+from vibe_blender.models import PipelineStatus
+from vibe_blender.orchestrator import CHECKPOINT_FILE, Orchestrator, load_checkpoint
+
+
+def test_resume_continues_after_last_iteration(pipeline_config, llm_server, tmp_path):
+    out = tmp_path / "run"
+    state = Orchestrator(pipeline_config, interactive=False).run("A chair", out)
+    assert state.status == PipelineStatus.MAX_RETRIES
+    assert load_checkpoint(out).current_iteration == 1
+
+    resumed = Orchestrator(pipeline_config, interactive=False).resume(out, max_retries=2)
+
+    assert resumed.status == PipelineStatus.SUCCESS
+    assert [record.iteration for record in resumed.iterations] == [1, 2]
+    # The plan and the first iteration come from the checkpoint
+    assert llm_server.counters["kind.planner"] == 1
+    assert len(resumed.llm_usage) > len(state.llm_usage)
+    assert load_checkpoint(out).status == PipelineStatus.SUCCESS
+    assert not (out / f".{CHECKPOINT_FILE}.tmp").exists()
+
+
+def test_resume_reuses_renders_of_interrupted_iteration(pipeline_config, tmp_path, monkeypatch):
+    out = tmp_path / "run"
+    Orchestrator(pipeline_config, interactive=False).run("A chair", out)
+
+    # Rewind to just after Blender ran in iteration 1, before the critique
+    state = load_checkpoint(out)
+    record = state.iterations.pop()
+    record.critique = None
+    state.pending_iteration = record
+    state.current_iteration = 0
+    state.status = PipelineStatus.RUNNING
+    (out / CHECKPOINT_FILE).write_text(state.model_dump_json())
+
+    orchestrator = Orchestrator(pipeline_config, interactive=False)
+
+    def no_blender(*args, **kwargs):
+        raise AssertionError("renders should be reused")
+
+    monkeypatch.setattr(orchestrator.executor, "execute", no_blender)
+    resumed = orchestrator.resume(out)
+
+    assert resumed.current_iteration == 1
+    assert resumed.iterations[0].critique is not None
+    assert resumed.iterations[0].render_output.grid_image == record.render_output.grid_image
+    assert resumed.pending_iteration is None
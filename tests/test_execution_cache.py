@@ -0,0 +1,99 @@
+"""Tests for the content-addressed execution cache."""
+
+import os
+
+from vibe_blender.config import BlenderConfig, Config
+from vibe_blender.execution import BlenderExecutor
+from vibe_blender.execution.cache import META_FILE, ExecutionCache
+from vibe_blender.models import GeneratedScript
+
+
+def _iteration(path, content):
+    """Create an iteration directory with renders, a .blend and a log."""
+    (path / "renders").mkdir(parents=True)
+    (path / "renders" / "grid_4view.png").write_text(content)
+    (path / "model.blend").write_text(content)
+    (path / "blender.log").write_text(content)
+    return path
+
+
+def test_store_then_restore_hits(tmp_path):
+    cache = ExecutionCache(tmp_path / "cache")
+    key = ExecutionCache.make_key("script", "5", "(512, 512)", "Blender 4.2.0")
+    target = tmp_path / "iteration_02"
+    target.mkdir()
+
+    assert not cache.restore(key, target)
+    cache.store(key, _iteration(tmp_path / "iteration_01", "renders"))
+    assert cache.restore(key, target)
+
+    assert (target / "renders" / "grid_4view.png").read_text() == "renders"
+    assert (target / "model.blend").read_text() == "renders"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_rewriting_restored_files_leaves_the_entry_intact(tmp_path):
+    cache = ExecutionCache(tmp_path / "cache")
+    key = ExecutionCache.make_key("script")
+    cache.store(key, _iteration(tmp_path / "iteration_01", "cached"))
+    target = tmp_path / "iteration_02"
+    target.mkdir()
+
+    assert cache.restore(key, target)
+    # In-place rewrites, as a resumed run reopening its log with "w" does
+    restored = [
+        target / "blender.log",
+        target / "model.blend",
+        target / "renders" / "grid_4view.png",
+    ]
+    for path in restored:
+        with open(path, "w") as f:
+            f.write("rewritten")
+    assert cache.restore(key, target)
+
+    assert [path.read_text() for path in restored] == ["cached"] * 3
+
+
+def test_key_depends_on_every_part():
+    key = ExecutionCache.make_key("script", "5")
+
+    assert key != ExecutionCache.make_key("script", "6")
+    assert key != ExecutionCache.make_key("script5", "")
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ExecutionCache(tmp_path / "cache")
+    for i, key in enumerate(["a", "b"]):
+        cache.store(key, _iteration(tmp_path / key, "x" * 1000))
+        os.utime(tmp_path / "cache" / key / META_FILE, (i + 1, i + 1))
+    # Restoring "a" makes "b" the least recently used entry
+    assert cache.restore("a", tmp_path)
+
+    cache.max_bytes = 2 * cache._entries()[0][1]
+    cache.store("c", _iteration(tmp_path / "c", "x" * 1000))
+
+    assert sorted(path.name for path, _, _ in cache._entries()) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_executor_cache_hit_skips_blender(fake_blender, tmp_path):
+    config = Config(
+        blender=BlenderConfig(executable=fake_blender),
+        execution_cache={"enabled": True, "dir": str(tmp_path / "cache")},
+    )
+    config.pipeline.turntable_frames = 2
+    executor = BlenderExecutor(config)
+    code = (
+        "import bpy\nbpy.ops.mesh.primitive_cube_add(size=1)\n"
+        "bpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)\n"
+    )
+
+    first = executor.execute(GeneratedScript(code=code, iteration=1), tmp_path / "out")
+    second = executor.execute(GeneratedScript(code=code, iteration=2), tmp_path / "out")
+
+    assert executor.cache.stats()["hits"] == 1
+    assert second.grid_image.exists()
+    assert second.render_stats == first.render_stats
+    assert second.scene_stats == first.scene_stats
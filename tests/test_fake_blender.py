@@ -0,0 +1,117 @@
+"""End-to-end tests of BlenderExecutor against the fake Blender executable."""
+
+import pytest
+from PIL import Image
+
+from vibe_blender.config import BlenderConfig, Config, RenderQuality
+from vibe_blender.execution import BlenderExecutor
+from vibe_blender.models import GeneratedScript
+from vibe_blender.scheduling import ResourcePool
+
+SCRIPT = """\
+import bpy
+bpy.ops.mesh.primitive_cube_add(size=1)
+bpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)
+"""
+
+
+@pytest.fixture
+def executor(fake_blender):
+    """Executor running the fake Blender."""
+    config = Config(blender=BlenderConfig(executable=fake_blender))
+    config.pipeline.turntable_frames = 4
+    config.pipeline.render_resolution = (64, 64)
+    executor = BlenderExecutor(config)
+    yield executor
+    executor.close()
+
+
+def test_execute_produces_renders(executor, tmp_path):
+    output = executor.execute(GeneratedScript(code=SCRIPT, iteration=1), tmp_path / "out")
+
+    assert output.blender_error is None
+    assert output.blend_file.exists()
+    assert output.grid_image.exists()
+    assert output.turntable_gif.exists()
+    assert output.scene_stats.mesh_objects == 1
+    assert {"view_front", "turntable"} <= output.render_stats.stages.keys()
+    assert "(fake)" in executor.blender_version()
+
+
+def test_empty_scene_fails_validation(executor, tmp_path):
+    code = "import bpy\nbpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)\n"
+    output = executor.execute(GeneratedScript(code=code, iteration=1), tmp_path / "out")
+
+    assert output.blender_error.startswith("Scene validation failed: Scene is empty")
+    assert output.grid_image is None
+
+
+def test_iterations_render_at_preview_quality_and_rerender_at_final(fake_blender, tmp_path):
+    config = Config(blender=BlenderConfig(executable=fake_blender))
+    config.pipeline.turntable_frames = 2
+    config.pipeline.render_resolution = (64, 64)
+    config.pipeline.preview_quality = RenderQuality(
+        engine="BLENDER_EEVEE_NEXT", samples=8, resolution=(32, 32)
+    )
+    executor = BlenderExecutor(config)
+
+    preview = executor.execute(GeneratedScript(code=SCRIPT, iteration=1), tmp_path / "out")
+
+    assert (preview.render_stats.engine, preview.render_stats.samples) == ("BLENDER_EEVEE_NEXT", 8)
+    assert Image.open(preview.render_dir / "view_front.png").size == (32, 32)
+
+    final = executor.rerender(preview)
+
+    assert final.blender_error is None
+    assert final.render_dir == preview.render_dir.parent / "renders_final"
+    assert final.script_path == preview.script_path
+    assert (final.render_stats.engine, final.render_stats.samples) == ("CYCLES", 64)
+    assert Image.open(final.render_dir / "view_front.png").size == (64, 64)
+    # The preview renders are kept next to the final ones
+    assert preview.grid_image.exists() and final.grid_image.exists()
+
+
+def test_rerender_requires_a_saved_blend(executor, tmp_path):
+    code = "import bpy\nbpy.ops.mesh.primitive_cube_add(size=1)\n"
+    output = executor.execute(GeneratedScript(code=code, iteration=1), tmp_path / "out")
+
+    with pytest.raises(FileNotFoundError):
+        executor.rerender(output)
+
+
+def test_sharded_render(executor, tmp_path):
+    executor.render_workers = 2
+    output = executor.execute(GeneratedScript(code=SCRIPT, iteration=1), tmp_path / "out")
+
+    assert output.blender_error is None
+    assert output.grid_image.exists()
+    assert len(list((output.render_dir / "turntable_frames").glob("turntable_*.png"))) == 4
+    assert "shard_01/turntable_0-3" in output.render_stats.stages
+
+
+def test_failed_shard_is_reported(executor, tmp_path, monkeypatch):
+    executor.render_workers = 2
+    run_blender = executor._run_blender
+
+    def fail_second_shard(script_path, log_path, blend_file=None):
+        if script_path.name == "render_shard_01.py":
+            return False, "", "Traceback (most recent call last):\nRuntimeError: GPU lost\n"
+        return run_blender(script_path, log_path, blend_file=blend_file)
+
+    monkeypatch.setattr(executor, "_run_blender", fail_second_shard)
+    output = executor.execute(GeneratedScript(code=SCRIPT, iteration=1), tmp_path / "out")
+
+    assert output.blender_error.startswith("Sharded render failed:\nShard 1: Traceback")
+    assert "GPU lost" in output.blender_error
+
+
+def test_each_render_shard_takes_a_blender_slot(executor, tmp_path):
+    executor.render_workers = 2
+    executor.slots = ResourcePool("blender", capacity=1)
+
+    output = executor.execute(GeneratedScript(code=SCRIPT, iteration=1), tmp_path / "out")
+
+    assert output.blender_error is None
+    # The prepare run, then one slot per shard, never more than one at a time
+    assert executor.slots.stats()["acquired"] == 3
+    assert executor.slots.in_use == 0
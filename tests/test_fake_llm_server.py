@@ -0,0 +1,37 @@
+"""Tests of the LLM backends against the fake OpenAI/Ollama server."""
+
+import json
+
+import httpx
+
+from vibe_blender.llm import OllamaBackend, OpenAIBackend, collect
+from vibe_blender.llm.structured import response_schema
+from vibe_blender.models import CritiqueResult, EditList
+from vibe_blender.testing.fake_llm_server import FakeLLMServer
+
+
+def test_openai_backend_streams_canned_critiques(llm_server):
+    llm = OpenAIBackend(api_key="test", base_url=f"{llm_server.url}/v1")
+    schema = response_schema(CritiqueResult, exclude=frozenset({"iteration"}))
+
+    first = json.loads(collect(llm.stream_structured("Critique the render", schema)))
+    second = json.loads(llm.generate_structured("Critique the render", schema))
+
+    assert (first["verdict"], second["verdict"]) == ("fail", "pass")
+    assert llm_server.counters["kind.critic"] == 2
+
+
+def test_ollama_backend_gets_code_and_edits(llm_server):
+    llm = OllamaBackend(base_url=llm_server.url)
+
+    assert "```python" in llm.generate("Write the script:\n```python\n...\n```")
+    edits = json.loads("".join(llm.stream_structured("Fix it", response_schema(EditList))))
+    assert edits["edits"][0]["old_code"].startswith("model.scale")
+
+
+def test_injected_rate_limit_sends_retry_after():
+    with FakeLLMServer(port=0, error_rates={"429": 1.0}, retry_after=3) as server:
+        response = httpx.post(f"{server.url}/api/generate", json={"prompt": "hi"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,65 @@
+"""Tests for the awaitable BaseLLM interface."""
+
+import asyncio
+import threading
+import time
+
+from vibe_blender.llm import OllamaBackend
+from vibe_blender.llm.base import BaseLLM
+
+
+class EchoLLM(BaseLLM):
+    """Sync-only backend recording the thread each call runs on."""
+
+    def __init__(self):
+        self.threads = []
+
+    def generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        self.threads.append(threading.get_ident())
+        return f"{system}|{prompt}|{temperature}|{max_tokens}"
+
+    def analyze_image(self, image_path, prompt, system=None):
+        return self.analyze_images([image_path], prompt, system)
+
+    def analyze_images(self, image_paths, prompt, system=None, max_tokens=None):
+        self.threads.append(threading.get_ident())
+        return f"{len(image_paths)}:{prompt}"
+
+
+def test_sync_backend_gets_thread_offload_fallback():
+    llm = EchoLLM()
+
+    async def run():
+        return await asyncio.gather(
+            llm.agenerate("hi", system="sys", temperature=0.2, max_tokens=5),
+            llm.aanalyze_image("a.png", "look"),
+            llm.aanalyze_images(["a.png", "b.png"], "compare"),
+        )
+
+    assert asyncio.run(run()) == ["sys|hi|0.2|5", "1:look", "2:compare"]
+    assert threading.get_ident() not in llm.threads
+
+
+def test_ollama_client_of_another_running_loop_is_closed():
+    llm = OllamaBackend()
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+
+    async def client():
+        return llm._get_async_client()
+
+    try:
+        first = asyncio.run_coroutine_threadsafe(client(), other).result(5)
+        second = asyncio.run(client())
+
+        assert second is not first
+        deadline = time.monotonic() + 5
+        while not first.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert first.is_closed
+        assert not second.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(5)
+        other.close()
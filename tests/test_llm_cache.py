@@ -0,0 +1,66 @@
+"""Tests for the LLM response cache (llm/cache.py)."""
+
+import asyncio
+import time
+
+from vibe_blender.llm import CachedLLM, LLMResponseCache
+from vibe_blender.llm.base import BaseLLM
+
+
+class CountingLLM(BaseLLM):
+    """Backend returning a fresh numbered response per call."""
+
+    model = "counting-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        return f"{prompt}#{self.calls}"
+
+    def analyze_image(self, image_path, prompt, system=None):
+        return self.analyze_images([image_path], prompt, system)
+
+    def analyze_images(self, image_paths, prompt, system=None, max_tokens=None):
+        self.calls += 1
+        return f"{prompt}#{self.calls}"
+
+
+def test_repeated_request_is_served_from_cache(tmp_path):
+    backend = CountingLLM()
+    llm = CachedLLM(backend, LLMResponseCache(tmp_path), name="planner")
+
+    assert llm.generate("plan", system="s", temperature=1.0) == "plan#1"
+    assert llm.generate("plan", system="s", temperature=1.0) == "plan#1"
+    assert llm.generate("plan", system="s", temperature=0.5) == "plan#2"
+    assert asyncio.run(llm.agenerate("plan", system="s", temperature=1.0)) == "plan#1"
+
+    assert backend.calls == 2
+    assert llm.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+    assert llm.model == "counting-1"
+
+
+def test_image_contents_are_part_of_the_key(tmp_path):
+    image = tmp_path / "ref.png"
+    image.write_bytes(b"one")
+    backend = CountingLLM()
+    llm = CachedLLM(backend, LLMResponseCache(tmp_path / "cache"))
+
+    assert llm.analyze_images([image], "look") == "look#1"
+    assert llm.analyze_images([image], "look") == "look#1"
+    image.write_bytes(b"two")
+    assert llm.analyze_images([image], "look") == "look#2"
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_size_mb=1, ttl_hours=1)
+    cache.put("old", "x")
+    cache._db.execute("UPDATE responses SET created = ?", (time.time() - 7200,))
+    assert cache.get("old") is None
+
+    cache.put("a", "a" * 600_000)
+    cache.put("b", "b" * 600_000)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,64 @@
+"""Tests for the encoded image payload cache (llm/images.py)."""
+
+import base64
+import os
+
+import pytest
+
+from vibe_blender.llm.images import ImagePayloadCache
+
+
+def test_payloads_are_encoded_once_until_the_file_changes(tmp_path):
+    image = tmp_path / "ref.jpg"
+    image.write_bytes(b"jpeg-bytes")
+    cache = ImagePayloadCache()
+
+    encoded = base64.b64encode(b"jpeg-bytes").decode()
+    assert cache.data_url(image) == "data:image/jpeg;base64," + encoded
+    assert cache.base64(image) == encoded
+    cache.data_url(image)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    image.write_bytes(b"new-jpeg-bytes")
+    os.utime(image, ns=(0, 1))
+    assert cache.base64(image) == base64.b64encode(b"new-jpeg-bytes").decode()
+    assert cache.misses == 3
+
+
+def test_memory_is_bounded(tmp_path):
+    cache = ImagePayloadCache(max_size_mb=1)
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        path.write_bytes(bytes(400_000))
+        cache.base64(path)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.evictions == 2
+
+
+def test_missing_image(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Image not found"):
+        ImagePayloadCache().base64(tmp_path / "missing.png")
+
+
+def test_preprocess_downscales_and_strips_metadata(tmp_path):
+    from PIL import Image
+
+    from vibe_blender.llm.images import preprocess_image
+
+    source = tmp_path / "photo.png"
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"
+    Image.new("RGBA", (4000, 3000), (10, 20, 30, 128)).save(source, exif=exif)
+
+    prepared = preprocess_image(source, tmp_path / "refs", (2048, 768))
+    assert prepared.size == (1024, 768)
+    assert prepared.path.suffix == ".jpg"
+    with Image.open(prepared.path) as image:
+        assert image.size == (1024, 768)
+        assert image.mode == "RGB"
+        assert not image.getexif()
+
+    # Converted file is reused on the next run
+    mtime = prepared.path.stat().st_mtime_ns
+    assert preprocess_image(source, tmp_path / "refs", (2048, 768)).path.stat().st_mtime_ns == mtime
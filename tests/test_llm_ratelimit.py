@@ -0,0 +1,63 @@
+"""Tests for the shared LLM rate limiter."""
+
+import pytest
+
+from vibe_blender.llm import RateLimitedLLM, RateLimiter, ratelimit
+
+from .test_llm_cache import CountingLLM
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", fake)
+    return fake
+
+
+def test_waits_for_token_budget_to_refill(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1200)
+
+    assert limiter.acquire(1200) == 0
+    waited = limiter.acquire(300)
+
+    # 300 tokens refill in 15s at 1200/min
+    assert waited == pytest.approx(15)
+    stats = limiter.stats()
+    assert stats["acquired"] == 2
+    assert stats["waited"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_lock_file_shares_budget_between_limiters(clock, tmp_path):
+    lock_file = tmp_path / "ratelimit.json"
+    first = RateLimiter(requests_per_minute=2, lock_file=lock_file, name="openai:gpt-4o")
+    second = RateLimiter(requests_per_minute=2, lock_file=lock_file, name="openai:gpt-4o")
+
+    first.acquire()
+    first.acquire()
+    # The budget is spent; one request refills in 30s
+    assert second.acquire() == pytest.approx(30)
+
+
+def test_wrapper_budgets_prompt_and_completion_tokens(clock):
+    limiter = RateLimiter(tokens_per_minute=10_000)
+    llm = RateLimitedLLM(CountingLLM(), limiter)
+
+    llm.generate("x" * 400, max_tokens=500)
+    assert limiter.buckets["tokens"].level == pytest.approx(10_000 - 600)
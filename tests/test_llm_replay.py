@@ -0,0 +1,51 @@
+"""Tests for recording and replaying LLM interactions."""
+
+from pathlib import Path
+
+import pytest
+
+from vibe_blender.llm import CassetteMissError, RecordingLLM, ReplayLLM, collect
+from vibe_blender.llm.replay import CassetteWriter, normalize_prompt
+
+from .test_llm_cache import CountingLLM
+
+IMAGE = Path(__file__).parent / "chair.jpg"
+
+
+def test_replay_returns_recorded_responses(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLM(CountingLLM(), CassetteWriter(cassette))
+    first = recorder.generate("plan a chair", system="You plan scenes")
+    second = recorder.generate("plan a chair", system="You plan scenes")
+    described = recorder.analyze_images([IMAGE], "describe")
+
+    replay = ReplayLLM(cassette, strict=True)
+    assert replay.model == "counting-1"
+    # Whitespace differences don't change the key; repeats replay in order
+    assert replay.generate("plan  a chair\n", system="You plan scenes") == first
+    assert replay.generate("plan a chair", system="You plan scenes") == second
+    assert replay.generate("plan a chair", system="You plan scenes") == second
+    assert replay.analyze_images([IMAGE], "describe") == described
+    with pytest.raises(CassetteMissError):
+        replay.generate("plan a table")
+
+
+def test_stream_replays_what_the_consumer_read(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLM(CountingLLM(), CassetteWriter(cassette))
+    recorded = collect(recorder.stream_generate("write code"))
+
+    replay = ReplayLLM(cassette)
+    assert collect(replay.stream_generate("write code")) == recorded
+
+
+def test_non_strict_miss_replays_in_recorded_order(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = RecordingLLM(CountingLLM(), CassetteWriter(cassette))
+    recorder.generate("critique render 20250101_120000")
+
+    replay = ReplayLLM(cassette)
+    # Run timestamps are masked, so a different output directory still matches
+    assert normalize_prompt("out/20250101_120000") == normalize_prompt("out/20260102_130000")
+    assert replay.generate("critique something else") == "critique render 20250101_120000#1"
+    assert replay.stats()["misses"] == 1
@@ -0,0 +1,107 @@
+"""Tests for LLM retries, backoff and circuit breaking."""
+
+import httpx
+import pytest
+
+from vibe_blender.llm import BaseLLM, CircuitBreaker, CircuitOpenError, ResilientLLM, resilience
+
+
+class FlakyLLM(BaseLLM):
+    """Raises the queued errors in order, then answers."""
+
+    model = "flaky-1"
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    def analyze_image(self, image_path, prompt, system=None):
+        return self.generate(prompt)
+
+    def analyze_images(self, image_paths, prompt, system=None, max_tokens=None):
+        return self.generate(prompt)
+
+
+def _status_error(status: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://localhost:11434/api/generate")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(resilience.time, "sleep", slept.append)
+    return slept
+
+
+def test_retries_transient_errors_honoring_retry_after(sleeps):
+    inner = FlakyLLM([ConnectionError("refused"), _status_error(429, {"Retry-After": "7"})])
+    llm = ResilientLLM(inner, base_delay=0.01)
+
+    assert llm.generate("hi") == "ok"
+    assert inner.calls == 3
+    assert sleeps[1] == 7
+    stats = llm.stats()
+    assert stats["retries"] == 2
+    assert stats["backoff_seconds"] >= 7
+    assert stats["circuit"] == "closed"
+
+
+def test_client_errors_are_not_retried(sleeps):
+    inner = FlakyLLM([_status_error(400)])
+    llm = ResilientLLM(inner)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        llm.generate("hi")
+    assert inner.calls == 1
+    assert sleeps == []
+
+
+def test_breaker_opens_after_consecutive_failures(sleeps):
+    inner = FlakyLLM([ConnectionError("refused")] * 10)
+    llm = ResilientLLM(inner, max_retries=1, base_delay=0.01, breaker=CircuitBreaker(2, 60))
+
+    with pytest.raises(ConnectionError):
+        llm.generate("hi")
+    with pytest.raises(CircuitOpenError):
+        llm.generate("hi")
+    assert inner.calls == 2
+    assert llm.stats()["circuit"] == "open"
+
+    llm.breaker.reset_seconds = 0
+    inner.errors.clear()
+    assert llm.generate("hi") == "ok"
+    assert llm.stats()["circuit"] == "closed"
+
+
+class ChunkedLLM(FlakyLLM):
+    """Streams its answer in several chunks."""
+
+    def stream_generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        yield self.generate(prompt, system, temperature, max_tokens)
+        yield from ["b", "c"]
+
+
+def test_early_closed_stream_settles_half_open_breaker(sleeps):
+    inner = ChunkedLLM([ConnectionError("refused")])
+    llm = ResilientLLM(inner, max_retries=0, breaker=CircuitBreaker(1, 0))
+
+    with pytest.raises(ConnectionError):
+        llm.generate("hi")
+    assert llm.breaker.state == "half-open"
+
+    stream = llm.stream_generate("hi")
+    assert next(stream) == "ok"
+    stream.close()
+
+    assert llm.breaker.state == "closed"
+    assert not llm.breaker._trial_in_flight
+    # Further calls are let through, not rejected as a second concurrent trial
+    assert list(llm.stream_generate("hi")) == ["ok", "b", "c"]
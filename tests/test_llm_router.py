@@ -0,0 +1,75 @@
+"""Tests for per-role LLM configuration and routing."""
+
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from vibe_blender.config import LLM_ROLES, BlenderConfig, Config, LLMConfig
+from vibe_blender.llm import LLMRouter, OllamaBackend, create_router
+from vibe_blender.orchestrator import Orchestrator
+
+
+def _config(**roles) -> LLMConfig:
+    return LLMConfig(backend="ollama", ollama={"model": "qwen2.5-coder:32b"}, roles=roles)
+
+
+def test_role_settings_inherit_unset_fields():
+    config = _config(planner={"ollama": {"model": "llama3.2:3b"}})
+
+    backend, settings = config.backend_settings("planner")
+    assert backend == "ollama"
+    assert settings["model"] == "llama3.2:3b"
+    assert settings["vision_model"] == "llava"
+    assert config.backend_settings("critic")[1]["model"] == "qwen2.5-coder:32b"
+
+
+def test_router_shares_backends_with_identical_settings():
+    small = {"ollama": {"model": "llama3.2:3b"}}
+    router = create_router(_config(clarification=small, planner=small))
+
+    assert isinstance(router, LLMRouter)
+    assert router.for_role("clarification") is router.for_role("planner")
+    assert router.for_role("planner").model == "llama3.2:3b"
+    assert router.for_role("generator") is router.llm
+    assert isinstance(router.for_role("critic").backend, OllamaBackend)
+    assert router.model == "qwen2.5-coder:32b"
+
+
+def test_default_is_not_built_when_every_role_is_overridden(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    config = LLMConfig(backend="openai", roles={role: {"backend": "ollama"} for role in LLM_ROLES})
+
+    router = create_router(config)
+
+    assert [type(llm.backend) for llm in router.backends] == [OllamaBackend]
+    assert router.llm is router.for_role("generator")
+
+
+def test_references_fit_the_smallest_routed_backend(fake_blender, monkeypatch, tmp_path, caplog):
+    from PIL import Image
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config = Config(
+        blender=BlenderConfig(executable=fake_blender),
+        llm=LLMConfig(backend="openai", roles={"planner": {"backend": "ollama"}}),
+    )
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.config = config
+    orchestrator.llm = create_router(config.llm)
+    source = tmp_path / "photo.png"
+    Image.new("RGB", (4000, 3000)).save(source)
+
+    with caplog.at_level(logging.INFO):
+        [prepared] = orchestrator._prepare_references([source], tmp_path / "refs")
+
+    # Ollama's 672x672 limit, not OpenAI's 2048x768, and its LLaVA token count
+    with Image.open(prepared) as image:
+        assert image.size == (672, 504)
+    ollama = orchestrator.llm.for_role("planner")
+    assert f"~{ollama.estimate_image_tokens(672, 504)} tokens per call" in caplog.text
+
+
+def test_unknown_role_is_rejected():
+    with pytest.raises(ValidationError, match="Unknown roles"):
+        _config(coder={"backend": "ollama"})
@@ -0,0 +1,85 @@
+"""Tests for incremental answer extraction from streamed responses."""
+
+from vibe_blender.llm.metrics import LLMCallMetrics, LLMMetrics, llm_metrics
+from vibe_blender.llm.streaming import CodeBlockExtractor, JsonExtractor, collect
+from vibe_blender.orchestrator import Orchestrator
+
+
+def _chunks(text: str, size: int = 3):
+    """Split text into small chunks, recording how far it was read."""
+    read = []
+
+    def gen():
+        for i in range(0, len(text), size):
+            read.append(i)
+            yield text[i : i + size]
+
+    return gen(), read
+
+
+def test_code_block_stops_at_closing_fence():
+    text = "Here:\n```bash\nls\n```\n```python\nimport bpy\n```\nThis script adds a cube."
+    chunks, read = _chunks(text)
+
+    result = collect(chunks, CodeBlockExtractor())
+
+    assert "```python\nimport bpy\n```" in result
+    assert "cube" not in result
+    assert len(read) == len(result) // 3 + (len(result) % 3 > 0)
+
+
+def test_json_object_stops_when_balanced():
+    text = 'Verdict: {"feedback": "needs a {handle}", "issues": ["x}"], "score": 7} trailing notes'
+    chunks, _ = _chunks(text, size=5)
+
+    result = collect(chunks, JsonExtractor("{"))
+
+    assert result.startswith('Verdict: {"feedback"')
+    assert '"score": 7}' in result
+    assert "notes" not in result
+
+
+def test_json_in_fence_waits_for_json_block():
+    text = '```\nnot this\n```\n```json\n[{"old_code": "a", "new_code": "b"}]\n```\nmore'
+    result = collect(iter([text[:20], text[20:40], text[40:]]), JsonExtractor("["))
+    assert result == text
+
+
+def test_unfinished_answer_reads_everything():
+    text = "no code here, just prose"
+    assert collect(iter([text[:5], text[5:]]), CodeBlockExtractor()) == text
+
+
+def test_metrics_summary():
+    metrics = LLMMetrics()
+    metrics.record(LLMCallMetrics("critic", first_token_seconds=0.5, total_seconds=2.0))
+    metrics.record(
+        LLMCallMetrics("critic", first_token_seconds=1.5, total_seconds=4.0, stopped_early=True)
+    )
+
+    summary = metrics.summary()["critic"]
+    assert summary["calls"] == 2
+    assert summary["mean_first_token_seconds"] == 1.0
+    assert summary["total_seconds"] == 6.0
+    assert summary["stopped_early"] == 1
+
+
+def test_metrics_go_to_the_given_collector_and_are_bounded():
+    metrics = LLMMetrics(max_calls=2)
+    shared = len(llm_metrics.calls)
+
+    for label in ["planner", "generator", "critic"]:
+        collect(iter(["done"]), label=label, collector=metrics)
+
+    assert [call.label for call in metrics.calls] == ["generator", "critic"]
+    assert len(llm_metrics.calls) == shared
+
+
+def test_orchestrators_keep_their_own_metrics(pipeline_config, tmp_path):
+    first = Orchestrator(pipeline_config, interactive=False)
+    second = Orchestrator(pipeline_config, interactive=False)
+
+    first.run("A chair", tmp_path / "run")
+
+    assert first.metrics.summary()["generator"]["calls"] == 1
+    assert second.metrics.summary() == {}
@@ -0,0 +1,48 @@
+"""Tests for structured-output schemas and the parsers' JSON fast path."""
+
+from vibe_blender.agents.critic import CRITIQUE_SCHEMA, CriticAgent
+from vibe_blender.agents.generator import EDIT_SCHEMA, GeneratorAgent
+from vibe_blender.agents.planner import CLARIFICATION_SCHEMA, SCENE_SCHEMA
+from vibe_blender.llm.metrics import LLMMetrics
+from vibe_blender.llm.structured import load_json, strict_schema
+
+
+def test_strict_schema_requires_every_property():
+    schema = strict_schema(CRITIQUE_SCHEMA)
+
+    assert "iteration" not in schema["properties"]
+    assert set(schema["required"]) == set(schema["properties"])
+    assert schema["additionalProperties"] is False
+    assert "maximum" not in str(schema["properties"]["score"])
+    assert strict_schema(CLARIFICATION_SCHEMA) is not None
+    assert strict_schema(EDIT_SCHEMA) is not None
+
+
+def test_open_dicts_and_tuples_are_not_strict():
+    # ObjectDescription has dict[str, float] dimensions and a tuple position
+    assert strict_schema(SCENE_SCHEMA) is None
+
+
+def test_load_json_only_accepts_bare_documents():
+    assert load_json(' {"a": 1}\n') == {"a": 1}
+    assert load_json('Sure! {"a": 1}') is None
+    assert load_json('{"a": 1') is None
+
+
+def test_parsers_use_structured_output_without_fallback():
+    metrics = LLMMetrics()
+    critic = CriticAgent.__new__(CriticAgent)
+    critic.pass_threshold = 7.0
+    critic.metrics = metrics
+    generator = GeneratorAgent.__new__(GeneratorAgent)
+    generator.metrics = metrics
+
+    result = critic._parse_response('{"verdict": "pass", "score": 8, "feedback": "ok"}', 2)
+    edits = generator._parse_edits('{"edits": [{"old_code": "a = 1", "new_code": "a = 2"}]}')
+
+    assert result.score == 8.0 and result.iteration == 2
+    assert edits == [{"old_code": "a = 1", "new_code": "a = 2"}]
+    assert metrics.counters == {}
+
+    assert generator._parse_edits('```json\n[{"old_code": "a", "new_code": "b"}]\n```')
+    assert metrics.counters == {"generator.json_fallback": 1}
@@ -0,0 +1,73 @@
+"""Tests for LLM token and cost accounting."""
+
+import pytest
+
+from vibe_blender.llm import BaseLLM, UsageLLM, UsageTracker, report_usage
+from vibe_blender.llm.usage import model_price
+from vibe_blender.models import summarize_llm_usage
+
+
+class ReportingLLM(BaseLLM):
+    """Backend reporting fixed API token counts, like OpenAI does."""
+
+    model = "gpt-4o-2024-08-06"
+
+    def generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        report_usage(1000, 200)
+        return "done"
+
+    def analyze_image(self, image_path, prompt, system=None):
+        return self.generate(prompt)
+
+    def analyze_images(self, image_paths, prompt, system=None, max_tokens=None):
+        return self.generate(prompt)
+
+    def stream_generate(self, prompt, system=None, temperature=0.7, max_tokens=None):
+        yield "x" * 40
+        yield "y" * 40
+        # Only reached when the stream is read to the end
+        report_usage(1000, 20)
+
+
+def test_reported_usage_is_recorded_and_priced():
+    tracker = UsageTracker()
+    llm = UsageLLM(ReportingLLM(), tracker, agent="planner")
+
+    llm.generate("plan a chair")
+
+    (usage,) = tracker.records
+    assert (usage.agent, usage.prompt_tokens, usage.completion_tokens) == ("planner", 1000, 200)
+    assert not usage.estimated
+    # gpt-4o list price: $2.50 in, $10 out per million
+    assert usage.cost_usd == pytest.approx((1000 * 2.5 + 200 * 10) / 1e6)
+
+
+def test_stream_closed_early_is_estimated():
+    tracker = UsageTracker()
+    llm = UsageLLM(ReportingLLM(), tracker, agent="generator")
+
+    stream = llm.stream_generate("p" * 400)
+    next(stream)
+    stream.close()
+
+    (usage,) = tracker.records
+    assert usage.estimated
+    assert (usage.prompt_tokens, usage.completion_tokens) == (100, 10)
+
+
+def test_prices_match_longest_model_prefix():
+    assert model_price("gpt-4o-mini-2024-07-18") == (0.15, 0.60)
+    assert model_price("gpt-4o") == (2.50, 10.00)
+    assert model_price("llama3") is None
+    assert model_price("llama3", {"llama3": (0, 0)}) == (0, 0)
+
+
+def test_usage_is_summarized_per_agent():
+    tracker = UsageTracker()
+    for agent in ("planner", "critic", "critic"):
+        UsageLLM(ReportingLLM(), tracker, agent=agent).generate("hi")
+
+    totals = summarize_llm_usage(tracker.records)
+    assert totals["critic"]["calls"] == 2
+    assert totals["critic"]["completion_tokens"] == 400
+    assert totals["planner"]["prompt_tokens"] == 1000
@@ -0,0 +1,108 @@
+"""Tests of the warm Blender worker pool against the fake Blender executable."""
+
+import gc
+import weakref
+
+import pytest
+
+from vibe_blender.config import BlenderConfig, Config
+from vibe_blender.execution import BlenderExecutor, BlenderWorkerPool
+
+SCRIPT = "import bpy\nbpy.ops.mesh.primitive_cube_add(size=1)\n"
+
+
+@pytest.fixture
+def pool(fake_blender):
+    pool = BlenderWorkerPool(fake_blender, size=1, timeout=10, startup_timeout=10)
+    yield pool
+    pool.shutdown()
+
+
+def _script(tmp_path, code=SCRIPT):
+    path = tmp_path / "script.py"
+    path.write_text(code)
+    return path
+
+
+def test_worker_is_spawned_once_and_reused(pool, tmp_path):
+    script = _script(tmp_path)
+
+    assert pool.run(script, tmp_path / "first.log")[0]
+    worker = pool._idle.queue[0]
+    assert pool.run(script, tmp_path / "second.log")[0]
+
+    assert pool._idle.queue[0] is worker
+    assert worker.jobs_done == 2
+    assert "=== STDERR ===" in (tmp_path / "second.log").read_text()
+
+
+def test_script_error_is_reported_as_failure(pool, tmp_path):
+    success, _, stderr = pool.run(_script(tmp_path, "def broken(:\n"), tmp_path / "run.log")
+
+    assert not success
+    assert "SyntaxError" in stderr
+    # The worker survives a failing script
+    assert pool._idle.queue[0].jobs_done == 1
+
+
+def test_crashed_worker_is_discarded(pool, tmp_path):
+    script = _script(tmp_path)
+    pool.run(script, tmp_path / "run.log")
+    crashed = pool._idle.queue[0]
+    crashed.process.kill()
+    crashed.process.wait()
+
+    with pytest.raises(RuntimeError, match="crashed"):
+        pool.run(script, tmp_path / "run.log")
+
+    assert pool._idle.queue[0] is not crashed
+    assert pool.run(script, tmp_path / "run.log")[0]
+
+
+def test_worker_exiting_at_startup_is_not_a_timeout(tmp_path):
+    pool = BlenderWorkerPool("/bin/false", size=1, timeout=10, startup_timeout=10)
+    try:
+        with pytest.raises(RuntimeError, match="failed to start"):
+            pool.run(_script(tmp_path), tmp_path / "run.log")
+    finally:
+        pool.shutdown()
+
+
+def test_log_failure_returns_worker_to_the_pool(pool, tmp_path):
+    with pytest.raises(OSError):
+        pool.run(_script(tmp_path), tmp_path / "missing" / "run.log")
+
+    assert pool._idle.qsize() == 1
+
+
+def test_shutdown_stops_workers_and_refuses_jobs(pool, tmp_path):
+    pool.run(_script(tmp_path), tmp_path / "run.log")
+    worker = pool._idle.queue[0]
+
+    pool.shutdown()
+
+    assert not worker.is_alive()
+    with pytest.raises(RuntimeError, match="shut down"):
+        pool.run(_script(tmp_path), tmp_path / "run.log")
+
+
+def test_shutdown_removes_the_work_dir_and_releases_the_pool(fake_blender):
+    pool = BlenderWorkerPool(fake_blender, size=1, timeout=10, startup_timeout=10)
+    work_dir = pool._work_dir
+    pool_ref = weakref.ref(pool)
+
+    pool.shutdown()
+    del pool
+    gc.collect()
+
+    assert not work_dir.exists()
+    assert pool_ref() is None
+
+
+def test_executor_logs_that_pool_output_is_not_streamed(fake_blender, caplog):
+    config = Config(blender=BlenderConfig(executable=fake_blender, pool_size=1))
+
+    executor = BlenderExecutor(config)
+    executor.close()
+
+    assert "not streamed" in caplog.text
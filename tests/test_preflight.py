@@ -0,0 +1,108 @@
+"""Unit tests for the static pre-flight check (execution/preflight.py).
+
+No Blender dependency: scripts are checked with a small header standing in
+for the executor's injected variables.
+"""
+
+from vibe_blender.execution.preflight import PreflightChecker, load_api_index
+
+HEADER = """\
+import bpy
+import math
+import os
+
+OUTPUT_BLEND_PATH = "/tmp/model.blend"
+OUTPUT_DIR = "/tmp/renders"
+"""
+
+TEMPLATE = """
+def setup_camera():
+    return bpy.data.objects.get("Camera")
+
+bpy.ops.render.render(write_still=True)
+"""
+
+
+def _check(code: str, api_index=None):
+    script = HEADER + code + "\n\n" + TEMPLATE
+    first = HEADER.count("\n") + 1
+    last = first + code.count("\n")
+    return PreflightChecker(api_index).check(script, "script.py", (first, last))
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_valid_script_passes():
+    code = (
+        "bpy.ops.mesh.primitive_cube_add(size=1)\n"
+        "obj = bpy.context.active_object\n"
+        "mat = bpy.data.materials.new(name='Mat')\n"
+        "for i in range(3):\n"
+        "    obj.location.x = math.sin(i)\n"
+        "bpy.ops.wm.save_as_mainfile(filepath=OUTPUT_BLEND_PATH)\n"
+    )
+    assert _check(code, load_api_index("4.2")) is None
+
+
+def test_syntax_error_reported_as_traceback():
+    error = _check("x = (\n")
+    assert error.startswith("Traceback (most recent call last):")
+    assert "SyntaxError" in error
+
+
+def test_undefined_name():
+    error = _check("obj = bpy.context.active_object\nobj.name = nmae\n")
+    assert "NameError: name 'nmae' is not defined" in error
+    assert 'File "script.py", line 8' in error
+
+
+def test_names_bound_in_functions_and_loops_are_known():
+    code = (
+        "def make(size, *args, **kwargs):\n"
+        "    return [v for v in args] + [size, kwargs]\n"
+        "try:\n"
+        "    make(1)\n"
+        "except ValueError as err:\n"
+        "    print(err)\n"
+    )
+    assert _check(code) is None
+
+
+def test_template_names_are_not_visible_to_generated_code():
+    error = _check("setup_camera()\n")
+    assert "NameError: name 'setup_camera' is not defined" in error
+
+
+def test_forbidden_calls():
+    error = _check("import sys\nsys.exit(0)\nbpy.ops.render.render()\n")
+    assert "sys.exit() is not allowed" in error
+    assert "bpy.ops.render.render() is not allowed" in error
+
+
+def test_render_template_calls_are_not_flagged():
+    assert _check("x = 1\n") is None
+
+
+def test_unknown_bpy_paths():
+    code = (
+        "bpy.ops.mesh.primitive_capsule_add()\n"
+        "bpy.ops.meshes.delete()\n"
+        "bpy.data.materiels.new(name='Mat')\n"
+    )
+    error = _check(code, load_api_index("Blender 4.2.1 LTS"))
+    assert 'Calling operator "bpy.ops.mesh.primitive_capsule_add" error' in error
+    assert "module 'bpy.ops' has no attribute 'meshes'" in error
+    assert "'BlendData' object has no attribute 'materiels'" in error
+
+
+def test_api_checks_skipped_without_index():
+    assert _check("bpy.ops.mesh.primitive_capsule_add()\n") is None
+
+
+def test_load_api_index_version_matching():
+    assert load_api_index("Blender 4.4.0")["blender_version"] == "4.2"
+    assert load_api_index("3.6") is None
+    assert load_api_index("unknown") is None
@@ -0,0 +1,142 @@
+"""Tests of the render template's functions against a minimal stand-in for bpy."""
+
+import math
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from vibe_blender.templates.render_views import RENDER_TEMPLATE
+
+
+class FakeObject(SimpleNamespace):
+    """Object recording the keyframes inserted on it."""
+
+    def keyframe_insert(self, data_path, index, frame):
+        self.keyframes[frame] = getattr(self, data_path)[index]
+
+
+class FakeObjects(list):
+    """bpy.data.objects: looked up by name."""
+
+    def get(self, name):
+        return next((obj for obj in self if obj.name == name), None)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            obj = self.get(key)
+            if obj is None:
+                raise KeyError(key)
+            return obj
+        return super().__getitem__(key)
+
+
+class FakeBpy(ModuleType):
+    """Just enough of bpy for the turntable and shard functions."""
+
+    def __init__(self):
+        super().__init__("bpy")
+        self.renders = []
+        self.stills = []
+        self.objects = FakeObjects()
+        render = SimpleNamespace(image_settings=SimpleNamespace(), filepath="")
+        scene = SimpleNamespace(
+            render=render, frame_start=1, frame_end=250, frame_current=1, frame_set=self._frame_set
+        )
+        self.context = SimpleNamespace(scene=scene, active_object=None)
+        self.data = SimpleNamespace(objects=self.objects)
+        self.ops = SimpleNamespace(
+            object=SimpleNamespace(empty_add=self._empty_add),
+            render=SimpleNamespace(render=self._render),
+        )
+
+    def _empty_add(self, location):
+        self.context.active_object = FakeObject(
+            name="Empty", location=location, rotation_euler=(0, 0, 0), keyframes={}
+        )
+        self.objects.append(self.context.active_object)
+
+    def _frame_set(self, frame):
+        self.context.scene.frame_current = frame
+
+    def _render(self, animation=False, write_still=False):
+        render = self.context.scene.render
+        scene = self.context.scene
+        if write_still:
+            self.stills.append((render.filepath, scene.frame_current))
+        else:
+            self.renders.append((animation, scene.frame_start, scene.frame_end, render.filepath))
+
+
+@pytest.fixture
+def template(monkeypatch):
+    """Namespace holding the template's functions, bound to a fake bpy."""
+    bpy = FakeBpy()
+    monkeypatch.setitem(sys.modules, "bpy", bpy)
+    monkeypatch.setitem(sys.modules, "mathutils", ModuleType("mathutils"))
+    namespace = {}
+    # Without OUTPUT_DIR the template only defines its functions
+    exec(RENDER_TEMPLATE, namespace)
+    namespace["bpy"] = bpy
+    return namespace
+
+
+def test_turntable_is_one_keyframed_animation_render(template, tmp_path):
+    bpy = template["bpy"]
+    camera = SimpleNamespace(parent=None)
+
+    paths = template["render_turntable"](camera, str(tmp_path), frames=4, angle_step=30)
+
+    pivot = camera.parent
+    assert pivot.name == "TurntablePivot"
+    assert pivot.keyframes == {i: pytest.approx(math.radians(30 * i)) for i in range(4)}
+    assert bpy.renders == [(True, 0, 3, str(tmp_path / "turntable_###"))]
+    assert paths == [str(tmp_path / f"turntable_{i:03d}.png") for i in range(4)]
+    # The scene's own frame range is restored afterwards
+    assert (bpy.context.scene.frame_start, bpy.context.scene.frame_end) == (1, 250)
+
+
+def test_turntable_shard_reuses_the_pivot(template, tmp_path):
+    bpy = template["bpy"]
+    camera = SimpleNamespace(parent=None)
+    template["setup_turntable"](camera, frames=8)
+
+    paths = template["render_turntable"](camera, str(tmp_path), frames=8, frame_range=(4, 7))
+
+    assert len(bpy.objects) == 1
+    assert camera.parent.keyframes[7] == pytest.approx(math.radians(315))
+    assert bpy.renders == [(True, 4, 7, str(tmp_path / "turntable_###"))]
+    assert [p[-7:-4] for p in paths] == ["004", "005", "006", "007"]
+
+
+def test_shard_renders_views_at_frame_zero(template, tmp_path):
+    bpy = template["bpy"]
+    template["configure_render_engine"] = lambda quality=None, threads=None: None
+    camera = FakeObject(name="CamIso", parent=None)
+    bpy.objects.append(camera)
+    # As prepare_render_scene leaves it: CamIso on a keyframed pivot, saved at frame 1
+    template["setup_turntable"](camera, frames=12)
+
+    template["render_shard"](str(tmp_path), views=("iso",), turntable_frames=12)
+
+    # Frame 0 is the unrotated pivot, the angle a full render draws the views at
+    assert camera.parent.keyframes[0] == 0
+    assert bpy.stills == [(str(tmp_path / "view_iso.png"), 0)]
+
+
+@pytest.mark.parametrize("platform, expected", [("linux", 2.0), ("darwin", 2.0 / 1024)])
+def test_peak_rss_units_per_platform(template, monkeypatch, platform, expected):
+    resource = ModuleType("resource")
+    resource.RUSAGE_SELF = 0
+    resource.getrusage = lambda who: SimpleNamespace(ru_maxrss=2048)
+    monkeypatch.setitem(sys.modules, "resource", resource)
+    monkeypatch.setattr(sys, "platform", platform)
+
+    assert template["peak_rss_mb"]() == pytest.approx(expected)
+
+
+def test_peak_rss_without_resource_module(template, monkeypatch):
+    # As on Windows, where the module doesn't exist
+    monkeypatch.setitem(sys.modules, "resource", None)
+
+    assert template["peak_rss_mb"]() is None
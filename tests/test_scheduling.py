@@ -0,0 +1,63 @@
+"""Tests for the resource pools and pipeline scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from vibe_blender.scheduling import PipelineScheduler, ResourcePool
+
+
+def test_pool_caps_concurrency_and_reports_utilization():
+    pool = ResourcePool("blender", capacity=1)
+    peak = []
+
+    def work():
+        with pool:
+            peak.append(pool.in_use)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert max(peak) == 1
+    assert stats["acquired"] == 3
+    assert stats["waited"] == 2
+    assert stats["busy_seconds"] == pytest.approx(0.15, abs=0.05)
+    assert 0 < stats["utilization"] <= 1
+
+
+def test_scheduler_stops_admitting_while_llm_pool_is_saturated():
+    blender = ResourcePool("blender", capacity=1)
+    llm = ResourcePool("llm", capacity=1)
+    scheduler = PipelineScheduler(blender, llm, max_jobs=4, poll_interval=0.01)
+    done = []
+
+    def job(item):
+        with llm:
+            time.sleep(0.05)
+        with blender:
+            done.append(item)
+
+    scheduler.run(range(3), job)
+
+    assert sorted(done) == [0, 1, 2]
+    # A second job is only admitted once the first one has left the LLM pool
+    assert scheduler.max_active <= 2
+    assert scheduler.stats()["llm"]["waited"] <= 1
+
+
+def test_scheduler_fills_up_to_max_jobs_with_unlimited_pools():
+    scheduler = PipelineScheduler(
+        ResourcePool("blender"), ResourcePool("llm"), max_jobs=3, poll_interval=0.01
+    )
+
+    scheduler.run(range(6), lambda item: time.sleep(0.05))
+
+    assert scheduler.max_active == 3
+    assert scheduler.remaining == 0
+    assert scheduler.stats()["blender"]["utilization"] is None
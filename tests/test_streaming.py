@@ -0,0 +1,72 @@
+"""Unit tests for streamed Blender execution (execution/streaming.py).
+
+A plain Python subprocess stands in for Blender.
+"""
+
+import sys
+import time
+
+import pytest
+
+from vibe_blender.execution.streaming import USER_CODE_MARKER, run_streaming
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_output_is_logged_by_stream(tmp_path):
+    log_path = tmp_path / "blender.log"
+    code = (
+        "import sys, time\n"
+        "print('out'); sys.stdout.flush()\n"
+        "time.sleep(0.2)\n"
+        "sys.stderr.write('err\\n')\n"
+    )
+    result = run_streaming(_python(code), log_path, timeout=10)
+
+    assert result.returncode == 0
+    assert result.stdout == "out\n"
+    assert result.stderr == "err\n"
+    assert not result.killed_on_error
+    assert log_path.read_text() == "=== STDOUT ===\nout\n\n=== STDERR ===\nerr\n"
+
+
+def test_traceback_after_marker_kills_process(tmp_path):
+    code = (
+        "import sys, time, traceback\n"
+        f"sys.stderr.write({USER_CODE_MARKER!r} + '\\n'); sys.stderr.flush()\n"
+        "try:\n"
+        "    1 / 0\n"
+        "except ZeroDivisionError:\n"
+        "    traceback.print_exc(); sys.stderr.flush()\n"
+        "time.sleep(30)\n"
+    )
+
+    start = time.monotonic()
+    result = run_streaming(_python(code), tmp_path / "blender.log", timeout=60)
+
+    assert time.monotonic() - start < 10
+    assert result.script_error
+    assert result.killed_on_error
+    assert "ZeroDivisionError" in result.stderr
+
+
+def test_traceback_before_marker_is_ignored(tmp_path):
+    code = (
+        "import sys\n"
+        "sys.stderr.write('Traceback (most recent call last):\\n'); sys.stderr.flush()\n"
+        f"sys.stderr.write({USER_CODE_MARKER!r} + '\\n')\n"
+        "print('done')\n"
+    )
+
+    result = run_streaming(_python(code), tmp_path / "blender.log", timeout=10)
+
+    assert not result.script_error
+    assert result.returncode == 0
+    assert result.stdout == "done\n"
+
+
+def test_timeout_raises(tmp_path):
+    with pytest.raises(TimeoutError):
+        run_streaming(_python("import time; time.sleep(30)"), tmp_path / "blender.log", timeout=0.5)